@@ -0,0 +1,74 @@
+import argparse
+import gurobipy as gp
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_hybrid as admm_hybrid
+import admm_engine
+import fcfs_engine
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_admm_anytime.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=8, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=3, help='the number of helpers')
+    parser.add_argument('--budgets', type=str, default='0.05,0.2,1,10', help='list of budgets in seconds in the format of b1,b2,...')
+    parser.add_argument('--max_iter', type=int, default=5, help='the maximum number of iterations of ADMM')
+    args = parser.parse_args()
+    return args
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+    gp.setParam('OutputFlag', 0)
+
+    instance = random_instance(K, H, True, np.random.default_rng(0), device_slowdown=4)
+    (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+    memory_capacity, memory_demand,
+    release_date_back, proc_bck, proc_local_back, trans_back_gradients) = instance
+    scenario = (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+
+    start = time.time()
+    w_admm = admm_hybrid.run(K, H, 0, *instance, control=admm_engine.control(args.max_iter, 700))[0]
+    duration = time.time() - start
+
+    f_log = open(args.log, 'w')
+    header = 'budget(sec)\tmakespan\titeration\ttime(sec)'
+    f_log.write(header + '\n')
+    print(header)
+    print(f'-\t{w_admm[-1]}\tADMM\t{duration:.3f}')
+    f_log.write(f'-\t{w_admm[-1]}\tADMM\t{duration:.3f}\n')
+    failed = 0
+    for budget in [float(b) for b in args.budgets.split(',')]:
+        start = time.time()
+        (y, completion, makespan, iteration) = admm_hybrid.run_anytime(K, H, 0, *instance, budget,
+                                                                      control=admm_engine.control(args.max_iter, 700))
+        duration = time.time() - start
+        print(f'{budget}\t{makespan}\t{iteration}\t{duration:.3f}')
+        f_log.write(f'{budget}\t{makespan}\t{iteration}\t{duration:.3f}\n')
+
+        # every client on one machine, its own device or a helper, within the memory
+        own = (np.arange(H+K) == H + np.arange(K)[:,None]) | (np.arange(H+K) < H)
+        if not (np.all(y.sum(axis=1) == 1) and np.all(y[~own] == 0)
+                and np.all(y.sum(axis=0)*utils.max_memory_demand <= memory_capacity)):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}The allocation of the budget {budget} is not feasible{utils.bcolors.ENDC}')
+        # the FCFS of the allocation, or the final schedule of the ADMM if it is better
+        if makespan > fcfs_engine.fcfs(K, H+K, *scenario, y)[1]:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}The makespan of the budget {budget} is worse than the FCFS of its allocation{utils.bcolors.ENDC}')
+        if duration < budget and makespan > w_admm[-1]:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}The ADMM ended within the budget {budget}, but the schedule is worse than its own{utils.bcolors.ENDC}')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}All the budgets give feasible schedules{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,60 @@
+import argparse
+import gurobipy as gp
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_hybrid as admm_hybrid
+import ADMM_solution as admm_sol
+import admm_engine
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_admm_control.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=6, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=3, help='the number of helpers')
+    parser.add_argument('--instances', type=int, default=3, help='the number of random instances')
+    parser.add_argument('--max_iter', type=int, default=10, help='the maximum number of iterations of the adaptive controls')
+    parser.add_argument('--eps_primal', type=float, default=1, help='the tolerance of the primal residual (in slots)')
+    parser.add_argument('--eps_dual', type=float, default=1, help='the tolerance of the dual residual (in slots)')
+    parser.add_argument('--stable', type=int, default=2, help='the number of iterations without changes of the allocation')
+    parser.add_argument('--time_budget', type=float, default=None, help='the time budget of the ADMM in seconds')
+    args = parser.parse_args()
+    return args
+
+'''
+The controls to compare: the fixed schedule (3 iterations with a fixed rho), the stop on
+the residuals or on a stable allocation, and the same with residual balancing of rho.
+'''
+def controls(args, rho):
+    return (('fixed', admm_engine.control(rho=rho)),
+            ('adaptive', admm_engine.control(args.max_iter, rho, args.eps_primal, args.eps_dual, args.stable, args.time_budget)),
+            ('balanced', admm_engine.control(args.max_iter, rho, args.eps_primal, args.eps_dual, args.stable, args.time_budget, balance=10)))
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+    header = 'module\tinstance\tcontrol\tmakespan\titerations\tlast rho\tprimal\tdual\tstop\ttime(sec)'
+    f_log.write(header + '\n')
+    print(header)
+    for (name, module, hybrid, rho) in (('ADMM_solution', admm_sol, False, 350), ('ADMM_hybrid', admm_hybrid, True, 700)):
+        for n in range(args.instances):
+            instance = random_instance(K, H, hybrid, np.random.default_rng(n), device_slowdown=4)
+            for (control_name, control) in controls(args, rho):
+                trace = []
+                start = time.time()
+                w_admm = module.run(K, H, 0, *instance, control=control, trace=trace)[0]
+                duration = time.time() - start
+                (_, last_rho, primal, dual, _, _, reason) = trace[-1]
+                line = f'{name}\t{n}\t{control_name}\t{w_admm[-1]}\t{len(trace)}\t{last_rho:g}\t{primal:.2f}\t{dual:.2f}\t{reason}\t{duration:.3f}'
+                print(line)
+                f_log.write(line + '\n')
+    f_log.close()
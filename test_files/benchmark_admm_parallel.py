@@ -0,0 +1,54 @@
+import argparse
+import gurobipy as gp
+import numpy as np
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_hybrid as admm_hybrid
+import ADMM_solution as admm_sol
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_admm_parallel.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=8, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=4, help='the number of helpers')
+    parser.add_argument('--workers', type=str, default='1,2,4', help='list of numbers of processes in the format of w1,w2,...')
+    parser.add_argument('--threads', type=int, default=1, help='the maximum number of threads of each Gurobi model of the helpers (0 for no limit)')
+    args = parser.parse_args()
+    return args
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+    f_log.write('module\tworkers\tmakespan\twall time(sec)\tcpu time(sec)\n')
+    print('module\tworkers\tmakespan\twall time(sec)\tcpu time(sec)')
+    failed = 0
+    for (name, module, hybrid) in (('ADMM_solution', admm_sol, False), ('ADMM_hybrid', admm_hybrid, True)):
+        instance = random_instance(K, H, hybrid, np.random.default_rng(0), device_slowdown=4)
+        reference = None
+        for workers in [int(w) for w in args.workers.split(',')]:
+            timings = []
+            w_admm = module.run(K, H, 0, *instance, timings=timings, workers=workers, threads=args.threads)[0]
+            helpers = [(wall, cpu) for (_, subproblem, wall, cpu) in timings if subproblem == 'helpers']
+            wall = sum(wall for (wall, _) in helpers)
+            cpu = sum(cpu for (_, cpu) in helpers)
+            if reference is None:
+                reference = w_admm
+            elif not np.array_equal(reference, w_admm):
+                failed += 1
+                print(f'{utils.bcolors.FAIL}{name}: {workers} workers give the makespans {w_admm} instead of {reference}{utils.bcolors.ENDC}')
+
+            print(f'{name}\t{workers}\t{w_admm[-1]}\t{wall:.3f}\t{cpu:.3f}')
+            f_log.write(f'{name}\t{workers}\t{w_admm[-1]}\t{wall:.3f}\t{cpu:.3f}\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}All the numbers of workers give the same makespans{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,129 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import schedule
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_admm_residuals.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=100, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers')
+    parser.add_argument('--slots', '-T', type=str, default='100,1000,10000', help='list of time horizons in the format of t1,t2,...')
+    parser.add_argument('--loops_limit', type=int, default=1000, help='the loops are skipped for longer time horizons than this')
+    args = parser.parse_args()
+    return args
+
+'''
+A solution of the x-subproblem (H,K,T): each client gets proc_fwd consecutive slots on one
+machine, with values slightly off 1 as the solvers return them, and an allocation y.
+'''
+def random_solution(K, H, T, rng):
+    proc_fwd = rng.integers(1, 5, (K,H))
+    x = np.zeros((H,K,T))
+    machine = rng.integers(0, H, K)
+    start = rng.integers(0, T-4, K)
+    for i in range(K):
+        x[machine[i], i, start[i]:start[i]+proc_fwd[i,machine[i]]] = 1 - 1e-9
+    y = np.zeros((K,H))
+    y[np.arange(K), rng.integers(0, H, K)] = 1 # not always the machine of x, so some constraints are violated
+    return (x, y, proc_fwd, rng.random((K,H)), rng.integers(0, 3, (K,H)), rng.integers(0, 3, K))
+
+'''
+The dual update, objective, violations and last slots of ADMM_solution.run before the
+vectorization, one value at a time (on numpy arrays, so faster than through x[j,i,t].X).
+'''
+def loops(K, H, T, x, y, proc_fwd, mu, trans_back_activations, proc_local_fwd):
+    g_values = []
+    for i in range(K):
+        g_interm = []
+        for j in range(H):
+            for t in range(T):
+                g_interm += [(t+1)*x[j,i,t]]
+        g_values += [max(g_interm)]
+
+    temp_mu = np.zeros((K,H))
+    for j in range(H):
+        for i in range(K):
+            temp_sum = []
+            for t in range(T):
+                temp_sum += [x[j,i,t]]
+            temp_mu[i,j] = mu[i,j] + (sum(temp_sum)-(y[i,j]*proc_fwd[i,j]))
+
+    calc_obj = np.zeros(K)
+    temptemp = np.multiply(y, trans_back_activations)
+    for i in range(K):
+        calc_obj[i] = g_values[i] + np.sum(temptemp[i,:]) + proc_local_fwd[i]
+
+    ll = np.sum(x, axis=2)
+    violated_constraints = 0
+    for j in range(H):
+        for i in range(K):
+            if np.all(np.abs(np.rint(ll[j,i])) != proc_fwd[i,j]*np.abs(np.rint(y[i,j]))):
+                violated_constraints += 1
+
+    cs = []
+    for i in range(K):
+        my_super_machine = 0
+        last_zero = -1
+        for my_machine in range(H):
+            for k in range(T):
+                if np.rint(x[my_machine,i,k]) >= 1:
+                    if last_zero < k+1:
+                        last_zero = k+1
+                        my_super_machine = my_machine
+        cs.append(last_zero + proc_local_fwd[i] + trans_back_activations[i,my_super_machine])
+
+    return (temp_mu, max(calc_obj), (violated_constraints/(K*H))*100, np.array(cs))
+
+'''
+The same values as ADMM_solution.run computes them now.
+'''
+def vectorized(K, H, T, x, y, proc_fwd, mu, trans_back_activations, proc_local_fwd):
+    g_values = np.max(x*np.arange(1, T+1), axis=(0,2))
+    ll = np.sum(x, axis=2)
+    temp_mu = mu + (ll.T - y*proc_fwd)
+    calc_obj = g_values + np.sum(y*trans_back_activations, axis=1) + proc_local_fwd
+    violated_constraints = np.abs(np.rint(ll.T)) != proc_fwd*np.abs(np.rint(y))
+    (f_m, my_super_machine) = schedule.last_slots(x)
+    cs = f_m + proc_local_fwd + trans_back_activations[np.arange(K), my_super_machine]
+    return (temp_mu, max(calc_obj), np.mean(violated_constraints)*100, cs)
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+
+    f_log = open(args.log, 'w')
+    f_log.write('K\tH\tT\tloops(sec)\tvectorized(sec)\n')
+    print('K\tH\tT\tloops(sec)\tvectorized(sec)')
+    failed = 0
+    for T in [int(t) for t in args.slots.split(',')]:
+        instance = random_solution(K, H, T, np.random.default_rng(T))
+
+        start = time.time()
+        new = vectorized(K, H, T, *instance)
+        duration_vectorized = time.time() - start
+
+        if T <= args.loops_limit:
+            start = time.time()
+            old = loops(K, H, T, *instance)
+            duration_loops = f'{time.time() - start:.3f}'
+            for (name, a, b) in zip(('mu', 'objective', 'violations', 'completion times'), old, new):
+                if not np.allclose(a, b):
+                    failed += 1
+                    print(f'{utils.bcolors.FAIL}T={T}: the {name} differ{utils.bcolors.ENDC}')
+        else:
+            duration_loops = '-'
+
+        print(f'{K}\t{H}\t{T}\t{duration_loops}\t{duration_vectorized:.4f}')
+        f_log.write(f'{K}\t{H}\t{T}\t{duration_loops}\t{duration_vectorized:.4f}\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The vectorized dual update, objective, violations and completion times match the loops{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,122 @@
+import argparse
+import gurobipy as gp
+from gurobipy import GRB
+from gurobipy import quicksum as qsum
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_hybrid as admm_hybrid
+import ADMM_solution as admm_sol
+import admm_engine
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_admm_update.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=str, default='2,3,4', help='list of clients in the format of k1,k2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=2, help='the number of helpers')
+    parser.add_argument('--slots', '-T', type=int, default=60, help='the time horizon of the x-subproblem for the comparison of the updates')
+    parser.add_argument('--iterations', type=int, default=5, help='the number of updates of the comparison')
+    args = parser.parse_args()
+    return args
+
+'''
+The x-subproblem with only its coupling variables (the forward constraints do not change).
+'''
+def x_model(K, H, T):
+    m = gp.Model("xsubproblem")
+    m.setParam('OutputFlag', 0)
+    x = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="x")
+    f = m.addMVar(shape=(K), name="f")
+    comp = m.addMVar(shape=(K), name="comp")
+    w = m.addMVar(shape=(1), name="w")
+    contr1_add_1 = m.addMVar(shape=(K,H), lb=-GRB.INFINITY,name="contr1_add_1")
+    contr1_abs_1 = m.addMVar(shape=(K,H), lb=-GRB.INFINITY,name="contr1_abs_1")
+    return (m, x, f, comp, w, contr1_add_1, contr1_abs_1)
+
+'''
+The update of P1 before admm_engine: the coupling constraints are found by name, removed
+and added again at every iteration.
+'''
+def remove_and_add(K, H, T, iterations, proc_fwd, proc_local_fwd, trans_back_activations, rho, rng):
+    (m1, x, f, comp, w, contr1_add_1, contr1_abs_1) = x_model(K, H, T)
+    my_ds = []
+    durations = []
+    for iter in range(iterations):
+        (y_par, mu) = (rng.integers(0, 2, (K,H)), rng.random((K,H)))
+        start = time.time()
+        if iter >= 1:
+            for d in my_ds:
+                m1.remove(d)
+            my_ds = []
+        for i in range(K):
+            for j in range(H):
+                if iter >= 1:
+                    m1.remove(m1.getConstrByName(f'const1add-{i}-{j}'))
+                m1.addConstr(contr1_add_1[i,j] == qsum(x[j,i,t] for t in range(T)) - y_par[i,j]*proc_fwd[i,j] + mu[i,j], name=f'const1add-{i}-{j}')
+                my_ds.append(m1.addConstr(contr1_abs_1[i,j] == gp.abs_(contr1_add_1[i,j]), name=f'const1ab-{i}-{j}'))
+        for i in range(K):
+            if iter >= 1:
+                m1.remove(m1.getConstrByName(f'const1f-{i}'))
+            m1.addConstr(comp[i] == np.sum(np.multiply(trans_back_activations[i,:], y_par[i,:])) + f[i] + proc_local_fwd[i], name=f'const1f-{i}')
+            my_ds.append(m1.addConstr(w >= comp[i], name=f'const1fw-{i}'))
+        m1.setObjective(w + (rho/2)*qsum(contr1_abs_1[i,j] for i in range(K) for j in range(H)), GRB.MINIMIZE)
+        m1.update()
+        durations.append(time.time() - start)
+    return np.mean(durations)
+
+'''
+The same updates with admm_engine.
+'''
+def in_place(K, H, T, iterations, proc_fwd, proc_local_fwd, trans_back_activations, rho, rng):
+    (m1, x, f, comp, w, contr1_add_1, contr1_abs_1) = x_model(K, H, T)
+    sub = admm_engine.x_coupling(m1, x, f, comp, w, contr1_add_1, contr1_abs_1,
+                                 proc_fwd, proc_local_fwd, trans_back_activations, rho)
+    durations = []
+    for iter in range(iterations):
+        (y_par, mu) = (rng.integers(0, 2, (K,H)), rng.random((K,H)))
+        start = time.time()
+        admm_engine.update_x(sub, y_par, mu)
+        durations.append(time.time() - start)
+    return np.mean(durations)
+
+if __name__ == '__main__':
+    args = get_args()
+    H = args.helpers
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+
+    # the update of P1 alone, as in ADMM_solution
+    print('K\tH\tT\tremove and add(sec)\tadmm_engine(sec)')
+    f_log.write('K\tH\tT\tremove and add(sec)\tadmm_engine(sec)\n')
+    for K in [int(k) for k in args.clients.split(',')]:
+        rng = np.random.default_rng(K)
+        instance = random_instance(K, H, False, rng)
+        parameters = (instance[1], instance[2], instance[3], 350)
+        legacy = remove_and_add(K, H, args.slots, args.iterations, *parameters, np.random.default_rng(0))
+        engine = in_place(K, H, args.slots, args.iterations, *parameters, np.random.default_rng(0))
+        print(f'{K}\t{H}\t{args.slots}\t{legacy:.4f}\t{engine:.4f}')
+        f_log.write(f'{K}\t{H}\t{args.slots}\t{legacy:.4f}\t{engine:.4f}\n')
+
+    # update and solve time of every iteration of the two ADMM
+    print('module\tK\tH\titeration\tsubproblem\tupdate(sec)\tsolve(sec)')
+    f_log.write('module\tK\tH\titeration\tsubproblem\tupdate(sec)\tsolve(sec)\n')
+    for (name, module, hybrid) in (('ADMM_solution', admm_sol, False), ('ADMM_hybrid', admm_hybrid, True)):
+        for K in [int(k) for k in args.clients.split(',')]:
+            instance = random_instance(K, H, hybrid, np.random.default_rng(K))
+            timings = []
+            try:
+                module.run(K, H, 0, *instance, timings=timings)
+            except gp.GurobiError as error: # e.g. a model too large for the license
+                print(f'{utils.bcolors.WARNING}{name} K={K}: {error}{utils.bcolors.ENDC}')
+                continue
+            for (iter, subproblem, update, solve) in timings:
+                print(f'{name}\t{K}\t{H}\t{iter}\t{subproblem}\t{update:.4f}\t{solve:.4f}')
+                f_log.write(f'{name}\t{K}\t{H}\t{iter}\t{subproblem}\t{update:.4f}\t{solve:.4f}\n')
+    f_log.close()
@@ -0,0 +1,119 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import schedule
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_completion_times.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=100, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers')
+    parser.add_argument('--slots', '-T', type=str, default='100,1000,10000', help='list of time horizons in the format of t1,t2,...')
+    parser.add_argument('--loops_limit', type=int, default=1000, help='the loops are skipped for longer time horizons than this')
+    args = parser.parse_args()
+    return args
+
+'''
+A random schedule of the hybrid layout: every client is on its own device (no slots) or
+on a helper, with a forward interval and later a backward one, as dense (H+K,K,T) arrays.
+'''
+def random_schedule(K, H, T, rng):
+    x = np.zeros((H+K,K,T))
+    z = np.zeros((H+K,K,T))
+    for i in range(K):
+        if rng.random() < 0.2: # on its own device
+            continue
+        machine = rng.integers(0, H)
+        (a, b, c, d) = np.sort(rng.choice(T, 4, replace=False))
+        x[machine,i,a:b+1] = 1 - 1e-7 # as the solvers return them
+        z[machine,i,c:d+1] = 1
+    return (x, z)
+
+'''
+The completion times as the end of ADMM_hybrid.run_scheduling computed them, one slot at
+a time, with the transfers of the own device in the completion of the local clients.
+'''
+def loops(K, H, T, x_par, z_par, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+          release_date_back, proc_bck, proc_local_back, trans_back_gradients):
+    cs = []
+    cs_back = []
+    for i in range(K): #for all jobs
+        my_super_machine = 0
+        last_zero = -1
+        for my_machine in range(H+K):
+            for k in range(T):
+                if np.rint(x_par[my_machine,i,k]) >= 1:
+                    if last_zero < k+1:
+                        last_zero = k+1
+                        my_super_machine = my_machine
+        cs.append(last_zero + proc_local_fwd[i] + trans_back_activations[i,my_super_machine])
+
+    for i in range(K): #for all jobs
+        my_super_machine = 0
+        last_zero = -1
+        for my_machine in range(H):
+            for k in range(T):
+                if np.rint(z_par[my_machine,i,k]) >= 1:
+                    if last_zero < k+1:
+                        last_zero = k+1
+                        my_super_machine = my_machine
+        if last_zero == -1:
+            j = i
+            C = release_date_fwd[j,H+j] + proc_fwd[j,H+j] + release_date_back[j,H+j] + proc_bck[j,H+j] + proc_local_fwd[i] + proc_local_back[i] \
+                + trans_back_activations[i,H+j] + trans_back_gradients[i,H+j]
+        else:
+            C = last_zero + proc_local_back[i] + trans_back_gradients[i,my_super_machine]
+        cs_back.append(C)
+    return (np.array(cs), np.array(cs_back))
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+    rng = np.random.default_rng(0)
+    parameters = (rng.integers(0, 10, (K,H+K)), rng.integers(1, 10, (K,H+K)), rng.integers(0, 10, K), rng.integers(0, 10, (K,H+K)),
+                  rng.integers(0, 10, (K,H+K)), rng.integers(1, 10, (K,H+K)), rng.integers(0, 10, K), rng.integers(0, 10, (K,H+K)))
+
+    f_log = open(args.log, 'w')
+    header = 'T\tloops(sec)\tdense(sec)\tintervals(sec)'
+    f_log.write(header + '\n')
+    print(header)
+    failed = 0
+    for T in [int(t) for t in args.slots.split(',')]:
+        (x, z) = random_schedule(K, H, T, rng)
+        plan = schedule.concat((schedule.from_dense(x, schedule.FORWARD), schedule.from_dense(z, schedule.BACKWARD)))
+
+        start = time.time()
+        dense = schedule.completion_times(x, z, H, *parameters, hybrid=True)
+        time_dense = time.time() - start
+        # the forward completion times read all the machines, as the loops do
+        forward = schedule.completion_times(x, z, H+K, *parameters)[0]
+        start = time.time()
+        intervals = schedule.completion_times(plan, None, H, *parameters, hybrid=True)
+        time_intervals = time.time() - start
+        for n in range(5):
+            if not np.array_equal(dense[n], intervals[n]):
+                failed += 1
+                print(f'{utils.bcolors.FAIL}T={T}: the output {n} of the intervals is not the one of the dense arrays{utils.bcolors.ENDC}')
+
+        time_loops = float('nan')
+        if T <= args.loops_limit:
+            start = time.time()
+            (cs, cs_back) = loops(K, H, T, x, z, *parameters)
+            time_loops = time.time() - start
+            if not (np.array_equal(cs, forward) and np.array_equal(cs_back, dense[1])):
+                failed += 1
+                print(f'{utils.bcolors.FAIL}T={T}: the completion times are not the ones of the loops{utils.bcolors.ENDC}')
+
+        print(f'{T}\t{time_loops:.4f}\t{time_dense:.4f}\t{time_intervals:.4f}')
+        f_log.write(f'{T}\t{time_loops:.4f}\t{time_dense:.4f}\t{time_intervals:.4f}\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The loops, the dense arrays and the intervals give the same completion times{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
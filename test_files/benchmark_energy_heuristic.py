@@ -0,0 +1,133 @@
+import argparse
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ILP_hybrid as ilp_hybrid
+import heuristic_FCFS as fcfs_sol
+import energy
+import horizon
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_energy_heuristic.txt', help='filename for the logging')
+    parser.add_argument('--instances', '-n', type=int, default=5, help='the number of random instances of every number of clients for the gap')
+    parser.add_argument('--clients', '-K', type=str, default='3,4,5', help='list of clients for the gap to run_energy, in the format of k1,k2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=2, help='the number of helpers')
+    parser.add_argument('--large', type=str, default='1000,2000', help='list of clients for the timing of the heuristic only, in the format of k1,k2,...')
+    parser.add_argument('--alphas', type=str, default='0,0.5,1', help='list of alphas in the format of a1,a2,...')
+    parser.add_argument('--iterations', type=int, default=20, help='the moves of the local search of the heuristic')
+    parser.add_argument('--time_limit', type=float, default=60, help='the time limit of every solve in seconds')
+    args = parser.parse_args()
+    return args
+
+'''
+Random energy parameters in the ranges of utils.create_scenario_hybrid_energy, with links
+slow enough that offloading is not always the cheaper choice.
+Returns (P_comp, P_transf, P_receive, max_slot, network_bwd, ksi).
+'''
+def random_energy(K, H, rng):
+    return (rng.uniform(3, 8, K), rng.uniform(2, 6, (K,H)), rng.uniform(2, 6, (K,H)), 1500,
+            rng.uniform(0.05, 0.5, (K,H)), (2049.568359375, 257.568359375))
+
+'''
+The bound T of the makespan in run_energy: the horizon of horizon.py, the FCFS makespan minus
+the least time after a backward job, plus the longest one, so at least the FCFS makespan.
+'''
+def makespan_horizon(K, H, instance):
+    (release_date, proc, proc_local, trans_back, memory_capacity,
+     release_date_back, proc_bck, proc_local_back, trans_back_gradients) = instance
+    (_, T) = horizon.compact_horizon(K, H, release_date, proc, proc_local, trans_back, memory_capacity, None,
+                                     release_date_back, proc_bck, proc_local_back, trans_back_gradients, hybrid=True)
+    return int(T + np.max(proc_local_back + np.max(trans_back_gradients, axis=1)))
+
+'''
+The optimum of run_energy (with the model of ILP_hybrid.build_energy_model, sparse) for one
+alpha. Returns (objective, the (K,2) computation and transfer energy of every client in the
+ILP, the same by energy.evaluate of its allocation, solve time), the first three None if
+not optimal.
+'''
+def optimum(K, H, T, instance, energy_parameters, alpha, args):
+    (m, x, y, z, local, objectives) = ilp_hybrid.build_energy_model(K, H, T, *instance, *energy_parameters, sparse=True)
+    m.setObjective(alpha*objectives['makespan_obj'] + (1-alpha)*objectives['energy_obj'], GRB.MINIMIZE)
+    m.setParam('TimeLimit', args.time_limit)
+    m.optimize()
+    if m.Status != GRB.OPTIMAL:
+        return (None, None, None, m.Runtime)
+    coefficients = energy.coefficients(K, H, instance[0], instance[1], instance[2], instance[5], instance[6], instance[7], *energy_parameters)
+    (eng_comp, eng_transf, _) = energy.evaluate(ilp_hybrid.solution(K, H, x, y, z, local)[1], H, *coefficients)
+    return (m.ObjVal, np.column_stack((objectives['eng_comp'].X, objectives['eng_transf'].X)), np.column_stack((eng_comp, eng_transf)), m.Runtime)
+
+if __name__ == '__main__':
+    args = get_args()
+    H = args.helpers
+    alphas = [float(a) for a in args.alphas.split(',')]
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+    header = 'K\talpha\theuristic\toptimum\tgap(%)\theuristic(sec)\tsolve(sec)'
+    print(header)
+    f_log.write(header + '\n')
+    failed = 0
+    gaps = []
+    rng = np.random.default_rng(0)
+    for K in [int(k) for k in args.clients.split(',')]:
+        for n in range(args.instances):
+            (release_date, proc, proc_local, trans_back, memory_capacity, memory_demand,
+             release_date_back, proc_bck, proc_local_back, trans_back_gradients) = random_instance(K, H, True, rng, device_slowdown=4)
+            instance = (release_date, proc, proc_local, trans_back, memory_capacity,
+                        release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+            energy_parameters = random_energy(K, H, rng)
+            T = makespan_horizon(K, H, instance)
+            for alpha in alphas:
+                start = time.time()
+                objective = fcfs_sol.run_energy_hybrid(K, H, T, *instance, *energy_parameters, alpha, args.iterations)[4]
+                heuristic_time = time.time() - start
+                (best, ilp_energy, evaluated, solve_time) = optimum(K, H, T, instance, energy_parameters, alpha, args)
+
+                gap = None
+                if best is not None:
+                    gap = 100*(objective - best)/best if best > 0 else 0
+                    gaps.append(gap)
+                    # the energy of the evaluator of the heuristic is the one of the ILP
+                    if not np.allclose(ilp_energy, evaluated, rtol=1e-6, atol=1e-6):
+                        failed += 1
+                        print(f'{utils.bcolors.FAIL}K={K}, alpha={alpha}: the energy of the ILP is {ilp_energy.tolist()} and of energy.evaluate {evaluated.tolist()}{utils.bcolors.ENDC}')
+                    # the optimum is a lower bound of the heuristic
+                    if objective < best - 1e-6:
+                        failed += 1
+                        print(f'{utils.bcolors.FAIL}K={K}, alpha={alpha}: the heuristic {objective} is below the optimum {best}{utils.bcolors.ENDC}')
+                line = f'{K}\t{alpha:g}\t{objective:.5f}\t{best}\t{gap if gap is None else round(gap, 2)}\t{heuristic_time:.4f}\t{solve_time:.3f}'
+                print(line)
+                f_log.write(line + '\n')
+                f_log.flush()
+
+    header = 'K\talpha\theuristic(sec)\tmakespan\tenergy(J)'
+    print(header)
+    f_log.write(header + '\n')
+    for K in [int(k) for k in args.large.split(',')]:
+        (release_date, proc, proc_local, trans_back, memory_capacity, memory_demand,
+         release_date_back, proc_bck, proc_local_back, trans_back_gradients) = random_instance(K, H, True, rng, device_slowdown=4)
+        instance = (release_date, proc, proc_local, trans_back, memory_capacity,
+                    release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+        energy_parameters = random_energy(K, H, rng)
+        T = makespan_horizon(K, H, instance)
+        for alpha in alphas:
+            start = time.time()
+            (_, _, makespan, spent, _) = fcfs_sol.run_energy_hybrid(K, H, T, *instance, *energy_parameters, alpha, args.iterations)
+            line = f'{K}\t{alpha:g}\t{time.time() - start:.4f}\t{makespan:g}\t{spent:.1f}'
+            print(line)
+            f_log.write(line + '\n')
+        del instance
+    f_log.close()
+
+    if gaps:
+        print(f'{utils.bcolors.OKGREEN}The mean gap of the heuristic is {np.mean(gaps):.2f}% and the largest {np.max(gaps):.2f}% in {len(gaps)} optimal solves{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
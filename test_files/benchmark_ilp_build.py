@@ -0,0 +1,72 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ILP_solver as ilp_sol
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_ilp_build.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=str, default='10,50,100', help='list of clients in the format of k1,k2,...')
+    parser.add_argument('--helpers', '-H', type=str, default='2,5,10', help='list of helpers in the format of h1,h2,...')
+    parser.add_argument('--slots', '-T', type=str, default='100,500,1000', help='list of time horizons in the format of t1,t2,...')
+    parser.add_argument('--loops_limit', type=int, default=5000, help='skip the loop-based build when H*K*T is larger than this')
+    args = parser.parse_args()
+    return args
+
+'''
+Random instance of instances.py with values that grow with T, drawn from rng (a numpy
+Generator). The values do not matter for the build time, only K, H and T do.
+Returns the arguments of ILP_solver.build_model after T.
+'''
+def scaled_instance(K, H, T, rng):
+    max_proc = max(1, int(T/(4*max(1, int(K/H)))))
+    instance = random_instance(K, H, False, rng, release=max(1, int(T/10)), proc=max_proc+1, transfer=max(1, int(T/20)))
+    utils.max_memory_demand = 1
+    return instance[:5] + instance[6:] # without memory_demand
+
+def time_build(K, H, T, instance, vectorized):
+    start = time.time()
+    (m, _, _, _) = ilp_sol.build_model(K, H, T, *instance, vectorized=vectorized)
+    m.update()
+    end = time.time()
+    return (end-start, m.NumConstrs, m.NumNZs)
+
+if __name__ == '__main__':
+    args = get_args()
+
+    Ks = [int(k) for k in args.clients.split(',')]
+    Hs = [int(h) for h in args.helpers.split(',')]
+    Ts = [int(t) for t in args.slots.split(',')]
+
+    f_log = open(args.log, 'w')
+    header = 'K\tH\tT\tloops(sec)\tvectorized(sec)\tconstrs(loops/vectorized)\tnonzeros(loops/vectorized)'
+    print(header)
+    f_log.write(header + '\n')
+
+    for K in Ks:
+        for H in Hs:
+            for T in Ts:
+                instance = scaled_instance(K, H, T, np.random.default_rng(42))
+
+                (vec_time, vec_constrs, vec_nz) = time_build(K, H, T, instance, True)
+                if H*K*T <= args.loops_limit:
+                    (loop_time, loop_constrs, loop_nz) = time_build(K, H, T, instance, False)
+                    loops = f'{loop_time:.3f}'
+                    sizes = (f'{loop_constrs}/{vec_constrs}', f'{loop_nz}/{vec_nz}')
+                else:
+                    loops = '-'
+                    sizes = (f'-/{vec_constrs}', f'-/{vec_nz}')
+
+                line = f'{K}\t{H}\t{T}\t{loops}\t{vec_time:.3f}\t{sizes[0]}\t{sizes[1]}'
+                print(line)
+                f_log.write(line + '\n')
+                f_log.flush()
+
+    f_log.close()
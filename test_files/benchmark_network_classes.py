@@ -0,0 +1,64 @@
+import argparse
+import numpy as np
+import random
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_network_classes.txt', help='filename for the logging')
+    parser.add_argument('--connections', type=str, default='100,1000,10000,100000,1000000,10000000', help='list of K*H in the format of n1,n2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers (K is the number of connections divided by H)')
+    parser.add_argument('--loops_limit', type=int, default=10000, help='the draw of the global random is skipped for more connections than this')
+    args = parser.parse_args()
+    return args
+
+'''
+Number of connections of each class (bandwidths 1-4, 5-10, 11-15, 16-20).
+'''
+def class_counts(network_type):
+    return [int(np.sum((network_type >= low) & (network_type <= high))) for (low, high) in ((1,4), (5,10), (11,15), (16,20))]
+
+if __name__ == '__main__':
+    args = get_args()
+    H = args.helpers
+
+    f_log = open(args.log, 'w')
+    f_log.write('K\tH\tglobal random(sec)\tGenerator(sec)\n')
+    failed = 0
+    print('K\tH\tglobal random(sec)\tGenerator(sec)\tconnections per class')
+    for connections in [int(n) for n in args.connections.split(',')]:
+        K = max(connections // H, 1)
+
+        start = time.time()
+        network_type = utils.network_classes(K, H, np.random.default_rng(42))
+        duration_vectorized = time.time() - start
+        counts = class_counts(network_type)
+
+        if K*H <= args.loops_limit:
+            random.seed(42)
+            start = time.time()
+            legacy = utils.network_classes(K, H)
+            duration_legacy = f'{time.time() - start:.3f}'
+            if class_counts(legacy) != counts:
+                failed += 1
+                print(f'{utils.bcolors.FAIL}K={K}, H={H}: {counts} connections per class instead of {class_counts(legacy)}{utils.bcolors.ENDC}')
+        else:
+            duration_legacy = '-'
+
+        if sum(counts) != K*H:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}K={K}, H={H}: {K*H - sum(counts)} connections without a class{utils.bcolors.ENDC}')
+
+        print(f'{K}\t{H}\t{duration_legacy}\t{duration_vectorized:.3f}\t{counts}')
+        f_log.write(f'{K}\t{H}\t{duration_legacy}\t{duration_vectorized:.3f}\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}Both draws give the same number of connections per class{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import schedule
+import single_machine
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_schedule.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=100, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers')
+    parser.add_argument('--max_slot', type=int, default=2000, help='the largest processing time of a job in slots')
+    parser.add_argument('--dense_limit', type=int, default=10000000, help='the dense view is built and checked only up to this number of slots H*K*T')
+    args = parser.parse_args()
+    return args
+
+'''
+The schedules of the forward and the backward jobs of random clients on H helpers
+(round robin), with the preemptive Jackson schedules of single_machine.py.
+Returns the intervals and the horizon T_back.
+'''
+def random_plan(K, H, max_slot, rng):
+    intervals = []
+    T_back = 0
+    for i in range(H):
+        Kx = list(range(i, K, H))
+        n = len(Kx)
+        (release_date, proc) = (rng.integers(0, max_slot, n), rng.integers(1, max_slot, n))
+        tail = rng.integers(0, max_slot, n)
+        T = int(np.max(release_date) + n*np.max(proc))
+        x = single_machine.jackson(release_date, proc, tail, T)
+        release_date_back = x.ends(n, schedule.FORWARD) + tail
+        proc_bck = rng.integers(1, max_slot, n)
+        T_helper = int(np.max(release_date_back) + n*np.max(proc_bck))
+        z = single_machine.jackson(release_date_back, proc_bck, tail, T_helper, x.busy(T_helper), schedule.BACKWARD)
+        intervals.append(schedule.concat((x, z)).relabel(i, Kx))
+        T_back = max(T_back, T_helper)
+    return (schedule.concat(intervals), T_back)
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+
+    (plan, T_back) = random_plan(K, H, args.max_slot, np.random.default_rng(0))
+    dense_bytes = 2*H*K*T_back*8 # x_par and z_par of float64
+    print(f'K={K}, H={H}, T_back={T_back}: {len(plan)} intervals')
+    print(f'intervals: {plan.nbytes/2**20:.3f} MB, dense x_par and z_par: {dense_bytes/2**20:.1f} MB')
+
+    f_log = open(args.log, 'w')
+    f_log.write('K\tH\tT_back\tintervals\tintervals(MB)\tdense(MB)\n')
+    f_log.write(f'{K}\t{H}\t{T_back}\t{len(plan)}\t{plan.nbytes/2**20:.3f}\t{dense_bytes/2**20:.1f}\n')
+    f_log.close()
+
+    failed = 0
+    if H*K*T_back <= args.dense_limit:
+        for phase in (schedule.FORWARD, schedule.BACKWARD):
+            start = time.time()
+            dense = plan.dense(phase, H, K, T_back)
+            duration = time.time() - start
+            print(f'dense view of the phase {phase}: {duration:.3f} sec')
+            (last, machine) = plan.last_slots(K, phase)
+            (last_dense, machine_dense) = schedule.last_slots(dense)
+            same = schedule.from_dense(dense, phase)
+            if not (np.array_equal(last, last_dense) and np.array_equal(machine, machine_dense)
+                    and np.array_equal(same.dense(phase, H, K, T_back), dense)):
+                failed += 1
+                print(f'{utils.bcolors.FAIL}The intervals of the phase {phase} do not match their dense view{utils.bcolors.ENDC}')
+        if failed == 0:
+            print(f'{utils.bcolors.OKGREEN}The intervals match their dense view{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
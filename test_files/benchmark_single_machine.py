@@ -0,0 +1,100 @@
+import argparse
+import gurobipy as gp
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_hybrid as admm_hybrid
+import ADMM_solution as admm_sol
+import schedule
+import single_machine
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_single_machine.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=8, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=3, help='the number of helpers')
+    parser.add_argument('--repetitions', '-r', type=int, default=50, help='the number of random subproblems')
+    args = parser.parse_args()
+    return args
+
+'''
+The largest completion time of the clients in a (1,K,T) schedule, with their tails.
+'''
+def makespan(schedule, tail):
+    return np.max(np.max(np.rint(schedule[0])*np.arange(1, schedule.shape[2]+1), axis=1) + tail)
+
+'''
+Random subproblems of one helper: the forward one with feasibility_check and with
+single_machine.forward, then the backward one (after the forward schedule of Jackson)
+with backward_for_each_machine and single_machine.backward. Both must give the same
+makespan, as both are exact. Returns the number of mismatches and the times.
+'''
+def compare_subproblems(K, repetitions, rng):
+    failed = 0
+    times = np.zeros(4)
+    for n in range(repetitions):
+        (release_date, proc, proc_local, trans_back) = (rng.integers(0, 5, K), rng.integers(1, 4, K), rng.integers(0, 3, K), rng.integers(0, 4, K))
+        T = int(np.max(release_date) + K*np.max(proc))
+        start = time.time()
+        x_gurobi = admm_sol.feasibility_check(K, release_date, proc, proc_local, trans_back, K, T)
+        times[0] += time.time() - start
+        start = time.time()
+        x = single_machine.forward(K, release_date, proc, proc_local, trans_back, K, T)
+        times[1] += time.time() - start
+        x = x.dense(schedule.FORWARD, 1, K, T)
+
+        release_date_back = (release_date + np.max((np.arange(T)+1)*x[0], axis=1) + proc_local + trans_back).astype(int)
+        (proc_bck, proc_local_back, trans_back_gradients) = (rng.integers(1, 4, K), rng.integers(0, 3, K), rng.integers(0, 4, K))
+        T_back = int(np.max(release_date_back) + K*np.max(proc_bck))
+        x_extend = np.zeros((1,K,T_back))
+        x_extend[0,:,:min(T,T_back)] = x[0,:,:min(T,T_back)]
+        start = time.time()
+        z_gurobi = admm_sol.backward_for_each_machine(K, release_date_back, proc_bck, proc_local_back, trans_back_gradients, K, T_back, x_extend)
+        times[2] += time.time() - start
+        start = time.time()
+        z = single_machine.backward(K, release_date_back, proc_bck, proc_local_back, trans_back_gradients, K, T_back, x_extend)
+        times[3] += time.time() - start
+        z = z.dense(schedule.BACKWARD, 1, K, T_back)
+
+        if makespan(x, trans_back + proc_local) != makespan(x_gurobi, trans_back + proc_local):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}Forward subproblem {n}: Jackson {makespan(x, trans_back + proc_local)}, Gurobi {makespan(x_gurobi, trans_back + proc_local)}{utils.bcolors.ENDC}')
+        if makespan(z, trans_back_gradients + proc_local_back) != makespan(z_gurobi, trans_back_gradients + proc_local_back):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}Backward subproblem {n}: Jackson {makespan(z, trans_back_gradients + proc_local_back)}, Gurobi {makespan(z_gurobi, trans_back_gradients + proc_local_back)}{utils.bcolors.ENDC}')
+    return (failed, times)
+
+if __name__ == '__main__':
+    args = get_args()
+    (K, H) = (args.clients, args.helpers)
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+    (failed, times) = compare_subproblems(K, args.repetitions, np.random.default_rng(0))
+    print('subproblem\tgurobi(sec)\tjackson(sec)')
+    print(f'forward\t{times[0]:.3f}\t{times[1]:.3f}\nbackward\t{times[2]:.3f}\t{times[3]:.3f}')
+    f_log.write(f'subproblem\tgurobi(sec)\tjackson(sec)\nforward\t{times[0]:.3f}\t{times[1]:.3f}\nbackward\t{times[2]:.3f}\t{times[3]:.3f}\n')
+
+    print('module\tscheduler\tmakespan\thelpers(sec)\ttotal(sec)')
+    f_log.write('module\tscheduler\tmakespan\thelpers(sec)\ttotal(sec)\n')
+    for (name, module, hybrid) in (('ADMM_solution', admm_sol, False), ('ADMM_hybrid', admm_hybrid, True)):
+        instance = random_instance(K, H, hybrid, np.random.default_rng(0), device_slowdown=4)
+        for scheduler in ('gurobi', 'jackson'):
+            timings = []
+            start = time.time()
+            w_admm = module.run(K, H, 0, *instance, timings=timings, scheduler=scheduler)[0]
+            duration = time.time() - start
+            helpers = sum(wall for (_, subproblem, wall, _) in timings if subproblem == 'helpers')
+            print(f'{name}\t{scheduler}\t{w_admm[-1]}\t{helpers:.3f}\t{duration:.3f}')
+            f_log.write(f'{name}\t{scheduler}\t{w_admm[-1]}\t{helpers:.3f}\t{duration:.3f}\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}Jackson and Gurobi give the same makespans in all the subproblems{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
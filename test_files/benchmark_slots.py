@@ -0,0 +1,78 @@
+import argparse
+import math
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='benchmark_slots.txt', help='filename for the logging')
+    parser.add_argument('--connections', type=str, default='100,10000,1000000,10000000', help='list of K*H in the format of n1,n2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers (K is the number of connections divided by H)')
+    parser.add_argument('--slot', type=float, default=7.3, help='the duration of a slot')
+    parser.add_argument('--loops_limit', type=int, default=1000000, help='the nested loops are skipped for more connections than this')
+    args = parser.parse_args()
+    return args
+
+'''
+The quantization of the scenarios before utils.to_slots, one entry at a time.
+'''
+def nested_loops(values, slot):
+    (K, H) = values.shape
+    slots = np.zeros((K,H))
+    for i in range(K):
+        for j in range(H):
+            slots[i,j] = math.ceil(values[i,j]/slot)
+            if slots[i,j] == 0:
+                slots[i,j] = 1
+    return slots
+
+if __name__ == '__main__':
+    args = get_args()
+    H = args.helpers
+    rng = np.random.default_rng(42)
+
+    f_log = open(args.log, 'w')
+    f_log.write('K\tH\tloops(sec)\tceil(sec)\tround(sec)\tstochastic(sec)\n')
+    failed = 0
+    print('K\tH\tloops(sec)\tceil(sec)\tround(sec)\tstochastic(sec)\tmean error of the slots (ceil/round/stochastic)')
+    for connections in [int(n) for n in args.connections.split(',')]:
+        K = max(connections // H, 1)
+        values = rng.random((K,H))*100
+
+        durations = {}
+        errors = []
+        for rounding in ('ceil', 'round', 'stochastic'):
+            start = time.time()
+            slots = utils.to_slots(values, args.slot, rounding, True, rng)
+            durations[rounding] = time.time() - start
+            if slots.dtype.kind != 'i':
+                failed += 1
+                print(f'{utils.bcolors.FAIL}K={K}, H={H}: {rounding} gives {slots.dtype} slots{utils.bcolors.ENDC}')
+            errors.append(np.mean(slots*args.slot - values))
+            if rounding == 'ceil':
+                ceil = slots
+
+        if K*H <= args.loops_limit:
+            start = time.time()
+            legacy = nested_loops(values, args.slot)
+            duration_legacy = f'{time.time() - start:.3f}'
+            if not np.array_equal(legacy, ceil):
+                failed += 1
+                print(f'{utils.bcolors.FAIL}K={K}, H={H}: {int(np.sum(legacy != ceil))} slots differ from the nested loops{utils.bcolors.ENDC}')
+        else:
+            duration_legacy = '-'
+
+        print(f'{K}\t{H}\t{duration_legacy}\t' + '\t'.join(f'{durations[r]:.3f}' for r in ('ceil', 'round', 'stochastic'))
+              + '\t' + '/'.join(f'{e:.3f}' for e in errors))
+        f_log.write(f'{K}\t{H}\t{duration_legacy}\t' + '\t'.join(f'{durations[r]:.3f}' for r in ('ceil', 'round', 'stochastic')) + '\n')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The ceil policy gives the slots of the nested loops, all the policies give int slots{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
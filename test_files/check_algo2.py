@@ -0,0 +1,115 @@
+import argparse
+import gurobipy as gp
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ADMM_solution as admm_sol
+import schedule
+import single_machine
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', '-n', type=int, default=200, help='the number of random subproblems to compare with backward_for_each_machine')
+    parser.add_argument('--clients', '-K', type=str, default='10,100,1000,5000', help='list of clients for the timing, in the format of k1,k2,...')
+    args = parser.parse_args()
+    return args
+
+'''
+A random backward subproblem of one helper with K clients: the forward schedule x is the
+one of feasibility_check (or of Jackson if gurobi is False), the backward jobs are released
+after the end of the forward ones. Returns the arguments of backward_for_each_machine.
+'''
+def random_subproblem(K, rng, gurobi=True):
+    (release_date, proc, proc_local, trans_back) = (rng.integers(0, 5, K), rng.integers(1, 4, K), rng.integers(0, 3, K), rng.integers(0, 4, K))
+    T = int(np.max(release_date) + K*np.max(proc))
+    if gurobi:
+        x = admm_sol.feasibility_check(K, release_date, proc, proc_local, trans_back, K, T)
+    else:
+        x = single_machine.forward(K, release_date, proc, proc_local, trans_back, K, T).dense(schedule.FORWARD, 1, K, T)
+
+    # the backward jobs overlap the forward ones, so that the blocks mix both
+    release_date_back = (release_date + rng.integers(0, 3, K)).astype(int)
+    (proc_bck, proc_local_back, trans_back_gradients) = (rng.integers(1, 4, K), rng.integers(0, 4, K), rng.integers(0, 4, K))
+    T_back = int(max(T, np.max(release_date_back)) + K*np.max(proc_bck))
+    x_extend = np.zeros((1,K,T_back))
+    x_extend[0,:,:T] = np.rint(x[0])
+    return (K, release_date_back, proc_bck, proc_local_back, trans_back_gradients, K, T_back, x_extend)
+
+'''
+The properties of a backward schedule z (dense (K,T)) of the subproblem: every client gets
+proc slots, none before its release, and a slot holds at most one job, forward or backward.
+Returns the list of the violated properties.
+'''
+def violations(z, subproblem):
+    (K, release_date, proc, proc_local, trans_back, memory_capacity, T, x) = subproblem
+    found = []
+    if np.any(np.sum(z, axis=1) != proc):
+        found.append('processing times')
+    if np.any(z[np.arange(T) < release_date[:,None]]):
+        found.append('release dates')
+    if np.any(np.sum(z, axis=0) + np.sum(x[0], axis=0) > 1):
+        found.append('one job per slot')
+    return found
+
+'''
+The largest completion time of the clients in a (K,T) schedule, with their tails.
+'''
+def makespan(z, tail):
+    return np.max(np.max(z*np.arange(1, z.shape[1]+1), axis=1) + tail)
+
+def compare(args):
+    rng = np.random.default_rng(7)
+    failed = 0
+    for n in range(args.instances):
+        K = int(rng.integers(1, 9))
+        subproblem = random_subproblem(K, rng)
+        (T, tail) = (subproblem[6], subproblem[4] + subproblem[3])
+
+        z_gurobi = np.rint(admm_sol.backward_for_each_machine(*subproblem)[0])
+        z_jackson = single_machine.backward(*subproblem).dense(schedule.BACKWARD, 1, K, T)[0]
+        intervals = single_machine.algo2(*subproblem)
+        z = intervals.dense(schedule.BACKWARD, 1, K, T)[0]
+
+        for violation in violations(z, subproblem):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}subproblem {n} (K={K}): algo2 violates {violation}{utils.bcolors.ENDC}')
+        # the intervals of Algorithm 2 also hold when given as intervals instead of a dense x
+        x = schedule.from_dense(subproblem[7], schedule.FORWARD)
+        if np.any(single_machine.algo2(*subproblem[:7], x).dense(schedule.BACKWARD, 1, K, T)[0] != z):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}subproblem {n} (K={K}): algo2 differs with the intervals of x{utils.bcolors.ENDC}')
+        (w, w_gurobi, w_jackson) = (makespan(z, tail), makespan(z_gurobi, tail), makespan(z_jackson, tail))
+        if w != w_gurobi or w != w_jackson:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}subproblem {n} (K={K}): algo2 {w}, Gurobi {w_gurobi}, Jackson {w_jackson}{utils.bcolors.ENDC}')
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}algo2 gives feasible schedules with the makespans of Gurobi and Jackson in {args.instances} subproblems{utils.bcolors.ENDC}')
+    return failed
+
+def timing(args):
+    rng = np.random.default_rng(0)
+    print('K\talgo2(sec)\tjackson(sec)')
+    for K in [int(k) for k in args.clients.split(',')]:
+        subproblem = random_subproblem(K, rng, gurobi=False)
+
+        start = time.time()
+        single_machine.algo2(*subproblem)
+        algo2_time = time.time() - start
+
+        start = time.time()
+        single_machine.backward(*subproblem)
+        print(f'{K}\t{algo2_time:.3f}\t{time.time() - start:.3f}')
+
+if __name__ == '__main__':
+    args = get_args()
+    gp.setParam('OutputFlag', 0)
+
+    failed = compare(args)
+    timing(args)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,109 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import fcfs_engine
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--instances', '-n', type=int, default=1000, help='the number of random instances to compare with utils.fifo')
+    parser.add_argument('--clients', '-K', type=str, default='10,100,1000,10000', help='list of clients for the timing, in the format of k1,k2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=10, help='the number of helpers for the timing')
+    args = parser.parse_args()
+    return args
+
+'''
+A random instance of instances.py with values up to 3, so that many tasks are released at
+the same time and the tie-breaking of FCFS matters, and a random assignment y: every
+client on a random helper or, in the hybrid layout, on its own device with probability 0.3.
+Returns the arguments of fcfs_engine.fcfs after K and the number of machines.
+'''
+def fcfs_instance(K, H, hybrid, rng):
+    (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, _, _,
+     release_date_back, proc_bck, proc_local_back, trans_back_gradients) = random_instance(K, H, hybrid, rng, release=4, proc=4, transfer=3)
+
+    y = np.zeros((K, H + K if hybrid else H))
+    if hybrid:
+        own = rng.random(K) < 0.3 # clients that do not offload
+        machine = np.where(own, H + np.arange(K), rng.integers(0, H, K))
+    else:
+        machine = rng.integers(0, H, K)
+    y[np.arange(K), machine] = 1
+
+    return (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+            release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
+
+def compare(args):
+    rng = np.random.default_rng(42)
+    failed = 0
+    instances = []
+    completions = []
+    for n in range(args.instances):
+        hybrid = (n % 2 == 1)
+        K = int(rng.integers(1, 15))
+        H = int(rng.integers(1, 4))
+        instance = fcfs_instance(K, H, hybrid, rng)
+        machines = H + K if hybrid else H
+
+        w_fifo = utils.fifo(K, machines, *instance)
+        (f_temp, w) = fcfs_engine.fcfs(K, machines, *instance)
+
+        # utils.fifo returns only the makespan, so compare the machines one by one
+        y = instance[-1]
+        for machine in np.nonzero(np.any(y == 1, axis=0))[0]:
+            single = np.zeros(y.shape)
+            single[:,machine] = y[:,machine]
+            w_machine = utils.fifo(K, machines, *instance[:-1], single)
+            if np.max(f_temp[y[:,machine] == 1]) != w_machine:
+                failed += 1
+                print(f'{utils.bcolors.FAIL}instance {n}: machine {machine} ends at {np.max(f_temp[y[:,machine] == 1])} instead of {w_machine}{utils.bcolors.ENDC}')
+
+        if w != w_fifo:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}instance {n} (K={K}, H={H}, hybrid={hybrid}): {w} instead of {w_fifo}{utils.bcolors.ENDC}')
+
+        instances.append(instance)
+        completions.append(f_temp)
+
+    # all the instances at once, padded to the same size
+    (f_batch, _) = fcfs_engine.fcfs_batch(*fcfs_engine.stack_scenarios(instances))
+    for n in range(len(instances)):
+        if np.any(f_batch[n,:len(completions[n])] != completions[n]):
+            failed += 1
+            print(f'{utils.bcolors.FAIL}instance {n}: fcfs_batch gives {f_batch[n,:len(completions[n])]} instead of {completions[n]}{utils.bcolors.ENDC}')
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The makespans of {args.instances} instances match utils.fifo, also when evaluated in one batch{utils.bcolors.ENDC}')
+    return failed
+
+def timing(args):
+    rng = np.random.default_rng(0)
+    H = args.helpers
+    print('K\tH\tfcfs_engine(sec)\tutils.fifo(sec)')
+    for K in [int(k) for k in args.clients.split(',')]:
+        instance = fcfs_instance(K, H, False, rng)
+
+        start = time.time()
+        fcfs_engine.fcfs(K, H, *instance)
+        engine_time = time.time() - start
+
+        if K <= 1000: # the list scan of utils.fifo is quadratic
+            start = time.time()
+            utils.fifo(K, H, *instance)
+            fifo = f'{time.time() - start:.3f}'
+        else:
+            fifo = '-'
+        print(f'{K}\t{H}\t{engine_time:.3f}\t{fifo}')
+
+if __name__ == '__main__':
+    args = get_args()
+
+    failed = compare(args)
+    timing(args)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,96 @@
+import argparse
+import numpy as np
+import pandas as pd
+import random
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import profiles
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', '-K', type=int, default=10, help='the number of clients of the timed scenarios')
+    parser.add_argument('--helpers', '-H', type=int, default=3, help='the number of helpers of the timed scenarios')
+    parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
+    args = parser.parse_args()
+    return args
+
+files = ['../real_data/resnet101_CIFAR.xlsx', '../real_data/resnet101_MNIST.xlsx',
+         '../real_data/vgg19_CIFAR.xlsx', '../real_data/vgg19_MNIST.xlsx']
+
+'''
+The totals of the profile store against the loops over the sheets that create_scenario
+used, for every pair of splitting points. Returns the largest difference.
+'''
+def compare(filename):
+    sheets = {name: pd.read_excel(io=filename, sheet_name=name, header=None).values.tolist()
+              for name in profiles.DEVICES + ('memory',)}
+    profile = profiles.load_profile(filename)
+    layers = profile['layers']
+    error = 0
+    for a in range(layers+1):
+        for b in range(a, layers+1):
+            for name in profiles.DEVICES:
+                fwd = sum(sheets[name][i][0] for i in range(a, b))
+                bwd = sum(sheets[name][i][1] + sheets[name][i][2] for i in range(a, b))
+                error = max(error, abs(profiles.segment(profile, name, a, b)[0] - fwd),
+                            abs(profiles.segment(profile, name, a, b)[1] - bwd))
+            store = sum(sheets['memory'][i][0] + sheets['memory'][i][1] for i in range(a, b))
+            error = max(error, abs(profiles.store(profile, a, b) - store))
+            if b > 0:
+                error = max(error, abs(profiles.activations(profile, b) - sheets['memory'][b-1][0]))
+    return (layers, error)
+
+'''
+create_scenario for all the splitting points of a workbook: with a cold cache (the
+workbook is parsed), with the .npz file only, and with the profile already in memory.
+'''
+def timing(filename, args):
+    layers = profiles.load_profile(filename)['layers']
+    points = [(a, b) for a in range(1, layers) for b in range(a+1, layers)]
+
+    def sweep():
+        start = time.time()
+        for (a, b) in points:
+            utils.create_scenario(filename, a, b, args.clients, args.helpers, args.scenario, 100)
+        return time.time() - start
+
+    start = time.time() # the seven sheets that create_scenario read in every call
+    for name in profiles.DEVICES + ('memory',):
+        pd.read_excel(io=filename, sheet_name=name, header=None)
+    parse = time.time() - start
+
+    profiles._profiles.clear()
+    start = time.time()
+    profiles.load_profile(filename)
+    npz = time.time() - start
+
+    random_state = random.getstate()
+    warm = sweep()
+    random.setstate(random_state)
+    return (len(points), parse, npz, warm)
+
+if __name__ == '__main__':
+    args = get_args()
+
+    failed = 0
+    print('workbook\tlayers\tlargest difference')
+    for filename in files:
+        (layers, error) = compare(filename)
+        print(f'{filename}\t{layers}\t{error:.2e}')
+        if error > 1e-6:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}The totals of {filename} differ from the sheets{utils.bcolors.ENDC}')
+
+    print('workbook\tsplitting points\tread_excel x7(sec)\tnpz(sec)\tcreate_scenario sweep(sec)\told parsing of the sweep(sec)')
+    for filename in files:
+        (points, parse, npz, warm) = timing(filename, args)
+        print(f'{filename}\t{points}\t{parse:.3f}\t{npz:.4f}\t{warm:.3f}\t{points*parse:.1f}')
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The profile store gives the totals of the sheets for all the splitting points{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
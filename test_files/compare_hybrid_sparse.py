@@ -0,0 +1,83 @@
+import argparse
+import gurobipy as gp
+from gurobipy import GRB
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ILP_hybrid as ilp_hybrid
+import horizon
+import utils as utils
+from instances import random_instance
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='compare_hybrid_sparse.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=str, default='20,40,60,80,100', help='list of clients in the format of k1,k2,...')
+    parser.add_argument('--helpers', '-H', type=int, default=5, help='the number of helpers')
+    parser.add_argument('--time_limit', type=float, default=600, help='the time limit of every solve in seconds')
+    parser.add_argument('--build_only', action='store_true', help='only build the models and report their size')
+    args = parser.parse_args()
+    return args
+
+'''
+Builds (and solves, unless build_only) the hybrid ILP with the slots of all the devices
+(build_model) or only of the own device of every client (build_sparse_model).
+Returns the size of the model, the times and the makespan (None if not solved to
+optimality within the time limit).
+'''
+def solve(K, H, T, instance, sparse, args):
+    start = time.time()
+    if sparse:
+        m = ilp_hybrid.build_sparse_model(K, H, T, *instance)[0]
+    else:
+        m = ilp_hybrid.build_model(K, H, T, *instance)[0]
+    m.update()
+    build = time.time() - start
+
+    (w, solve_time) = (None, 0)
+    if not args.build_only:
+        m.setParam('TimeLimit', args.time_limit)
+        start = time.time()
+        m.optimize()
+        solve_time = time.time() - start
+        w = m.ObjVal if m.Status == GRB.OPTIMAL else None
+
+    return (m.NumVars, m.NumBinVars, m.NumConstrs, m.NumNZs, build, solve_time, w)
+
+if __name__ == '__main__':
+    args = get_args()
+    H = args.helpers
+    gp.setParam('OutputFlag', 0)
+
+    f_log = open(args.log, 'w')
+    header = 'K\tT\tmodel\tvariables\tbinaries\tconstraints\tnonzeros\tbuild(sec)\tsolve(sec)\tmakespan'
+    print(header)
+    f_log.write(header + '\n')
+    failed = 0
+    for K in [int(k) for k in args.clients.split(',')]:
+        (release_date, proc, proc_local, trans_back, memory_capacity, memory_demand,
+         release_date_back, proc_bck, proc_local_back, trans_back_gradients) = random_instance(K, H, True, np.random.default_rng(K), device_slowdown=4)
+        instance = (release_date, proc, proc_local, trans_back, memory_capacity,
+                    release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+        (_, T) = horizon.compact_horizon(K, H, release_date, proc, proc_local, trans_back, memory_capacity, None,
+                                         release_date_back, proc_bck, proc_local_back, trans_back_gradients, hybrid=True)
+
+        makespans = []
+        for (name, sparse) in (('dense', False), ('sparse', True)):
+            (variables, binaries, constraints, nonzeros, build, solve_time, w) = solve(K, H, T, instance, sparse, args)
+            makespans.append(w)
+            line = f'{K}\t{T}\t{name}\t{variables}\t{binaries}\t{constraints}\t{nonzeros}\t{build:.3f}\t{solve_time:.3f}\t{w}'
+            print(line)
+            f_log.write(line + '\n')
+            f_log.flush()
+
+        # both optimal makespans must be the same
+        if not args.build_only and None not in makespans and makespans[0] != makespans[1]:
+            failed += 1
+            print(f'{utils.bcolors.FAIL}K={K}: the makespan of the sparse model is {makespans[1]} instead of {makespans[0]}{utils.bcolors.ENDC}')
+    f_log.close()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,108 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ILP_solver as ilp_sol
+import ILP_hybrid as ilp_hybrid
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='compare_ilp_formulations.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=5, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=2, help='the number of helpers')
+    parser.add_argument('--splitting_points', '-S', type=str, default='3,33', help='splitting points for resnet101 in the format of s1,s2')
+    parser.add_argument('--splitting_points_vgg', type=str, default='3,10', help='splitting points for vgg19 in the format of s1,s2')
+    parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
+    parser.add_argument('--max_slot', type=int, default=20, help='the number of slots of the longest task (original) or duration of slot (hybrid)')
+    parser.add_argument('--hybrid', action='store_true', help='compare the formulations of ILP_hybrid instead of ILP_solver')
+    args = parser.parse_args()
+    return args
+
+def solve(K, H, T, instance, formulation, hybrid):
+    start = time.time()
+    if hybrid:
+        (m, _, _, _) = ilp_hybrid.build_model(K, H, T, *instance, formulation=formulation)
+    else:
+        (m, _, _, _) = ilp_sol.build_model(K, H, T, *instance, formulation=formulation)
+    m.update()
+    build = time.time() - start
+
+    m.setParam('OutputFlag', 0)
+    start = time.time()
+    m.optimize()
+    solve_time = time.time() - start
+
+    return (m.ObjVal, m.NumNZs, build, solve_time)
+
+if __name__ == '__main__':
+    args = get_args()
+
+    K = args.clients
+    H = args.helpers
+
+    filenames = ['../real_data/resnet101_CIFAR.xlsx', '../real_data/resnet101_MNIST.xlsx',
+                 '../real_data/vgg19_CIFAR.xlsx', '../real_data/vgg19_MNIST.xlsx']
+
+    f_log = open(args.log, 'w')
+    header = 'workbook\tT\tformulation\tmakespan\tnonzeros\tbuild(sec)\tsolve(sec)'
+    f_log.write(header + '\n')
+
+    results = []
+    for filename in filenames:
+        if 'vgg19' in filename:
+            points = list(args.splitting_points_vgg.split(','))
+        else:
+            points = list(args.splitting_points.split(','))
+        point_a = int(points[0])
+        point_b = int(points[1])
+
+        if args.hybrid:
+            (release_date, proc,
+            proc_local, trans_back,
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck,
+            proc_local_back, trans_back_gradients) = [v[1] for v in utils.create_scenario_hybrid(filename, point_a, point_b,
+                                                                                                  K, H, args.max_slot, args.scenario)]
+            T = np.max(release_date) + K*np.max(proc[0,0:H]) + np.max(release_date_back) + K*np.max(proc_bck[0,0:H]) \
+                        + np.max(proc_local) + np.max(proc_local_back)\
+                        + np.max(trans_back) + np.max(trans_back_gradients)
+        else:
+            (release_date, proc,
+            proc_local, trans_back,
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck,
+            proc_local_back, trans_back_gradients) = utils.create_scenario(filename, point_a, point_b,
+                                                                           K, H, args.scenario, args.max_slot)
+            T = np.max(release_date) + K*np.max(proc[0,:]) + np.max(release_date_back) + K*np.max(proc_bck[0,:]) \
+                        + np.max(proc_local) + np.max(proc_local_back)\
+                        + np.max(trans_back) + np.max(trans_back_gradients)
+        T = int(T)
+
+        instance = (release_date.astype(int), proc.astype(int),
+                    proc_local.astype(int), trans_back.astype(int),
+                    memory_capacity.astype(int),
+                    release_date_back.astype(int), proc_bck.astype(int),
+                    proc_local_back.astype(int), trans_back_gradients.astype(int))
+
+        makespans = []
+        for formulation in ['prefix', 'cumulative']:
+            (w, nonzeros, build, solve_time) = solve(K, H, T, instance, formulation, args.hybrid)
+            makespans.append(w)
+            line = f'{filename.split("/")[-1]}\t{T}\t{formulation}\t{w}\t{nonzeros}\t{build:.3f}\t{solve_time:.3f}'
+            results.append(line)
+            f_log.write(line + '\n')
+            f_log.flush()
+
+        if makespans[0] != makespans[1]:
+            print(f'{utils.bcolors.FAIL}Different makespans for {filename}: {makespans}{utils.bcolors.ENDC}')
+
+    f_log.close()
+
+    print(header)
+    for line in results:
+        print(line)
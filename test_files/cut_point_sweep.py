@@ -0,0 +1,101 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import cut_points
+import fcfs_engine
+import heuristic_FCFS as fcfs_sol
+import utils as utils
+import verbosity
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='cut_point_sweep.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=50, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=5, help='the number of helpers')
+    parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
+    parser.add_argument('--max_slot', type=int, default=100, help='the number of slots of the longest task (original) or the slot duration (hybrid)')
+    parser.add_argument('--hybrid', action='store_true', help='use the scenarios of create_scenario_hybrid, where a client may also train on its own device')
+    parser.add_argument('--check', type=int, default=10, help='the number of pairs of splitting points compared with the scenario of utils.py')
+    parser.add_argument('--verbosity', '-v', type=str, default='warning', help='messages of util_files: quiet, warning, info or debug (also the tensors of every scenario)')
+    parser.add_argument('--dump', type=str, default=None, help='folder where the tensors of every scenario are dumped as .npz files')
+    args = parser.parse_args()
+    return args
+
+files = {'resnet101': '../real_data/resnet101_CIFAR.xlsx', 'vgg19': '../real_data/vgg19_CIFAR.xlsx'}
+
+if __name__ == '__main__':
+    args = get_args()
+    verbosity.set_verbosity(args.verbosity)
+    verbosity.set_dump(args.dump)
+    K = args.clients
+    H = args.helpers
+
+    f_log = open(args.log, 'w')
+    f_log.write('model\tpoint_a\tpoint_b\tmakespan\n')
+    failed = 0
+    for model_type, filename in files.items():
+        # the tensors of all the pairs of splitting points
+        start = time.time()
+        if args.hybrid:
+            (points, scenario) = cut_points.create_scenarios_hybrid(filename, K, H, args.max_slot, args.scenario)
+        else:
+            (points, scenario) = cut_points.create_scenarios(filename, K, H, args.scenario, args.max_slot)
+        duration_all = time.time() - start
+
+        # a few of them, one at a time
+        rng = np.random.default_rng(0)
+        checked = rng.choice(len(points), min(args.check, len(points)), replace=False)
+        start = time.time()
+        for p in checked:
+            (point_a, point_b) = points[p]
+            if args.hybrid:
+                single = utils.create_scenario_hybrid(filename, point_a, point_b, K, H, args.max_slot, args.scenario)
+            else:
+                single = utils.create_scenario(filename, point_a, point_b, K, H, args.scenario, args.max_slot)
+            for n in range(10):
+                expected = single[n][1] if (args.hybrid and n != 5) else single[n]
+                value = scenario[n][1][p] if (args.hybrid and n != 5) else scenario[n][p]
+                if not np.array_equal(expected, value):
+                    failed += 1
+                    print(f'{utils.bcolors.FAIL}{model_type} ({point_a},{point_b}): tensor {n} differs from utils.py{utils.bcolors.ENDC}')
+        duration_single = (time.time() - start)/len(checked)
+
+        if args.hybrid:
+            scenario = tuple(v if n == 5 else v[1] for n, v in enumerate(scenario))
+        (release_date, proc,
+        proc_local, trans_back,
+        memory_capacity, memory_demand,
+        release_date_back, proc_bck,
+        proc_local_back, trans_back_gradients) = scenario
+
+        # balanced-greedy assignment of every pair, and FCFS of all the pairs at once
+        start = time.time()
+        y = np.zeros(proc.shape)
+        for p in range(len(points)):
+            if args.hybrid:
+                y[p] = fcfs_sol.balanced_greedy_hybrid(K, H, release_date[p], proc[p], trans_back[p],
+                                                       memory_capacity[p], memory_demand[p],
+                                                       release_date_back[p], proc_bck[p], trans_back_gradients[p])
+            else:
+                y[p] = fcfs_sol.balanced_greedy(K, H, memory_capacity[p], memory_demand[p])
+        (_, makespan) = fcfs_engine.fcfs_batch(release_date, proc, proc_local, trans_back,
+                                               release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
+        duration_fcfs = time.time() - start
+
+        for (point_a, point_b), w in zip(points, makespan):
+            f_log.write(f'{model_type}\t{point_a}\t{point_b}\t{w}\n')
+
+        if args.hybrid: # the slots of the original scenario are relative to the longest task of each pair
+            best = np.argmin(makespan)
+            print(f'{utils.bcolors.OKGREEN}{model_type}: the best splitting points for FCFS are ({points[best][0]},{points[best][1]}) with makespan {makespan[best]}{utils.bcolors.ENDC}')
+        print(f'{model_type}: {len(points)} pairs of splitting points, all the tensors in {duration_all:.3f} sec ({duration_single:.4f} sec per pair with utils.py), FCFS of all the pairs in {duration_fcfs:.3f} sec')
+    f_log.close()
+
+    if failed == 0:
+        print(f'{utils.bcolors.OKGREEN}The tensors of the checked pairs match utils.py{utils.bcolors.ENDC}')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,114 @@
+import argparse
+import numpy as np
+import random
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import fcfs_engine
+import heuristic_FCFS as fcfs_sol
+import random_benchmark as random_sol
+import utils as utils
+import verbosity
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='fcfs_sweep.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=100, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=str, default='1,2,5,10,20,25', help='list of helpers in the format of h1,h2,...')
+    parser.add_argument('--repetitions', '-r', type=int, default=5, help='the number of random scenarios per number of helpers')
+    parser.add_argument('--splitting_points', '-S', type=str, default='3,33', help='give an input in the format of s1,s2')
+    parser.add_argument('--model', '-m', type=str, default='resnet101', help='select model resnet101/vgg19')
+    parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
+    parser.add_argument('--dataset', '-d', type=str, default='cifar10', help='dataset, options cifar10/mnist')
+    parser.add_argument('--verbosity', '-v', type=str, default='warning', help='messages of util_files: quiet, warning, info or debug (also the tensors of every scenario)')
+    parser.add_argument('--dump', type=str, default=None, help='folder where the tensors of every scenario are dumped as .npz files')
+    args = parser.parse_args()
+    return args
+
+if __name__ == '__main__':
+    args = get_args()
+    verbosity.set_verbosity(args.verbosity)
+    verbosity.set_dump(args.dump)
+
+    K = args.clients
+    H = [int(h) for h in args.helpers.split(',')]
+
+    points = list(args.splitting_points.split(','))
+    point_a = int(points[0])
+    point_b = int(points[1])
+
+    model_type = args.model
+    dataset = args.dataset
+    if model_type == 'resnet101':
+        if dataset == 'cifar10':
+            filename = '../real_data/resnet101_CIFAR.xlsx'
+        elif dataset == 'mnist':
+            filename = '../real_data/resnet101_MNIST.xlsx'
+    elif model_type == 'vgg19':
+        if dataset == 'cifar10':
+            filename = '../real_data/vgg19_CIFAR.xlsx'
+        elif dataset == 'mnist':
+            filename = '../real_data/vgg19_MNIST.xlsx'
+
+    # the scenarios of the sweep and the assignments of the two policies
+    labels = []
+    scenarios = []
+    for h in H:
+        for r in range(args.repetitions):
+            (release_date, proc,
+            proc_local, trans_back,
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck,
+            proc_local_back, trans_back_gradients) = utils.create_scenario(filename, point_a, point_b,
+                                                                           K, h,
+                                                                           args.scenario, 100)
+            instance = tuple(np.asarray(v).astype(int) for v in (release_date, proc, proc_local, trans_back,
+                                                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients))
+
+            y_fcfs = fcfs_sol.balanced_greedy(K, h, memory_capacity, memory_demand)
+            random.seed(42)
+            y_random = random_sol.random_assignment(K, h, memory_capacity, memory_demand)
+
+            for policy, y in (('balanced-greedy', y_fcfs), ('random', y_random)):
+                labels.append((h, r, policy))
+                scenarios.append(instance + (y,))
+
+    # one scenario at a time
+    start = time.time()
+    w_fifo = []
+    for s in scenarios:
+        w_fifo.append(utils.fifo(K, s[-1].shape[1], *s))
+    duration_fifo = time.time() - start
+
+    start = time.time()
+    w_loop = [fcfs_engine.fcfs(K, s[-1].shape[1], *s)[1] for s in scenarios]
+    duration_loop = time.time() - start
+
+    # all the scenarios at once
+    start = time.time()
+    stacked = fcfs_engine.stack_scenarios(scenarios)
+    (_, w_batch) = fcfs_engine.fcfs_batch(*stacked)
+    duration_batch = time.time() - start
+
+    f_log = open(args.log, 'w')
+    f_log.write('helpers\trepetition\tpolicy\tmakespan\n')
+    mismatches = 0
+    for (h, r, policy), w, w_ref in zip(labels, w_batch, w_fifo):
+        f_log.write(f'{h}\t{r}\t{policy}\t{w}\n')
+        if w != w_ref:
+            mismatches += 1
+            print(f'{utils.bcolors.FAIL}H={h} repetition {r} {policy}: {w} instead of {w_ref}{utils.bcolors.ENDC}')
+    f_log.close()
+
+    for h in H:
+        for policy in ('balanced-greedy', 'random'):
+            w = [w_batch[n] for n in range(len(labels)) if labels[n][0] == h and labels[n][2] == policy]
+            print(f'{utils.bcolors.OKGREEN}The mean makespan of {policy} for {h} helpers is {np.mean(w)}{utils.bcolors.ENDC}')
+
+    print(f'{len(scenarios)} scenarios: utils.fifo {duration_fifo:.3f} sec, fcfs_engine.fcfs {duration_loop:.3f} sec, fcfs_engine.fcfs_batch {duration_batch:.3f} sec')
+    if mismatches == 0:
+        print(f'{utils.bcolors.OKGREEN}The batched makespans match utils.fifo{utils.bcolors.ENDC}')
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,123 @@
+import argparse
+import numpy as np
+import time
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import ILP_solver as ilp_sol
+import ILP_hybrid as ilp_hybrid
+import horizon
+import utils as utils
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--log', type=str, default='horizon_savings.txt', help='filename for the logging')
+    parser.add_argument('--clients', '-K', type=int, default=50, help='the number of clients')
+    parser.add_argument('--helpers', '-H', type=int, default=5, help='the number of helpers')
+    parser.add_argument('--splitting_points', '-S', type=str, default='3,33', help='splitting points for resnet101 in the format of s1,s2')
+    parser.add_argument('--splitting_points_vgg', type=str, default='3,10', help='splitting points for vgg19 in the format of s1,s2')
+    parser.add_argument('--max_slot', type=int, default=50, help='the number of slots of the longest task (original) or duration of slot (hybrid)')
+    parser.add_argument('--build', action='store_true', help='also build the ILP with both horizons and report its size')
+    args = parser.parse_args()
+    return args
+
+def ilp_size(K, H, T, instance, hybrid):
+    start = time.time()
+    if hybrid:
+        (m, _, _, _) = ilp_hybrid.build_model(K, H, T, *instance)
+    else:
+        (m, _, _, _) = ilp_sol.build_model(K, H, T, *instance)
+    m.update()
+    return (m.NumVars, m.NumNZs, time.time() - start)
+
+if __name__ == '__main__':
+    args = get_args()
+
+    K = args.clients
+    H = args.helpers
+
+    filenames = ['../real_data/resnet101_CIFAR.xlsx', '../real_data/resnet101_MNIST.xlsx',
+                 '../real_data/vgg19_CIFAR.xlsx', '../real_data/vgg19_MNIST.xlsx']
+
+    f_log = open(args.log, 'w')
+    header = 'workbook\tscenario\tcase\tT_fwd(loose/compact)\tT(loose/compact)\tILP binaries(loose/compact)\tADMM binaries(loose/compact)\treduction(%)'
+    if args.build:
+        header += '\tILP vars(loose/compact)\tILP nonzeros(loose/compact)\tILP build(sec)(loose/compact)'
+    f_log.write(header + '\n')
+
+    results = []
+    for filename in filenames:
+        if 'vgg19' in filename:
+            points = list(args.splitting_points_vgg.split(','))
+        else:
+            points = list(args.splitting_points.split(','))
+        point_a = int(points[0])
+        point_b = int(points[1])
+
+        for scenario in [1, 2]:
+            for hybrid in [False, True]:
+                if hybrid:
+                    (release_date, proc,
+                    proc_local, trans_back,
+                    memory_capacity, memory_demand,
+                    release_date_back, proc_bck,
+                    proc_local_back, trans_back_gradients) = [v[1] for v in utils.create_scenario_hybrid(filename, point_a, point_b,
+                                                                                                          K, H, args.max_slot, scenario)]
+                    machines = H + K
+                else:
+                    (release_date, proc,
+                    proc_local, trans_back,
+                    memory_capacity, memory_demand,
+                    release_date_back, proc_bck,
+                    proc_local_back, trans_back_gradients) = utils.create_scenario(filename, point_a, point_b,
+                                                                                   K, H, scenario, args.max_slot)
+                    machines = H
+
+                (release_date, proc,
+                proc_local, trans_back,
+                memory_capacity,
+                release_date_back, proc_bck,
+                proc_local_back, trans_back_gradients) = [np.asarray(v).astype(int) for v in (release_date, proc,
+                                                                                             proc_local, trans_back,
+                                                                                             memory_capacity,
+                                                                                             release_date_back, proc_bck,
+                                                                                             proc_local_back, trans_back_gradients)]
+
+                loose = horizon.loose_horizon(K, H, release_date, proc,
+                                              proc_local, trans_back,
+                                              release_date_back, proc_bck,
+                                              proc_local_back, trans_back_gradients, hybrid)
+                compact = horizon.compact_horizon(K, H, release_date, proc,
+                                                  proc_local, trans_back,
+                                                  memory_capacity, None,
+                                                  release_date_back, proc_bck,
+                                                  proc_local_back, trans_back_gradients, hybrid)
+
+                size_loose = horizon.model_size(K, machines, *loose)
+                size_compact = horizon.model_size(K, machines, *compact)
+                reduction = 100*(1 - size_compact[0]/size_loose[0])
+
+                case = 'hybrid' if hybrid else 'original'
+                line = f'{filename.split("/")[-1]}\t{scenario}\t{case}\t{loose[0]}/{compact[0]}\t{loose[1]}/{compact[1]}' \
+                       + f'\t{size_loose[0]}/{size_compact[0]}\t{size_loose[1]}/{size_compact[1]}\t{reduction:.1f}'
+
+                if args.build:
+                    instance = (release_date, proc,
+                                proc_local, trans_back,
+                                memory_capacity,
+                                release_date_back, proc_bck,
+                                proc_local_back, trans_back_gradients)
+                    built = [ilp_size(K, H, T[1], instance, hybrid) for T in (loose, compact)]
+                    line += f'\t{built[0][0]}/{built[1][0]}\t{built[0][1]}/{built[1][1]}\t{built[0][2]:.3f}/{built[1][2]:.3f}'
+
+                results.append(line)
+                f_log.write(line + '\n')
+                f_log.flush()
+
+    f_log.close()
+
+    print(header)
+    for line in results:
+        print(line)
@@ -0,0 +1,45 @@
+import numpy as np
+import sys
+
+
+sys.path.insert(0,'../util_files')
+
+import utils as utils
+
+'''
+Random instance with small integer values (the models must fit in a size-limited license),
+the one of the benchmarks and checks of test_files, drawn from rng (a numpy Generator):
+release dates in [0, release), processing times in [1, proc), local parts and transfers
+in [0, transfer), and a memory demand of 1 for every client with a capacity of K on
+every helper. With hybrid the machines are the H helpers followed by the K devices, where
+the transfers are 0, the processing takes device_slowdown more slots (e.g., 4, so that
+most clients offload) and only its own client fits (utils.max_memory_demand is 1).
+Returns (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+memory_capacity, memory_demand, release_date_back, proc_bck, proc_local_back,
+trans_back_gradients).
+'''
+def random_instance(K, H, hybrid, rng, release=3, proc=3, transfer=2, device_slowdown=0):
+    machines = H + K if hybrid else H
+    release_date_fwd = rng.integers(0, release, (K,machines))
+    proc_fwd = rng.integers(1, proc, (K,machines))
+    proc_local_fwd = rng.integers(0, transfer, (K))
+    trans_back_activations = rng.integers(0, transfer, (K,machines))
+    release_date_back = rng.integers(0, release, (K,machines))
+    proc_bck = rng.integers(1, proc, (K,machines))
+    proc_local_back = rng.integers(0, transfer, (K))
+    trans_back_gradients = rng.integers(0, transfer, (K,machines))
+    memory_demand = np.ones(K)
+    if hybrid:
+        own = np.arange(K)
+        proc_fwd[own, H + own] += device_slowdown
+        proc_bck[own, H + own] += device_slowdown
+        trans_back_activations[own, H + own] = 0
+        trans_back_gradients[own, H + own] = 0
+        memory_capacity = np.array([K]*H + [1]*K)
+        utils.max_memory_demand = 1
+    else:
+        memory_capacity = np.array([K]*H)
+
+    return (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck, proc_local_back, trans_back_gradients)
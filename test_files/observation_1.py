@@ -7,7 +7,9 @@ import sys
 sys.path.insert(0,'../util_files')
 
 import ADMM_solution as admm_sol
+import admm_engine
 import ILP_solver as ilp_sol
+import horizon
 import utils as utils
 
 def get_args():
@@ -19,6 +21,15 @@ def get_args():
     parser.add_argument('--model', '-m', type=str, default='resnet101', help='select model resnet101/vgg19')
     parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
     parser.add_argument('--dataset', '-d', type=str, default='cifar10', help='dataset, options cifar10/mnist')
+    parser.add_argument('--workers', type=int, default=1, help='the number of processes for the subproblems of the helpers in ADMM (1 for one after the other)')
+    parser.add_argument('--threads', type=int, default=0, help='the maximum number of threads of each Gurobi model of the helpers (0 for no limit)')
+    parser.add_argument('--max_iter', type=int, default=3, help='the maximum number of iterations of ADMM')
+    parser.add_argument('--eps_primal', type=float, default=None, help='stop ADMM when the primal residual is at most this (in slots)')
+    parser.add_argument('--eps_dual', type=float, default=None, help='stop ADMM when the dual residual is at most this (in slots)')
+    parser.add_argument('--stable', type=int, default=None, help='stop ADMM after this number of iterations without changes of the allocation')
+    parser.add_argument('--time_budget', type=float, default=None, help='no new iteration of ADMM after this number of seconds')
+    parser.add_argument('--scheduler', type=str, default='gurobi', help='the subproblems of the helpers in ADMM, gurobi, jackson (without a solver) or algo2 (without a solver for the backward jobs)')
+    parser.add_argument('--balance', type=float, default=None, help='adapt rho of ADMM when a residual is more than this times the other one')
     args = parser.parse_args()
     return args
 
@@ -62,11 +73,11 @@ if __name__ == '__main__':
                                                                    scenario,50)
     
     # Define the time horizon
-    T = np.max(release_date) + K*np.max(proc[0,:]) + np.max(release_date_back) + K*np.max(proc_bck[0,:]) \
-                        + np.max(proc_local) + np.max(proc_local_back)\
-                        + np.max(np.max(trans_back)) + np.max(np.max(trans_back_gradients))    
-
-    T = int(T)
+    (_, T) = horizon.compact_horizon(K, H, release_date.astype(int), proc.astype(int), 
+                                     proc_local.astype(int), trans_back.astype(int), 
+                                     memory_capacity.astype(int), None, 
+                                     release_date_back.astype(int), proc_bck.astype(int), 
+                                     proc_local_back.astype(int), trans_back_gradients.astype(int))
     print(f'The time horizon {T}')
     start_ilp = time.time()
     w_star = -1
@@ -81,13 +92,20 @@ if __name__ == '__main__':
 
     duration_ilp = end_ilp - start_ilp
 
+    timings = []
+    trace = []
+    control = admm_engine.control(args.max_iter, 350, args.eps_primal, args.eps_dual, args.stable, args.time_budget, args.balance)
     w_admm, duration_admm  = admm_sol.run(K, H, T, release_date.astype(int), proc.astype(int), 
                                             proc_local.astype(int), trans_back.astype(int), 
                                             memory_capacity.astype(int), memory_demand.astype(int),
                                             release_date_back.astype(int), proc_bck.astype(int), 
                                             proc_local_back.astype(int), trans_back_gradients.astype(int), 
-                                            args.log)
+                                            args.log, timings=timings, workers=args.workers, threads=args.threads,
+                                            control=control, trace=trace, scheduler=args.scheduler)
 
     print(f"{utils.bcolors.OKGREEN}The optimal makespan is {w_star}, whereas the ADMM solution is {w_admm[-1]}{utils.bcolors.ENDC}")
     print(f"{utils.bcolors.OKGREEN}For the optimal solution we needed {duration_ilp} sec, while for the ADMM solution {duration_admm} sec{utils.bcolors.ENDC}")
+    helpers = [(wall, cpu) for (_, subproblem, wall, cpu) in timings if subproblem == 'helpers']
+    print(f"{utils.bcolors.OKGREEN}The subproblems of the helpers took {sum(wall for (wall, _) in helpers):.3f} sec with {args.workers} workers ({sum(cpu for (_, cpu) in helpers):.3f} sec of CPU){utils.bcolors.ENDC}")
+    print(f"{utils.bcolors.OKGREEN}ADMM stopped after {len(trace)} iterations ({trace[-1][6]}), primal residual {trace[-1][2]:.2f}, dual residual {trace[-1][3]:.2f}, rho {trace[-1][1]:g}{utils.bcolors.ENDC}")
     #utils.plot_approach(w_star, w_star)
@@ -12,6 +12,7 @@ sys.path.insert(0,'../util_files')
 import ADMM_solution as admm_sol
 import heuristic_FCFS as fcfs_sol
 import random_benchmark as random_sol
+import fcfs_engine
 import utils as utils
 
 def get_args():
@@ -71,23 +72,28 @@ if __name__ == '__main__':
                         + np.max(proc_local) + np.max(proc_local_back)\
                         + np.max(np.max(trans_back)) + np.max(np.max(trans_back_gradients))    
 
+    scenario_int = (release_date.astype(int), proc.astype(int), 
+                    proc_local.astype(int), trans_back.astype(int), 
+                    release_date_back.astype(int), proc_bck.astype(int), 
+                    proc_local_back.astype(int), trans_back_gradients.astype(int))
+
+    # the assignments of heuristic_FCFS.run and random_benchmark.run, with their seeds
     start_fcfs = time.time()
-    w_fcfs = fcfs_sol.run(K, H, release_date.astype(int), proc.astype(int), 
-                                            proc_local.astype(int), trans_back.astype(int), 
-                                            memory_capacity.astype(int), memory_demand.astype(int), 
-                                            release_date_back.astype(int), proc_bck.astype(int), 
-                                            proc_local_back.astype(int), trans_back_gradients.astype(int))
-    end_fcfs = time.time()
-    duration_fcfs = end_fcfs - start_fcfs
+    random.seed(42)
+    y_fcfs = fcfs_sol.balanced_greedy(K, H, memory_capacity.astype(int), memory_demand.astype(int))
+    duration_fcfs = time.time() - start_fcfs
 
     start_random = time.time()
-    w_random = random_sol.run(K, H, release_date.astype(int), proc.astype(int), 
-                                            proc_local.astype(int), trans_back.astype(int), 
-                                            memory_capacity.astype(int), memory_demand.astype(int), 
-                                            release_date_back.astype(int), proc_bck.astype(int), 
-                                            proc_local_back.astype(int), trans_back_gradients.astype(int))
-    end_random = time.time()
-    duration_random = end_random - start_random
+    random.seed(42)
+    y_random = random_sol.random_assignment(K, H, memory_capacity.astype(int), memory_demand.astype(int))
+    duration_random = time.time() - start_random
+
+    # both schedules in one batch of fcfs_engine, its time counted for both
+    start_batch = time.time()
+    (_, (w_fcfs, w_random)) = fcfs_engine.fcfs_batch(*fcfs_engine.stack_scenarios([scenario_int + (y_fcfs,), scenario_int + (y_random,)]))
+    duration_batch = time.time() - start_batch
+    duration_fcfs += duration_batch
+    duration_random += duration_batch
 
     w_admm, duration_admm = admm_sol.run(K, H, T, release_date.astype(int), proc.astype(int), 
                                             proc_local.astype(int), trans_back.astype(int), 
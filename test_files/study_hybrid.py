@@ -9,6 +9,7 @@ sys.path.insert(0,'../util_files')
 import ILP_hybrid as ilp_hybrid
 import ILP_solver as ilp_sol
 import ADMM_hybrid as admm_hybrid
+import horizon
 import utils as utils
 
 def get_args():
@@ -78,11 +79,11 @@ if __name__ == '__main__':
                                                                                 K, H, args.max_slot, args.scenario)
 
     # Define the time horizon (original)
-    T = np.max(release_date[0]) + K*np.max(proc[0][0,:]) + np.max(release_date_back[0]) + K*np.max(proc_bck[0][0,:]) \
-                        + np.max(proc_local[0]) + np.max(proc_local_back[0])\
-                        + np.max(np.max(trans_back[0])) + np.max(np.max(trans_back_gradients[0]))    
-    
-    T = int(T)
+    (_, T) = horizon.compact_horizon(K, H, release_date[0].astype(int), proc[0].astype(int), 
+                                     proc_local[0].astype(int), trans_back[0].astype(int), 
+                                     memory_capacity[0].astype(int), None, 
+                                     release_date_back[0].astype(int), proc_bck[0].astype(int), 
+                                     proc_local_back[0].astype(int), trans_back_gradients[0].astype(int))
     start_ilp = time.time()
     print('---------------------- ORIGINAL -----------------------------------')
     w_original = 2
@@ -98,12 +99,11 @@ if __name__ == '__main__':
 
     duration_ilp = end_ilp - start_ilp
     # Define the time horizon (hybrid)
-    T_hybrid = np.max(release_date[1]) + K*np.max(proc[1][0,0:H]) \
-                        + np.max(release_date_back[1]) + K*np.max(proc_bck[1][0,0:H])  \
-                        + np.max(proc_local[1]) + np.max(proc_local_back[1])\
-                        + np.max(np.max(trans_back[1])) + np.max(np.max(trans_back_gradients[1]))    
-
-    T_hybrid = int(T_hybrid)
+    (_, T_hybrid) = horizon.compact_horizon(K, H, release_date[1].astype(int), proc[1].astype(int), 
+                                            proc_local[1].astype(int), trans_back[1].astype(int), 
+                                            memory_capacity[1].astype(int), None, 
+                                            release_date_back[1].astype(int), proc_bck[1].astype(int), 
+                                            proc_local_back[1].astype(int), trans_back_gradients[1].astype(int), hybrid=True)
     print('time horizon')
     print(T_hybrid)
     print(T)
@@ -14,6 +14,7 @@ import ILP_hybrid as ilp_hybrid
 import ILP_solver as ilp_sol
 import ADMM_hybrid as admm_hybrid
 import utils as utils
+import energy
 
 def get_args():
     parser = argparse.ArgumentParser()
@@ -25,6 +26,10 @@ def get_args():
     parser.add_argument('--alpha', '-a', type=float, default=1, help='alpha value for the multiobjective')
     parser.add_argument('--dataset', '-d', type=str, default='cifar10', help='dataset, options cifar10/mnist')
     parser.add_argument('--scenario', '-s', type=int, default=1, help='scenario 1 for low heterogeneity or 2 for high')
+    parser.add_argument('--pareto', type=str, default='', help='the Pareto front of ILP_hybrid.run_pareto with the method alpha/epsilon instead of one alpha')
+    parser.add_argument('--alphas', type=str, default='', help='list of alphas for the alpha method in the format of a1,a2,... (default 0,0.1,...,1)')
+    parser.add_argument('--epsilons', type=str, default='', help='list of bounds of the makespan for the epsilon method in the format of e1,e2,... (default the whole front)')
+    parser.add_argument('--sparse', action='store_true', help='the hybrid ILP without slots on the devices (ILP_hybrid.build_sparse_model)')
     args = parser.parse_args()
     return args
 
@@ -78,6 +83,35 @@ if __name__ == '__main__':
                         + np.max(trans_back_gradients)
 
     T_hybrid = int(T_hybrid)
+    if args.pareto:
+        print(f'time horizon {T_hybrid} Pareto front with the method {args.pareto}')
+        start = time.time()
+        points = ilp_hybrid.run_pareto(K, H, T_hybrid, release_date.astype(int), proc.astype(int), 
+                                       proc_local.astype(int), trans_back.astype(int), 
+                                       memory_capacity.astype(int), 
+                                       release_date_back.astype(int), proc_bck.astype(int), 
+                                       proc_local_back.astype(int), trans_back_gradients.astype(int),
+                                       P_comp, P_transf, P_receive, max_slot, network_bwd, ksi, method=args.pareto,
+                                       alphas=[float(a) for a in args.alphas.split(',')] if args.alphas else None,
+                                       epsilons=[int(e) for e in args.epsilons.split(',')] if args.epsilons else None,
+                                       sparse=args.sparse)
+        # the computation and the transfers of the allocations of all the points at once
+        coefficients = energy.coefficients(K, H, release_date.astype(int), proc.astype(int), proc_local.astype(int),
+                                           release_date_back.astype(int), proc_bck.astype(int), proc_local_back.astype(int),
+                                           P_comp, P_transf, P_receive, max_slot, network_bwd, ksi)
+        (eng_comp, eng_transf, _) = energy.evaluate([p[3] for p in points], H, *coefficients)
+        f_log = open(args.log, 'w')
+        header = f'{args.pareto}\tmakespan\tenergy(J)\tcomputation(J)\ttransfers(J)\tsolve(sec)\ton front'
+        print(header)
+        f_log.write(header + '\n')
+        for (n, (parameter, w, total, _, solve_time, on_front)) in enumerate(points):
+            line = f'{parameter:g}\t{w:g}\t{total:.3f}\t{np.sum(eng_comp[n]):.3f}\t{np.sum(eng_transf[n]):.3f}\t{solve_time:.3f}\t{on_front}'
+            print(line)
+            f_log.write(line + '\n')
+        f_log.close()
+        print(f"{utils.bcolors.OKGREEN}{sum(p[-1] for p in points)} points of the front in {time.time() - start:.3f} seconds{utils.bcolors.ENDC}")
+        sys.exit(0)
+
     print(f'time horizon {T_hybrid} alpha is {args.alpha}')
     
     start_hybrid_optimal = time.time()
@@ -88,6 +122,6 @@ if __name__ == '__main__':
                                             memory_capacity.astype(int), 
                                             release_date_back.astype(int), proc_bck.astype(int), 
                                             proc_local_back.astype(int), trans_back_gradients.astype(int),
-                                            P_comp, P_transf, P_receive, max_slot, network_bwd, ksi, args.alpha)
+                                            P_comp, P_transf, P_receive, max_slot, network_bwd, ksi, args.alpha, sparse=args.sparse)
     
     print(f"{utils.bcolors.OKGREEN}The hybrid ilp makespan is {w_hybrid}{utils.bcolors.ENDC}")
\ No newline at end of file
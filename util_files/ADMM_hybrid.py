@@ -8,9 +8,14 @@ import time
 import random
 
 import utils 
+import admm_engine
+import single_machine
+import schedule
+import horizon
+import verbosity
 warnings.filterwarnings("ignore")
 
-def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capacity, T):
+def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capacity, T, threads=0):
     H = 1
 
     ones_H = np.ones((H,1))
@@ -62,12 +67,14 @@ def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capa
     
     m.setObjective(maxobj, GRB.MINIMIZE)
     
+    if threads > 0:
+        m.setParam('Threads', threads)
     m.update()
     # Optimize model
     m.optimize()
     return(x.X)
 
-def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x):
+def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x, threads=0):
     H = 1
 
     ones_H = np.ones((H,1))
@@ -120,36 +127,75 @@ def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, mem
     
     m.setObjective(maxobj, GRB.MINIMIZE)
     
+    if threads > 0:
+        m.setParam('Threads', threads)
     m.update()
     m.optimize()
    
     return(z.X)
 
 
+'''
+Algorithm 1: the ADMM over the x-subproblem (P1) and the y-subproblem (P2). Both models
+are built once and every iteration only updates y_par, mu and the start of the solve
+(see admm_engine.py). If timings is a list, it gets (iteration, 'P1' or 'P2', update time,
+solve time) for every solve, and (iteration, 'helpers', wall time, summed CPU time) for
+the subproblems of the helpers. These run in a pool of worker processes if workers > 1,
+each Gurobi model with at most threads threads (0 for no limit).
+control (see admm_engine.control) sets when the iterations stop and how rho changes, by
+default after 3 iterations with rho = 700. If trace is a list, it gets (iteration, rho,
+primal residual, dual residual, changes of y, makespan of the forward jobs, reason of the
+stop or None) for every iteration.
+scheduler selects how the subproblems of the helpers are solved: 'gurobi' (the models of
+feasibility_check and backward_for_each_machine), 'jackson' (the preemptive Jackson
+schedules of single_machine.py, exact and without a solver) or 'algo2' (feasibility_check
+for the forward jobs, Algorithm 2 of single_machine.py for the backward ones).
+The schedules x_par and z_par of the helpers are dense (H+K,K,T) arrays, or their
+intervals (see schedule.py) if dense is False.
+If best is a dictionary, it keeps the best schedule found so far (see admm_engine.keep_best):
+the FCFS of the initial allocation (iteration -1), the FCFS of the allocation of every
+iteration and the final schedule of the ADMM. deadline is a time.time() value: the solves
+stop there and run returns None, with the schedule in best (see run_anytime).
+The devices have no slots in P1: a client on its own device (x_local) ends its forward
+job in closed form (see schedule.local_completion), as nothing else runs there.
+'''
 def run(K, H, T_all, release_date_fwd, proc_fwd, 
             proc_local_fwd, trans_back_activations, 
             memory_capacity, memory_demand,
             release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients):
+            proc_local_back, trans_back_gradients, timings=None, workers=1, threads=0, control=None, trace=None,
+            deadline=None, best=None, scheduler='gurobi', dense=True):
     
+    run_start = time.time()
     H_prime = H+K
     stable = 0
-    T = np.max(release_date_fwd) + K*np.max(proc_fwd[0,0:H])
+    # time horizons of the forward problem and of the whole schedule (see horizon.py)
+    (T, T_back) = horizon.compact_horizon(K, H, release_date_fwd, proc_fwd, 
+                                          proc_local_fwd, trans_back_activations, 
+                                          memory_capacity, None, 
+                                          release_date_back, proc_bck, 
+                                          proc_local_back, trans_back_gradients, hybrid=True)
     # T = np.max(release_date_fwd) + max(K*np.max(proc_fwd[0,0:H]), np.max([proc_fwd[k,H+k] for k in range(K)]))  \
     #                     + np.max(proc_local_fwd) + np.max(proc_local_back)\
     #                     + np.max(np.max(trans_back_activations))
     ones_H = np.ones((H_prime,1))
     ones_K = np.ones((K,1))
     ones_T = np.ones((T,1))
+    own = np.arange(K)
+    # the end of the forward job of every client on its own device, where nothing else runs
+    (f_device, _, _) = schedule.local_completion(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients)
 
-    MAX_ITER = 5
-    rho = 700
+    # the stopping rule and the penalty (see admm_engine.control), by default 3 iterations with a fixed rho
+    ctrl = admm_engine.control(rho=700) if control is None else control
+    rho = ctrl['rho']
 
     m1 = gp.Model("xsubproblem") # forward job assigment problem
     m2 = gp.Model("ysubproblem") # allocation problem
 
-    # define variables -x subproblem
-    x = m1.addMVar(shape = (H_prime,K,T), vtype=GRB.BINARY, name="x")
+    # define variables -x subproblem, the slots of the helpers and the choice of the own device
+    x = m1.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="x")
+    x_local = m1.addMVar(shape=(K), vtype=GRB.BINARY, name="x_local")
     f = m1.addMVar(shape=(K), name="f")
     comp = m1.addMVar(shape=(K), name="comp") # completion time
     w = m1.addMVar(shape=(1), name="w")  # min of compl. times
@@ -167,7 +213,7 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
     contr2_abs_1 = m2.addMVar(shape=(K,H_prime), lb=-GRB.INFINITY,name="contr2_abs_1")   # auxiliary for abs value
     
     # Parameters
-    x_par = np.zeros((H_prime,K,T))
+    x_par = np.zeros((H,K,T))
     y_par = np.zeros((K,H_prime))
     # fair = int(H/K)
     # track = 0
@@ -212,13 +258,12 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
             y_par[j,min_i_sum] = 1
             #print(y_par)
     
-    print(y_par)
+    verbosity.logger.debug('y_par:\n%s', y_par)
 
-    T_back = np.max(release_date_fwd) + K*np.max(proc_fwd[0][0:H]) + np.max(release_date_back) + K*np.max(proc_bck[0,0:H]) \
-                        + np.max(proc_local_fwd) + np.max(proc_local_back) \
-                        + np.max(np.max(trans_back_activations)) + np.max(np.max(trans_back_gradients))
-
-    z_par = np.zeros((H_prime,K,T_back))
+    scenario = (release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+    if best is not None: # the FCFS of the initial allocation, a schedule before any solve
+        admm_engine.fcfs_candidate(best, -1, y_par, scenario)
 
     # Dual variables
     mu = np.zeros((K,H_prime)) # dual variable
@@ -243,24 +288,38 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
     # C4: memory constraint
     m2.addConstr((y.T * utils.max_memory_demand) @ ones_K <= memory_capacity.reshape(ones_H.shape))
 
+    # the coupling constraints of P2, updated at every iteration (see admm_engine.py)
+    start = time.time()
+    sub2 = admm_engine.y_coupling(m2, y, comp_x_fixed, w_x_fixed, contr2_add_1, contr2_abs_1,
+                                  proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=True)
+    first_build += time.time() - start
+
     start = time.time()
     # completition time definition
-    m1.addConstrs(f[i] >= (t+1)*x[j, i, t] for i in range(K) for j in range(H_prime) for t in range(T))
+    m1.addConstrs(f[i] >= (t+1)*x[j, i, t] for i in range(K) for j in range(H) for t in range(T))
+    m1.addConstr(f >= f_device*x_local)
 
     # C1: A job cannot be assigned to a time interval before the release time
-    for i in range(H_prime): #for all devices
+    for i in range(H): #for all helpers
         for j in range(K): #for all jobs
             for t in range(T): #for all timeslots
                 if t < release_date_fwd[j,i]:
                     m1.addConstr(x[i,j,t] == 0)
 
     # C6: machine processes only a single job at each interval
-    for j in range(H_prime): #for all devices
+    for j in range(H): #for all helpers
         m1.addConstr( x[j,:,:].T @ ones_K <= ones_T )
 
-    # C5: A job should be processed entirely once
+    # C5: A job should be processed entirely once, on a helper or on its own device
     for i in range(K):
-        m1.addConstr(qsum(qsum(x[j,i,t] for t in range(T))/proc_fwd[i,j] for j in range(H_prime)) == 1)
+        m1.addConstr(qsum(qsum(x[j,i,t] for t in range(T))/proc_fwd[i,j] for j in range(H)) + x_local[i] == 1)
+
+    # the slots of every client on every machine, proc_fwd on its device if it trains there
+    work = gp.concatenate((x.sum(axis=2), x_local[None,:]*np.diag(proc_fwd[own,H+own])), axis=0)
+
+    # the coupling constraints of P1, updated at every iteration (see admm_engine.py)
+    sub1 = admm_engine.x_coupling(m1, x, f, comp, w, contr1_add_1, contr1_abs_1,
+                                  proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=True, work=work)
 
     end = time.time()
     
@@ -277,54 +336,45 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
         time_stamps_nobuild.append(first_build)
 
     # Iterative algorithm - Algorithm 1
-    my_ds2 = []
-    my_ds = []
     obj_per_iter =[]
     violations = []
 
+    x_start = None
+    pool = admm_engine.helper_pool(workers)
+    # the forward and the backward subproblem of a helper
+    if scheduler == 'jackson':
+        subproblems = (single_machine.forward, single_machine.backward)
+    elif scheduler == 'algo2':
+        subproblems = (feasibility_check, single_machine.algo2)
+    else:
+        subproblems = (feasibility_check, backward_for_each_machine)
     flag_exit = False
+    expired = False
 
-    for iter in range(MAX_ITER):
+    for iter in range(ctrl['max_iter']):
         if flag_exit: # in the previous iteration we called the back-propagation problem
             break # exit;
         start = time.time()
         
-        # Redefine error constraints P1 
-        if iter >= 1:
-            for d in my_ds:
-                m1.remove(d)
-            my_ds = []
-        
-        for i in range(K):
-            for j in range(H_prime):
-                if iter >= 1:
-                    c = m1.getConstrByName(f'const1add-{i}-{j}')
-                    m1.remove(c)
-
-                m1.addConstr(contr1_add_1[i,j] == (qsum(x[j,i,t] for t in range(T)) - y_par[i,j]*proc_fwd[i,j]), name=f'const1add-{i}-{j}')
-                my_ds.append(m1.addConstr(contr1_abs_1[i,j] == gp.abs_(contr1_add_1[i,j]), name=f'const1ab-{i}-{j}'))
-
-        for i in range(K):
-            if iter >= 1:
-                f11 = m1.getConstrByName(f'const1f-{i}')
-                m1.remove(f11)
-                
-
-            m1.addConstr(comp[i] == np.sum(np.multiply(trans_back_activations[i,:], y_par[i,:])) + f[i] + proc_local_fwd[i], name=f'const1f-{i}')
-            my_ds.append(m1.addConstr(w >= comp[i], name=f'const1fw-{i}'))
-           
-        m1.setObjective(w + qsum(contr1_add_1[i,j] * mu[i,j] for i in range(K) for j in range(H_prime)) + (rho/2)*qsum(contr1_abs_1[i,j] for i in range(K) for j in range(H_prime)), GRB.MINIMIZE)
-        #m1.setParam('MIPGap', 0.05)
-        m1.update()
+        # y_par and mu of this iteration in P1, starting from the previous solution
+        admm_engine.update_x(sub1, y_par, mu, x_start)
+        update_time = time.time() - start
 
         # solve P1:
         start_opt = time.time()
-        m1.optimize()
+        if not admm_engine.optimize(m1, deadline):
+            expired = True
+            break
         end = time.time()
         time_stamps.append(end-start)
         time_stamps_nobuild.append(end-start_opt)
+        verbosity.logger.info('iteration %s: P1 update %.4f sec, solve %.4f sec', iter, update_time, end-start_opt)
+        if timings is not None:
+            timings.append((iter, 'P1', update_time, end-start_opt))
 
         x_par = np.copy(np.array(x.X))
+        x_start = np.copy(x_par)
+        local_par = np.rint(x_local.X)
         np.copy(np.array(w.X))
 
         # Solve P2
@@ -332,86 +382,46 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
 
 
         # Now calculate the value of the (original) objective function at this iteration
-        g_values = []
-        for i in range(K): #for all jobs
-            g_interm = []
-            for j in range(H_prime): #for all machines
-                for t in range(T): #for all timeslots
-                    g_interm += [(t+1)*x[j,i,t].X]
-            g_values += [max(g_interm)]
+        g_values = np.maximum(np.max(x_par*np.arange(1, T+1), axis=(0,2)), f_device*local_par) # the end of the forward job of each client
 
         f_par = np.copy(g_values)
 
-        # Redefine error constraints P2
-        if iter >= 1:
-            for dd in my_ds2:
-                m2.remove(dd)
-            my_ds2 = []
+        ll = np.concatenate((np.sum(x_par, axis=2), np.diag(proc_fwd[own,H+own]*local_par)), axis=0)
 
-        ll = np.sum(x_par, axis=2)
-
-        for i in range(K):
-            for j in range(H_prime):
-                if iter >= 1:
-                    c2 = m2.getConstrByName(f'const2add-{i}-{j}')
-                    m2.remove(c2)
-
-                m2.addConstr(contr2_add_1[i,j] == (ll[j,i] - y[i,j]*proc_fwd[i,j]), name=f'const2add-{i}-{j}')
-                my_ds2.append(m2.addConstr(contr2_abs_1[i,j] == gp.abs_(contr2_add_1[i,j]), name=f'const2ab-{i}-{j}'))
-
-        for i in range(K):
-            if iter >= 1:
-                f2 = m2.getConstrByName(f'const2f-{i}')
-                m2.remove(f2)
-
-            m2.addConstr(comp_x_fixed[i] == qsum(trans_back_activations[i,:]*y[i,:]) + f_par[i] + proc_local_fwd[i], name=f'const2f-{i}')
-            my_ds2.append(m2.addConstr(w_x_fixed >= comp_x_fixed[i], name=f'const2fw-{i}'))
-
-        m2.setObjective(w_x_fixed + qsum(contr2_add_1[i,j]*mu[i,j] for i in range(K) for j in range(H_prime)) + (rho/2)*qsum(contr2_abs_1[i,j] for i in range(K) for j in range(H_prime)), GRB.MINIMIZE)
-        #m2.setParam('MIPGap', 0.05)
-        m2.update()
+        # x of this iteration in P2, starting from the previous allocation
+        start_update = time.time()
+        admm_engine.update_y(sub2, ll, f_par, mu, y_par)
+        update_time = time.time() - start_update
         start_opt = time.time()
-        m2.optimize()
+        if not admm_engine.optimize(m2, deadline):
+            expired = True
+            break
         end = time.time()
         time_stamps.append(end-start)
+        verbosity.logger.info('iteration %s: P2 update %.4f sec, solve %.4f sec', iter, update_time, end-start_opt)
+        if timings is not None:
+            timings.append((iter, 'P2', update_time, end-start_opt))
 
-        changes_y = 0
-        for j in range(K):
-            if np.any(np.abs(np.rint(np.array(y.X)[j, :])) != np.abs(np.rint(y_par[j, :]))):
-                changes_y += 1
+        y_X = np.array(y.X)
+        changes_y = np.sum(np.any(np.abs(np.rint(y_X)) != np.abs(np.rint(y_par)), axis=1))
 
-        y_par = np.copy(np.array(y.X))
+        y_prev = y_par
+        y_par = np.copy(y_X)
+        if best is not None:
+            admm_engine.fcfs_candidate(best, iter, y_par, scenario)
 
         # update dual variables
-        temp_mu = np.zeros((K,H_prime))  # just making sure I don't make a mistake
-        for j in range(H_prime):
-            for i in range(K):
-                temp_sum = []
-                for t in range(T):
-                    temp_sum += [x[j,i,t].X]
-                temp_mu[i,j] = np.copy(mu[i,j] + (sum(temp_sum)-(y[i,j].X*proc_fwd[i,j])))
-
-        mu = np.copy(temp_mu)
+        mu = mu + (ll.T - y_X*proc_fwd)
 
         # Calculate original objective function:
 
-        calc_obj = np.zeros(K)
-        temptemp = np.multiply(y.X, trans_back_activations)
-        for i in range(K):
-            calc_obj[i] = g_values[i] + np.sum(temptemp[i,:]) + proc_local_fwd[i]
+        calc_obj = g_values + np.sum(y_X*trans_back_activations, axis=1) + proc_local_fwd
 
         obj_per_iter += [max(calc_obj)]
-        violated_constraints = 0
-        total_constraints = 0
-        for j in range(H_prime):
-            for i in range(K):
-                if np.all(np.abs(np.rint(ll[j,i])) != proc_fwd[i,j]*np.abs(np.rint(y_par[i,j]))):
-                    violated_constraints += 1
-                total_constraints += 1
-        
-        violations.append((violated_constraints/total_constraints)*100)
+        violated_constraints = np.abs(np.rint(ll.T)) != proc_fwd*np.abs(np.rint(y_par))
+        violations.append(np.mean(violated_constraints)*100)
 
-        primal_residual = LA.norm((ll.T - np.multiply(y_par, proc_fwd)), 'fro')**2
+        (primal_residual, dual_residual) = admm_engine.residuals(ll, y_X, y_prev, proc_fwd, rho)
 
         if changes_y <= 0:
             stable += 1
@@ -419,147 +429,120 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
             stable = 0
         
 
+        reason = admm_engine.stop(ctrl, iter, primal_residual, dual_residual, stable, time.time() - run_start)
+        verbosity.logger.info('iteration %s: rho %s, primal residual %.2f, dual residual %.2f, %s changes of y',
+                              iter, rho, primal_residual, dual_residual, changes_y)
+        if trace is not None:
+            trace.append((iter, rho, primal_residual, dual_residual, changes_y, obj_per_iter[-1], reason))
+
         # Call Algorithm-2 to compute z variables
-        if iter == 2: 
+        if reason is not None:
             flag_exit = True # mark it that we reached the end
+        else: # the penalty of the next iteration
+            rho_next = admm_engine.balance_rho(ctrl, rho, primal_residual, dual_residual)
+            if rho_next != rho:
+                mu = admm_engine.set_rho((sub1, sub2), mu, rho, rho_next)
+                rho = rho_next
 
-        x_par = np.zeros((H_prime,K,T))
         y_ = y_par
         all_time = []
+        machines = [] # the helpers with clients and their clients
+
+        if flag_exit and deadline is not None and time.time() >= deadline:
+            expired = True
+            break
 
         if flag_exit:
-            for i in range(H): # theoritically this can be done in parallel
+            for i in range(H):
                 Kx = list(np.transpose(np.argwhere(y_[:,i]==1))[0]) # finds which data owners are assigned to the machine i
-                if len(Kx) == 0:
-                    continue
-                
-                procx = np.copy(proc_fwd[Kx, i])  # this is a row-vector
-                release_datex = np.copy(release_date_fwd[Kx, i])
-                proc_localx = np.copy(proc_local_fwd[Kx])
-                trans_backx = np.copy(trans_back_activations[Kx, i])
-                Tx = np.max(release_datex) + len(Kx)*np.max(procx)  # to constrain the T
-                start_sub = time.time()
-                x__ = feasibility_check(len(Kx), release_datex, procx, proc_localx, trans_backx, memory_capacity[i], Tx)
-                end_sub = time.time()
-
-                machine_time = end_sub-start_sub
-
-                jj = 0
-                for j in Kx:
-                    for t in range(Tx):
-                        x_par[i,j,t] = x__[0,jj,t]
-                    jj += 1
-                
-                f_temp = np.zeros((len(Kx)))
-                for kk in range(len(Kx)):
-                    for t in range(Tx):
-                        if f_temp[kk] < (t+1)*x__[0,kk,t]:
-                            f_temp[kk] = (t+1)*x__[0,kk,t]
-                
-                procz = np.copy(proc_bck[Kx, i])  # this is a row-vector
-                release_datez = np.copy(release_date_back[Kx, i])
-                proc_localz = np.copy(proc_local_back[Kx])
-                trans_backz = np.copy(trans_back_gradients[Kx, i])
-
-                for kk in range(len(Kx)):
-                    release_datez[kk] += f_temp[kk] + proc_localx[kk] + trans_backx[kk]
-                
-                Tz = np.max(release_datez) + len(Kx)*np.max(procz)  # to constrain the T
-                x__extend = np.zeros((1,len(Kx),Tz))
-                
-                for jj in range(len(Kx)):
-                    for t in range(min(Tx,Tz)):
-                        x__extend[0,jj,t] = x__[0,jj,t]
-                
-                start_sub = time.time()
-
-                # SELECT ALGORITHM -- P_b ----- SELECT ONLY ONE
-
-                # USE SOLVER UNCOMMENT BELOW
-                z__ = backward_for_each_machine(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend)
-                
-                # OR USE OUR IMPLEMENTATION:
-                #z__ = np.expand_dims(algo2(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend), axis=0)
-                
-                # ----- SELECT ONLY ONE
-
-                end_sub = time.time()
-                machine_time += end_sub - start_sub
-
-                jj = 0
-                for j in Kx:
-                    for t in range(Tz):
-                        z_par[i,j,t] = z__[0,jj,t]
-                        #z_par[i,j,t] = z__[jj,t]
-                    jj += 1
-
+                if len(Kx) > 0:
+                    machines.append((i, Kx))
+
+            # P_f and P_b of each helper, in parallel with workers > 1
+            jobs = [(release_date_fwd[Kx, i], proc_fwd[Kx, i], proc_local_fwd[Kx], trans_back_activations[Kx, i],
+                     release_date_back[Kx, i], proc_bck[Kx, i], proc_local_back[Kx], trans_back_gradients[Kx, i],
+                     memory_capacity[i]) for (i, Kx) in machines]
+            (results, helpers_time, cpu_time) = admm_engine.solve_helpers(pool, *subproblems, jobs, threads)
+
+            # the intervals of the jobs of all the helpers
+            intervals = []
+            for ((i, Kx), (helper_intervals, machine_time, _)) in zip(machines, results):
+                intervals.append(helper_intervals.relabel(i, Kx))
                 all_time.append(machine_time)
-            
+            plan = schedule.concat(intervals)
+
             if len(all_time) > 0:
-                time_stamps.append(max(all_time))
-            cs = []
-            cs_back = []
-            reserved = [0 for i in range(H_prime)]
-            f_m = np.zeros(K)
-
-            for i in range(K): #for all jobs
-                my_machine = 0
-                my_super_machine = 0
-                last_zero = -1
-                for my_machine in range(H_prime):
-                    for k in range(T):
-                        if np.rint(x_par[my_machine,i,k]) >= 1:
-                            if last_zero < k+1:
-                                last_zero = k+1
-                                my_super_machine = my_machine
-                                
-                fmax = last_zero
-                f_m[i] = fmax
-                C = fmax + proc_local_fwd[i] + trans_back_activations[i,my_super_machine]
-                cs.append(C)
-                reserved[my_super_machine] += 1
+                # the measured time if the helpers run in parallel, otherwise the slowest helper
+                time_stamps.append(helpers_time if pool is not None else max(all_time))
+                verbosity.logger.info('iteration %s: helpers %.4f sec, cpu %.4f sec', iter, helpers_time, cpu_time)
+                if timings is not None:
+                    timings.append((iter, 'helpers', helpers_time, cpu_time))
+            # the completion times, the clients without backward slots train on their own device
+            (cs, cs_back, my_super_machine, machine_back, _) = schedule.completion_times(plan, None, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                                         release_date_back, proc_bck, proc_local_back, trans_back_gradients, hybrid=True)
+            reserved = np.bincount(my_super_machine, minlength=H_prime)
 
         if flag_exit: # we are at the end, and have solved backward() as well
-            print('completition time')
-            for i in range(K): #for all jobs
-                my_machine = 0
-                my_super_machine = 0
-                last_zero = -1
-                for my_machine in range(H):
-                    for k in range(T_back):
-                        if np.rint(z_par[my_machine,i,k]) >= 1:
-                            if last_zero < k+1:
-                                last_zero = k+1
-                                my_super_machine = my_machine
-                if last_zero == -1:
-                    my_super_machine = H + i
-                    j = i
-                    C = release_date_fwd[j,H+j] + proc_fwd[j,H+j] + release_date_back[j,H+j] + proc_bck[j,H+j] + proc_local_fwd[i] + proc_local_back[i]
-                else:
-                    fmax = last_zero
-                    C = fmax + proc_local_back[i] + trans_back_gradients[i,my_super_machine]
-                print(f'[{i}] - {C} {my_super_machine}')
-                cs_back.append(C)
+            cs_back = list(cs_back)
+            verbosity.logger.debug('completion times: %s\nmachines: %s', cs_back, machine_back)
             
             for machine in range(H):
-                print(f'machine {machine}')
                 my_jobs = list(np.transpose(np.argwhere(y.X[:,machine]==1))[0])
-                print(my_jobs)
+                verbosity.logger.debug('machine %s: %s', machine, my_jobs)
 
             #print(f'{utils.bcolors.FAIL}BACK max is: {max(cs_back)}{utils.bcolors.ENDC}')
        
         if flag_exit:
             obj_per_iter += [max(cs_back)]
    
+    if pool is not None:
+        pool.shutdown()
+    if expired: # the schedule is the best one so far
+        verbosity.logger.info('the deadline expired at iteration %s', iter)
+        return None
+    if best is not None:
+        admm_engine.keep_best(best, iter, np.rint(y.X), cs_back)
+
     total_time = 0
     for t in time_stamps:
         total_time += t
     
-    print('ADMM ALLOCATION:')
-    print(y.X)
-    print('-------------')
+    verbosity.logger.debug('ADMM allocation:\n%s', y.X)
+    if dense: # the (H+K,K,T) slots of the forward and of the backward jobs
+        (x_par, z_par) = (plan.dense(schedule.FORWARD, H_prime, K, T), plan.dense(schedule.BACKWARD, H_prime, K, T_back))
+    else:
+        (x_par, z_par) = (plan.select(schedule.FORWARD), plan.select(schedule.BACKWARD))
     return (obj_per_iter, total_time, y.X, x_par, z_par, cs_back) #ATTENTION: NOT COMPATIBLE WITH OTHERS
 
+
+'''
+The anytime mode of run: the ADMM with a wall-clock budget (in seconds), returning the
+best schedule found until the deadline, or until the end of the ADMM if it comes first.
+Every iteration gives a feasible schedule, the FCFS of its allocation. The deadline is the
+time limit of every solve of P1 and P2, but the build of the two models and the
+subproblems of the helpers at the last iteration are not interrupted, so they can exceed
+the budget (the FCFS of the initial allocation is there before the build).
+Returns (y, completion time of every client, makespan, iteration of the schedule), the
+iteration being -1 for the initial allocation.
+'''
+def run_anytime(K, H, T_all, release_date_fwd, proc_fwd, 
+            proc_local_fwd, trans_back_activations, 
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck, 
+            proc_local_back, trans_back_gradients, budget, control=None, trace=None, workers=1, threads=0,
+            scheduler='gurobi'):
+
+    best = {}
+    run(K, H, T_all, release_date_fwd, proc_fwd, 
+        proc_local_fwd, trans_back_activations, 
+        memory_capacity, memory_demand,
+        release_date_back, proc_bck, 
+        proc_local_back, trans_back_gradients, workers=workers, threads=threads, control=control, trace=trace,
+        deadline=time.time() + budget, best=best, scheduler=scheduler)
+
+    return (best['y'], best['completion'], best['makespan'], best['iteration'])
+
+
 def run_scheduling(K, H, T_all, release_date_fwd, proc_fwd, 
             proc_local_fwd, trans_back_activations, 
             memory_capacity, memory_demand,
@@ -639,57 +622,25 @@ def run_scheduling(K, H, T_all, release_date_fwd, proc_fwd,
                 z_par[i,j,t] = z__[0,jj,t]
             jj += 1
 
-    cs = []
-    cs_back = []
-    reserved = [0 for i in range(H_prime)]
-    f_m = np.zeros(K)
-
-    for i in range(K): #for all jobs
-        my_machine = 0
-        my_super_machine = 0
-        last_zero = -1
-        for my_machine in range(H_prime):
-            for k in range(T):
-                if np.rint(x_par[my_machine,i,k]) >= 1:
-                    if last_zero < k+1:
-                        last_zero = k+1
-                        my_super_machine = my_machine
-                        
-        fmax = last_zero
-        f_m[i] = fmax
-        C = fmax + proc_local_fwd[i] + trans_back_activations[i,my_super_machine]
-        cs.append(C)
-        reserved[my_super_machine] += 1
-
-    for i in range(K): #for all jobs
-        my_machine = 0
-        my_super_machine = 0
-        last_zero = -1
-        for my_machine in range(H):
-            for k in range(T_back):
-                if np.rint(z_par[my_machine,i,k]) >= 1:
-                    if last_zero < k+1:
-                        last_zero = k+1
-                        my_super_machine = my_machine
-        if last_zero == -1:
-            my_super_machine = H + i
-            j = i
-            C = release_date_fwd[j,H+j] + proc_fwd[j,H+j] + release_date_back[j,H+j] + proc_bck[j,H+j] + proc_local_fwd[i] + proc_local_back[i]
-        else:
-            fmax = last_zero
-            C = fmax + proc_local_back[i] + trans_back_gradients[i,my_super_machine]
-        cs_back.append(C)
-    print(cs_back)
-    obj_per_iter = max(cs_back)
-    print(f'DURING: {obj_per_iter}')
+    # the clients without backward slots on the helpers train on their own device
+    (cs, cs_back, _, _, obj_per_iter) = schedule.completion_times(x_par, z_par, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                  release_date_back, proc_bck, proc_local_back, trans_back_gradients, hybrid=True)
+    cs_back = list(cs_back)
+    verbosity.logger.debug('completion times: %s', cs_back)
+    verbosity.logger.info('makespan: %s', obj_per_iter)
     return obj_per_iter
 
 
+'''
+The ADMM of the hybrid layout that removes and adds the constraints of the models at every
+iteration; scheduler 'algo2' solves P_b with single_machine.algo2 instead of
+backward_for_each_machine.
+'''
 def run_second(K, H, T_all, release_date_fwd, proc_fwd, 
             proc_local_fwd, trans_back_activations, 
             memory_capacity, memory_demand,
             release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients):
+            proc_local_back, trans_back_gradients, scheduler='gurobi'):
     
     H_prime = H+K
     stable = 0
@@ -748,7 +699,7 @@ def run_second(K, H, T_all, release_date_fwd, proc_fwd,
                     min_i = i
         y_par[j,min_i] = 1 
     
-    print(y_par)
+    verbosity.logger.debug('y_par:\n%s', y_par)
 
     T_back = np.max(release_date_fwd) + K*np.max(proc_fwd[0][0:H]) + np.max(release_date_back) + K*np.max(proc_bck[0,0:H]) \
                         + np.max(proc_local_fwd) + np.max(proc_local_back) \
@@ -891,7 +842,7 @@ def run_second(K, H, T_all, release_date_fwd, proc_fwd,
         end = time.time()
         time_stamps.append(end-start)
         time_stamps_nobuild.append(end-start_opt)
-        print(f'----------- ITERATION:::: {iter}  ------------------')
+        verbosity.logger.info('----------- ITERATION:::: %s  ------------------', iter)
         x_par = np.copy(np.array(x.X))
         np.copy(np.array(w.X))
 
@@ -1047,15 +998,11 @@ def run_second(K, H, T_all, release_date_fwd, proc_fwd,
             
             start_sub = time.time()
 
-            # SELECT ALGORITHM -- P_b ----- SELECT ONLY ONE
-
-            # USE SOLVER UNCOMMENT BELOW
-            z__ = backward_for_each_machine(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend)
-            
-            # OR USE OUR IMPLEMENTATION:
-            #z__ = np.expand_dims(algo2(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend), axis=0)
-            
-            # ----- SELECT ONLY ONE
+            # P_b with the solver, or with Algorithm 2
+            if scheduler == 'algo2':
+                z__ = single_machine.algo2(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend).dense(schedule.BACKWARD, 1, len(Kx), Tz)
+            else:
+                z__ = backward_for_each_machine(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend)
 
             end_sub = time.time()
             machine_time += end_sub - start_sub
@@ -1071,48 +1018,15 @@ def run_second(K, H, T_all, release_date_fwd, proc_fwd,
         
         if len(all_time) > 0 and flag_exit:
             time_stamps.append(max(all_time))
-        cs = []
-        cs_back = []
-        reserved = [0 for i in range(H_prime)]
-        f_m = np.zeros(K)
-
-        for i in range(K): #for all jobs
-            my_machine = 0
-            my_super_machine = 0
-            last_zero = -1
-            for my_machine in range(H):
-                for k in range(T):
-                    if np.rint(x_par[my_machine,i,k]) >= 1:
-                        if last_zero < k+1:
-                            last_zero = k+1
-                            my_super_machine = my_machine
-            fmax = last_zero
-            f_m[i] = fmax
-            C = fmax + proc_local_fwd[i] + trans_back_activations[i,my_super_machine]
-            cs.append(C)
-            reserved[my_super_machine] += 1
+        # the clients allocated to their own device train there
+        own = np.arange(K)
+        (cs, cs_back, my_super_machine, _, _) = schedule.completion_times(x_par, z_par, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                          release_date_back, proc_bck, proc_local_back, trans_back_gradients,
+                                                                          hybrid=True, local=(y_[own,H+own] == 1))
+        reserved = list(np.bincount(my_super_machine, minlength=H_prime))
 
         if flag_exit: # we are at the end, and have solved backward() as well
-            for i in range(K): #for all jobs
-                my_machine = 0
-                my_super_machine = 0
-
-                if y_[i,i+H] == 1:
-                    fmax = release_date_fwd[i,H+i] + release_date_back[i,H+i] + \
-                                                    proc_fwd[i,H+i] + proc_bck[i,H+i] + \
-                                                    proc_local_fwd[i]
-                    C = fmax + proc_local_back[i]
-                else:
-                    last_zero = -1
-                    for my_machine in range(H):
-                        for k in range(T_back):
-                            if np.rint(z_par[my_machine,i,k]) >= 1:
-                                if last_zero < k+1:
-                                    last_zero = k+1
-                                    my_super_machine = my_machine
-                    fmax = last_zero
-                    C = fmax + proc_local_back[i] + trans_back_gradients[i,my_super_machine]
-                cs_back.append(C)
+            cs_back = list(cs_back)
 
             #print(f'{utils.bcolors.FAIL}BACK max is: {max(cs_back)}{utils.bcolors.ENDC}')
        
@@ -1123,7 +1037,5 @@ def run_second(K, H, T_all, release_date_fwd, proc_fwd,
     for t in time_stamps:
         total_time += t
     
-    print('ADMM ALLOCATION:')
-    print(y.X)
-    print('-------------')
+    verbosity.logger.debug('ADMM allocation:\n%s', y.X)
     return (obj_per_iter, total_time)
\ No newline at end of file
@@ -7,9 +7,14 @@ import warnings
 import time
 
 import utils 
+import admm_engine
+import single_machine
+import schedule
+import horizon
+import verbosity
 warnings.filterwarnings("ignore")
 
-def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capacity, T):
+def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capacity, T, threads=0):
     H = 1
 
     ones_H = np.ones((H,1))
@@ -61,12 +66,14 @@ def feasibility_check(K, release_date, proc, proc_local, trans_back, memory_capa
     
     m.setObjective(maxobj, GRB.MINIMIZE)
     
+    if threads > 0:
+        m.setParam('Threads', threads)
     m.update()
     # Optimize model
     m.optimize()
     return(x.X)
 
-def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x):
+def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x, threads=0):
     H = 1
 
     ones_H = np.ones((H,1))
@@ -119,237 +126,51 @@ def backward_for_each_machine(K, release_date, proc, proc_local, trans_back, mem
     
     m.setObjective(maxobj, GRB.MINIMIZE)
     
+    if threads > 0:
+        m.setParam('Threads', threads)
     m.update()
     m.optimize()
    
     return(z.X)
 
-def algo2(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x):
-    H = 1 
-    z = np.zeros(((K,T)))
-
-    # step - 1 order clients by releasing date
-    order = np.argsort(release_date)
-    for i in range(K):
-        client = order[i]
-        start = release_date[client]
-        startt = start
-        for t in range(start, T):
-            clear = True
-            for j in range(K):
-              if z[j][t] != 0 or (t <= x.shape[2] and x[0][j][t] != 0):
-                  clear = False
-                  break 
-            if clear:
-                break
-            else:
-                startt += 1 
-
-        alloced = 0
-        while alloced < proc[client]:
-            clear = True
-            for j in range(K):
-              if (t <= x.shape[2] and x[0][j][startt] != 0):
-                  clear = False
-                  startt += 1
-                  break 
-            if clear:
-                z[client][startt] = 1
-                alloced += 1
-                startt = startt + 1
-
-    # step - 2 define blocks
-    
-    '''
-    for each block-i, we store a list of two values bita_i = [[slots_i], [clients_i]]
-    where,
-    slots_i = [s(bita_i), e(bita_i)]
-    clients_i : list of clients inside that slot
-    '''
-    
-    B = {}
-    start = 0
-    new_set = False
-    iter = 0
-    next = ([0,0], [])
-    for t in range(T):
-        if new_set == False:
-            sum_z = 0
-            for c in range(K):
-                sum_z += z[c,t]
-            if sum_z > 0:
-                new_set = True
-                iter += 1
-                next[0][0] = t
-                for j in range(K):
-                    if z[j,t] != 0:
-                        next[1].append(j+1)
-                        break
-        else:
-            is_end = True
-            sum_x = 0
-            sum_z = 0
-            for c in range(K):
-                sum_x += x[0][c][t]
-                sum_z += z[c,t]
-
-            if (sum_z > 0) or (sum_z == 0 and (t <= x.shape[2] and sum_x > 0)):
-                is_end = False
-                for j in range(K):
-                    if z[j,t] != 0:
-                        if (j+1) not in next[1]:
-                            next[1].append(j+1)
-                        break
-
-            if is_end:    
-                next[0][1] = t
-                B.update({iter:next})
-                next = ([0,0], [])
-                new_set = False
-
-    
-    for bita in list(B.keys()):
-        if len(B[bita][1]) == 1: # no need to reschedule
-            continue
-        
-        sub_blocks = [B[bita]]
-        block_i = 0
-        while len(sub_blocks) > 0: 
-            bloc = sub_blocks.pop(block_i)
-            if len(bloc[1]) == 1:
-                if len(sub_blocks) != 0:
-                        block_i = (block_i + 1)%len(sub_blocks)
-                continue
-            
-            # step - 3 find l-client
-            l = -1
-            min = T+1000000
-            for client in bloc[1]:
-                temp = bloc[0][1]+proc_local[int(client)-1]+trans_back[int(client)-1]
-                if temp < min:
-                    min = temp
-                    l = client
-
-            # step 4 - reschedule
-            # l tasks should allocated in slots where no other client has been released
-
-            # find start of l
-            start_l = -1
-            for i in range(bloc[0][0], bloc[0][1]):
-                if z[l-1,i] != 0:
-                    start_l = i
-                    break
-            
-            allocated_slots = 0
-            
-            slot_i = start_l
-            at_least_one = False
-            while slot_i <= bloc[0][1]:
-                no_change = True
-                for jj in range(K):
-                    give_priority = -1
-                    client_c = order[jj]
-                    if client_c + 1 == l:
-                        continue
-                    
-                    if release_date[client_c] <= slot_i and (client_c+1 in bloc[1]):
-                        is_allocated = False
-                        ii = bloc[0][0]
-                        while ii <= slot_i:
-                            if z[client_c-1,ii] != 0:
-                                is_allocated = True
-                            ii += 1
-                        
-                        if is_allocated:
-                            continue
-                        give_priority = client_c+1
-                    
-                    
-                    if give_priority != -1:
-                        alloced = 0
-                        while alloced < proc[give_priority-1]:
-                            clear = True
-                            for j in range(K):
-                                if x[0][j][slot_i] != 0:
-                                    clear = False
-                                    slot_i += 1
-                                    break 
-                            if clear:
-                                z[give_priority-1][slot_i] = 1
-                                alloced += 1
-                                slot_i += 1
-                        no_change = False
-                        at_least_one = True
-                        break
-                    
-                if no_change:
-                    if allocated_slots == 0:
-                        start_l = slot_i
-                    while True:
-                        clear = True
-                        for j in range(K):
-                            if x[0][j][slot_i] != 0:
-                                clear = False
-                                slot_i += 1
-                                break 
-                        if clear:
-                            z[l-1][slot_i] = 1
-                            allocated_slots += 1
-                            break
-                    if allocated_slots == proc[int(l)-1]:
-                        break
-                        
-
-            # if cannot reschedule:
-            if not at_least_one:
-                if len(sub_blocks) != 0:
-                    block_i = (block_i + 1)%len(sub_blocks)
-                continue
-
-            # step 5 - update subset
-            slot_i = bloc[0][0]
-            
-            new_block_f = True
-            while slot_i < bloc[0][1]:
-                if new_block_f:
-                    new_block = [[slot_i,-1],[]]
-                    new_block_f = False
-                
-                if z[int(l)-1,slot_i] != 0:
-                    if len(new_block[1]) > 0:
-                        new_block[0][1] = slot_i
-                        sub_blocks.append(new_block)
-                    new_block_f = True
-                    slot_i += 1
-                    continue
-                else:
-                    for c in range(K):
-                        if z[c,slot_i] != 0 and (c+1) not in new_block[1]:
-                            new_block[1].append(c+1)
-                
-                new_block[0][1] = slot_i
-                if slot_i == bloc[0][1]-1:
-                    sub_blocks.append(new_block)
-                slot_i += 1
-            if len(sub_blocks) != 0:
-                block_i = (block_i + 1)%len(sub_blocks)
-    return(z)
-
-
+'''
+Algorithm 1: the ADMM over the x-subproblem (P1) and the y-subproblem (P2). Both models
+are built once and every iteration only updates y_par, mu and the start of the solve
+(see admm_engine.py). If timings is a list, it gets (iteration, 'P1' or 'P2', update time,
+solve time) for every solve, and (iteration, 'helpers', wall time, summed CPU time) for
+the subproblems of the helpers. These run in a pool of worker processes if workers > 1,
+each Gurobi model with at most threads threads (0 for no limit).
+control (see admm_engine.control) sets when the iterations stop and how rho changes, by
+default after 3 iterations with rho = 350. If trace is a list, it gets (iteration, rho,
+primal residual, dual residual, changes of y, makespan of the forward jobs, reason of the
+stop or None) for every iteration.
+scheduler selects how the subproblems of the helpers are solved: 'gurobi' (the models of
+feasibility_check and backward_for_each_machine), 'jackson' (the preemptive Jackson
+schedules of single_machine.py, exact and without a solver) or 'algo2' (feasibility_check
+for the forward jobs, Algorithm 2 of single_machine.py for the backward ones).
+'''
 def run(K, H, T_all, release_date_fwd, proc_fwd, 
             proc_local_fwd, trans_back_activations, 
             memory_capacity, memory_demand,
             release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients, filename=''):
+            proc_local_back, trans_back_gradients, filename='', timings=None, workers=1, threads=0, control=None, trace=None,
+            scheduler='gurobi'):
     
+    run_start = time.time()
     stable = 0
-    T = np.max(release_date_fwd) + K*np.max(proc_fwd) # time intervals
+    # time horizons of the forward problem and of the whole schedule (see horizon.py)
+    (T, T_back) = horizon.compact_horizon(K, H, release_date_fwd, proc_fwd, 
+                                          proc_local_fwd, trans_back_activations, 
+                                          memory_capacity, memory_demand, 
+                                          release_date_back, proc_bck, 
+                                          proc_local_back, trans_back_gradients)
     ones_H = np.ones((H,1))
     ones_K = np.ones((K,1))
     ones_T = np.ones((T,1))
 
-    MAX_ITER = 10
-    rho = 350
+    # the stopping rule and the penalty (see admm_engine.control), by default 3 iterations with a fixed rho
+    ctrl = admm_engine.control(rho=350) if control is None else control
+    rho = ctrl['rho']
 
     m1 = gp.Model("xsubproblem") # forward job assigment problem
     m2 = gp.Model("ysubproblem") # allocation problem
@@ -391,12 +212,6 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
                     min_i = i
         y_par[j,min_i] = 1 
 
-    T_back = np.max(release_date_fwd) + K*np.max(proc_fwd[0][:]) + np.max(release_date_back) + K*np.max(proc_bck[0,:]) \
-                        + np.max(proc_local_fwd) + np.max(proc_local_back) \
-                        + np.max(np.max(trans_back_activations)) + np.max(np.max(trans_back_gradients))
-
-    z_par = np.zeros((H,K,T_back))
-
     # Dual variables
     mu = np.zeros((K,H)) # dual variable
 
@@ -411,6 +226,12 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
     # C4: memory constraint
     m2.addConstr(memory_demand @ y<= memory_capacity)
 
+    # the coupling constraints of P2, updated at every iteration (see admm_engine.py)
+    start = time.time()
+    sub2 = admm_engine.y_coupling(m2, y, comp_x_fixed, w_x_fixed, contr2_add_1, contr2_abs_1,
+                                  proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=False)
+    first_build += time.time() - start
+
     start = time.time()
     # completition time definition
     m1.addConstrs(f[i] >= (t+1)*x[j, i, t] for i in range(K) for j in range(H) for t in range(T))
@@ -430,6 +251,10 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
     for i in range(K):
         m1.addConstr(qsum(qsum(x[j,i,t] for t in range(T))/proc_fwd[i,j] for j in range(H)) == 1)
 
+    # the coupling constraints of P1, updated at every iteration (see admm_engine.py)
+    sub1 = admm_engine.x_coupling(m1, x, f, comp, w, contr1_add_1, contr1_abs_1,
+                                  proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=False)
+
     end = time.time()
     
     second_build = end-start
@@ -445,43 +270,27 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
         time_stamps_nobuild.append(first_build)
 
     # Iterative algorithm - Algorithm 1
-    my_ds2 = []
-    my_ds = []
     obj_per_iter =[]
     violations = []
 
+    x_start = None
+    pool = admm_engine.helper_pool(workers)
+    # the forward and the backward subproblem of a helper
+    if scheduler == 'jackson':
+        subproblems = (single_machine.forward, single_machine.backward)
+    elif scheduler == 'algo2':
+        subproblems = (feasibility_check, single_machine.algo2)
+    else:
+        subproblems = (feasibility_check, backward_for_each_machine)
     flag_exit = False
-    for iter in range(MAX_ITER):
+    for iter in range(ctrl['max_iter']):
         if flag_exit: # in the previous iteration we called the back-propagation problem
             break # exit;
         start = time.time()
         
-        # Redefine error constraints P1 
-        if iter >= 1:
-            for d in my_ds:
-                m1.remove(d)
-            my_ds = []
-        
-        for i in range(K):
-            for j in range(H):
-                if iter >= 1:
-                    c = m1.getConstrByName(f'const1add-{i}-{j}')
-                    m1.remove(c)
-
-                m1.addConstr(contr1_add_1[i,j] == qsum(x[j,i,t] for t in range(T)) - y_par[i,j]*proc_fwd[i,j] + mu[i,j], name=f'const1add-{i}-{j}')
-                my_ds.append(m1.addConstr(contr1_abs_1[i,j] == gp.abs_(contr1_add_1[i,j]), name=f'const1ab-{i}-{j}'))
-
-        for i in range(K):
-            if iter >= 1:
-                f11 = m1.getConstrByName(f'const1f-{i}')
-                m1.remove(f11)
-                
-
-            m1.addConstr(comp[i] == np.sum(np.multiply(trans_back_activations[i,:], y_par[i,:])) + f[i] + proc_local_fwd[i], name=f'const1f-{i}')
-            my_ds.append(m1.addConstr(w >= comp[i], name=f'const1fw-{i}'))
-           
-        m1.setObjective(w + (rho/2)*qsum(contr1_abs_1[i,j] for i in range(K) for j in range(H)), GRB.MINIMIZE)
-        m1.update()
+        # y_par and mu of this iteration in P1, starting from the previous solution
+        admm_engine.update_x(sub1, y_par, mu, x_start)
+        update_time = time.time() - start
 
         # solve P1:
         start_opt = time.time()
@@ -489,8 +298,12 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
         end = time.time()
         time_stamps.append(end-start)
         time_stamps_nobuild.append(end-start_opt)
+        verbosity.logger.info('iteration %s: P1 update %.4f sec, solve %.4f sec', iter, update_time, end-start_opt)
+        if timings is not None:
+            timings.append((iter, 'P1', update_time, end-start_opt))
 
         x_par = np.copy(np.array(x.X))
+        x_start = np.copy(x_par)
         np.copy(np.array(w.X))
 
         # Solve P2
@@ -498,86 +311,42 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
 
 
         # Now calculate the value of the (original) objective function at this iteration
-        g_values = []
-        for i in range(K): #for all jobs
-            g_interm = []
-            for j in range(H): #for all machines
-                for t in range(T): #for all timeslots
-                    g_interm += [(t+1)*x[j,i,t].X]
-            g_values += [max(g_interm)]
+        g_values = np.max(x_par*np.arange(1, T+1), axis=(0,2)) # the end of the forward job of each client
 
         f_par = np.copy(g_values)
 
-        # Redefine error constraints P2
-        if iter >= 1:
-            for dd in my_ds2:
-                m2.remove(dd)
-            my_ds2 = []
-
         ll = np.sum(x_par, axis=2)
 
-        for i in range(K):
-            for j in range(H):
-                if iter >= 1:
-                    c2 = m2.getConstrByName(f'const2add-{i}-{j}')
-                    m2.remove(c2)
-
-                m2.addConstr(contr2_add_1[i,j] == ll[j,i] - y[i,j]*proc_fwd[i,j] + mu[i,j], name=f'const2add-{i}-{j}')
-                my_ds2.append(m2.addConstr(contr2_abs_1[i,j] == gp.abs_(contr2_add_1[i,j]), name=f'const2ab-{i}-{j}'))
-
-        for i in range(K):
-            if iter >= 1:
-                f2 = m2.getConstrByName(f'const2f-{i}')
-                m2.remove(f2)
-
-            m2.addConstr(comp_x_fixed[i] == qsum(trans_back_activations[i,:]*y[i,:]) + f_par[i] + proc_local_fwd[i], name=f'const2f-{i}')
-            my_ds2.append(m2.addConstr(w_x_fixed >= comp_x_fixed[i], name=f'const2fw-{i}'))
-
-        m2.setObjective(w_x_fixed + (rho/2)*qsum(contr2_abs_1[i,j] for i in range(K) for j in range(H)), GRB.MINIMIZE)
-
-        m2.update()
+        # x of this iteration in P2, starting from the previous allocation
+        start_update = time.time()
+        admm_engine.update_y(sub2, ll, f_par, mu, y_par)
+        update_time = time.time() - start_update
         start_opt = time.time()
         m2.optimize()
         end = time.time()
         time_stamps.append(end-start)
+        verbosity.logger.info('iteration %s: P2 update %.4f sec, solve %.4f sec', iter, update_time, end-start_opt)
+        if timings is not None:
+            timings.append((iter, 'P2', update_time, end-start_opt))
 
-        changes_y = 0
-        for j in range(K):
-            if np.any(np.abs(np.rint(np.array(y.X)[j, :])) != np.abs(np.rint(y_par[j, :]))):
-                changes_y += 1
+        y_X = np.array(y.X)
+        changes_y = np.sum(np.any(np.abs(np.rint(y_X)) != np.abs(np.rint(y_par)), axis=1))
 
-        y_par = np.copy(np.array(y.X))
+        y_prev = y_par
+        y_par = np.copy(y_X)
 
         # update dual variables
-        temp_mu = np.zeros((K,H))  # just making sure I don't make a mistake
-        for j in range(H):
-            for i in range(K):
-                temp_sum = []
-                for t in range(T):
-                    temp_sum += [x[j,i,t].X]
-                temp_mu[i,j] = np.copy(mu[i,j] + (sum(temp_sum)-(y[i,j].X*proc_fwd[i,j])))
-
-        mu = np.copy(temp_mu)
+        mu = mu + (ll.T - y_X*proc_fwd)
 
         # Calculate original objective function:
 
-        calc_obj = np.zeros(K)
-        temptemp = np.multiply(y.X, trans_back_activations)
-        for i in range(K):
-            calc_obj[i] = g_values[i] + np.sum(temptemp[i,:]) + proc_local_fwd[i]
+        calc_obj = g_values + np.sum(y_X*trans_back_activations, axis=1) + proc_local_fwd
 
         obj_per_iter += [max(calc_obj)]
-        violated_constraints = 0
-        total_constraints = 0
-        for j in range(H):
-            for i in range(K):
-                if np.all(np.abs(np.rint(ll[j,i])) != proc_fwd[i,j]*np.abs(np.rint(y_par[i,j]))):
-                    violated_constraints += 1
-                total_constraints += 1
-        
-        violations.append((violated_constraints/total_constraints)*100)
+        violated_constraints = np.abs(np.rint(ll.T)) != proc_fwd*np.abs(np.rint(y_par))
+        violations.append(np.mean(violated_constraints)*100)
 
-        primal_residual = LA.norm((ll.T - np.multiply(y_par, proc_fwd)), 'fro')**2
+        (primal_residual, dual_residual) = admm_engine.residuals(ll, y_X, y_prev, proc_fwd, rho)
 
         if changes_y <= 0:
             stable += 1
@@ -585,123 +354,65 @@ def run(K, H, T_all, release_date_fwd, proc_fwd,
             stable = 0
         
 
+        reason = admm_engine.stop(ctrl, iter, primal_residual, dual_residual, stable, time.time() - run_start)
+        verbosity.logger.info('iteration %s: rho %s, primal residual %.2f, dual residual %.2f, %s changes of y',
+                              iter, rho, primal_residual, dual_residual, changes_y)
+        if trace is not None:
+            trace.append((iter, rho, primal_residual, dual_residual, changes_y, obj_per_iter[-1], reason))
+
         # Call Algorithm-2 to compute z variables
-        if iter == 2: 
+        if reason is not None:
             flag_exit = True # mark it that we reached the end
+        else: # the penalty of the next iteration
+            rho_next = admm_engine.balance_rho(ctrl, rho, primal_residual, dual_residual)
+            if rho_next != rho:
+                mu = admm_engine.set_rho((sub1, sub2), mu, rho, rho_next)
+                rho = rho_next
 
-        x_par = np.zeros((H,K,T))
         y_ = y_par
         all_time = []
+        machines = [] # the helpers with clients and their clients
 
-        for i in range(H): # theoritically this can be done in parallel
+        for i in range(H):
             Kx = list(np.transpose(np.argwhere(y_[:,i]==1))[0]) # finds which data owners are assigned to the machine i
-            if len(Kx) == 0:
-                continue
-            
-            procx = np.copy(proc_fwd[Kx, i])  # this is a row-vector
-            release_datex = np.copy(release_date_fwd[Kx, i])
-            proc_localx = np.copy(proc_local_fwd[Kx])
-            trans_backx = np.copy(trans_back_activations[Kx, i])
-            Tx = np.max(release_datex) + len(Kx)*np.max(procx)  # to constrain the T
-            start_sub = time.time()
-            x__ = feasibility_check(len(Kx), release_datex, procx, proc_localx, trans_backx, memory_capacity[i], Tx)
-            end_sub = time.time()
-
-            machine_time = end_sub-start_sub
-
-            jj = 0
-            for j in Kx:
-                for t in range(Tx):
-                    x_par[i,j,t] = x__[0,jj,t]
-                jj += 1
-            
-            f_temp = np.zeros((len(Kx)))
-            for kk in range(len(Kx)):
-                for t in range(Tx):
-                    if f_temp[kk] < (t+1)*x__[0,kk,t]:
-                        f_temp[kk] = (t+1)*x__[0,kk,t]
-            
-            procz = np.copy(proc_bck[Kx, i])  # this is a row-vector
-            release_datez = np.copy(release_date_back[Kx, i])
-            proc_localz = np.copy(proc_local_back[Kx])
-            trans_backz = np.copy(trans_back_gradients[Kx, i])
-
-            for kk in range(len(Kx)):
-                release_datez[kk] += f_temp[kk] + proc_localx[kk] + trans_backx[kk]
-            
-            Tz = np.max(release_datez) + len(Kx)*np.max(procz)  # to constrain the T
-            x__extend = np.zeros((1,len(Kx),Tz))
-            
-            for jj in range(len(Kx)):
-                for t in range(min(Tx,Tz)):
-                    x__extend[0,jj,t] = x__[0,jj,t]
-            
-            start_sub = time.time()
-
-            # SELECT ALGORITHM -- P_b ----- SELECT ONLY ONE
-
-            # USE SOLVER UNCOMMENT BELOW
-            z__ = backward_for_each_machine(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend)
-            
-            # OR USE OUR IMPLEMENTATION:
-            #z__ = np.expand_dims(algo2(len(Kx), release_datez, procz, proc_localz, trans_backz, memory_capacity[i], Tz, x__extend), axis=0)
-            
-            # ----- SELECT ONLY ONE
-
-            end_sub = time.time()
-            machine_time += end_sub - start_sub
-
-            jj = 0
-            for j in Kx:
-                for t in range(Tz):
-                    z_par[i,j,t] = z__[0,jj,t]
-                    #z_par[i,j,t] = z__[jj,t]
-                jj += 1
-
+            if len(Kx) > 0:
+                machines.append((i, Kx))
+
+        # P_f and P_b of each helper, in parallel with workers > 1
+        jobs = [(release_date_fwd[Kx, i], proc_fwd[Kx, i], proc_local_fwd[Kx], trans_back_activations[Kx, i],
+                 release_date_back[Kx, i], proc_bck[Kx, i], proc_local_back[Kx], trans_back_gradients[Kx, i],
+                 memory_capacity[i]) for (i, Kx) in machines]
+        (results, helpers_time, cpu_time) = admm_engine.solve_helpers(pool, *subproblems, jobs, threads)
+
+        # the intervals of the jobs of all the helpers, of this iteration only
+        intervals = []
+        for ((i, Kx), (helper_intervals, machine_time, _)) in zip(machines, results):
+            intervals.append(helper_intervals.relabel(i, Kx))
             all_time.append(machine_time)
-        
-        time_stamps.append(max(all_time))
-        cs = []
-        cs_back = []
-        reserved = [0 for i in range(H)]
-        f_m = np.zeros(K)
-
-        for i in range(K): #for all jobs
-            my_machine = 0
-            my_super_machine = 0
-            last_zero = -1
-            for my_machine in range(H):
-                for k in range(T):
-                    if np.rint(x_par[my_machine,i,k]) >= 1:
-                        if last_zero < k+1:
-                            last_zero = k+1
-                            my_super_machine = my_machine
-            fmax = last_zero
-            f_m[i] = fmax
-            C = fmax + proc_local_fwd[i] + trans_back_activations[i,my_super_machine]
-            cs.append(C)
-            reserved[my_super_machine] += 1
+        plan = schedule.concat(intervals)
+
+        if len(all_time) > 0:
+            # the measured time if the helpers run in parallel, otherwise the slowest helper
+            time_stamps.append(helpers_time if pool is not None else max(all_time))
+            verbosity.logger.info('iteration %s: helpers %.4f sec, cpu %.4f sec', iter, helpers_time, cpu_time)
+            if timings is not None:
+                timings.append((iter, 'helpers', helpers_time, cpu_time))
+        # the completion times of the forward jobs and, at the end, of the backward ones
+        (cs, cs_back, my_super_machine, _, _) = schedule.completion_times(plan, None, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                          release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+        reserved = np.bincount(my_super_machine, minlength=H)
 
         if flag_exit: # we are at the end, and have solved backward() as well
-            for i in range(K): #for all jobs
-                my_machine = 0
-                my_super_machine = 0
-                last_zero = -1
-                for my_machine in range(H):
-                    for k in range(T_back):
-                        if np.rint(z_par[my_machine,i,k]) >= 1:
-                            if last_zero < k+1:
-                                last_zero = k+1
-                                my_super_machine = my_machine
-                fmax = last_zero
-                C = fmax + proc_local_back[i] + trans_back_gradients[i,my_super_machine]
-                cs_back.append(C)
+            cs_back = list(cs_back)
 
             #print(f'{utils.bcolors.FAIL}BACK max is: {max(cs_back)}{utils.bcolors.ENDC}')
        
         if flag_exit:
             obj_per_iter += [max(cs_back)]
    
+    if pool is not None:
+        pool.shutdown()
+
     total_time = 0
     for t in time_stamps:
         total_time += t
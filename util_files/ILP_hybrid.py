@@ -6,280 +6,230 @@ from gurobipy import quicksum as qsum
 import warnings
 
 import utils 
+import ILP_solver as ilp_sol
+import horizon
+import schedule
+import energy
 warnings.filterwarnings("ignore")
 
-def run(K, H, T, release_date_fwd, proc_fwd, 
-            proc_local_fwd, trans_back_activations, 
-            memory_capacity, 
-            release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients):
+def build_model(K, H, T, release_date_fwd, proc_fwd, 
+                proc_local_fwd, trans_back_activations, 
+                memory_capacity, 
+                release_date_back, proc_bck, 
+                proc_local_back, trans_back_gradients, formulation='prefix'):
     
     H_prime = H + K
-    ones_H = np.ones((H_prime,1))
-    ones_K = np.ones((K,1))
-    ones_T = np.ones((T,1))
 
+    # the hybrid problem is the original one with K extra machines (the clients),
+    # where each client can only use its own device
+    (m, x, y, z) = ilp_sol.build_model(K, H_prime, T, release_date_fwd, proc_fwd, 
+                                       proc_local_fwd, trans_back_activations, 
+                                       memory_capacity, 
+                                       release_date_back, proc_bck, 
+                                       proc_local_back, trans_back_gradients, 
+                                       formulation=formulation, name="hybrid_solution")
+
+    local = np.ones((K,K)) - np.eye(K)
+    y[:,H:].UB = 1 - local
+
+    return (m, x, y, z)
+
+
+'''
+The hybrid problem without slots on the devices of the clients: x, y and z are the
+(H,K,T), (K,H) and (H,K,T) variables of the helpers only, and y_local[i] is 1 if the
+client i trains on its own device, where nothing else runs, so that its backward job ends
+in closed form (schedule.local_completion) instead of in the slots of a machine. The model
+has the optimum of build_model (if T holds the jobs on the devices) with about H/(H+K) of
+its slot variables. local is (y_local, devices), devices being the intervals of the jobs
+of all the clients on their devices (schedule.local_schedule).
+'''
+def build_sparse_model(K, H, T, release_date_fwd, proc_fwd, 
+                proc_local_fwd, trans_back_activations, 
+                memory_capacity, 
+                release_date_back, proc_bck, 
+                proc_local_back, trans_back_gradients, formulation='prefix'):
+
+    own = np.arange(K)
     m = gp.Model("hybrid_solution")
-    
+
     # define variables
-    x = m.addMVar(shape = (H_prime,K,T), vtype=GRB.BINARY, name="x")
-    y = m.addMVar(shape=(K,H_prime), vtype=GRB.BINARY, name="y")
-    z = m.addMVar(shape = (H_prime,K,T), vtype=GRB.BINARY, name="z")
-    
+    x = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="x")
+    y = m.addMVar(shape=(K,H), vtype=GRB.BINARY, name="y")
+    z = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="z")
+    y_local = m.addMVar(shape=(K), vtype=GRB.BINARY, name="y_local")
+
     # auxilary variables
     f = m.addMVar(shape=(K), vtype=GRB.INTEGER, name="f")
     maxobj = m.addMVar(shape=(1),vtype=GRB.INTEGER, name="maxobj")
     comp = m.addMVar(shape=(K),vtype=GRB.INTEGER, name="comp")
 
-    
-    for j in range(K):
-        for i in range(H_prime):
-            if i < H:
-                continue
-            if i != H + j:
-                m.addConstr(y[j,i] == 0)
+    ilp_sol.add_constraints_vectorized(m, x, y, z, f, K, H, T, release_date_fwd[:,:H], proc_fwd[:,:H],
+                                       proc_local_fwd, trans_back_activations[:,:H],
+                                       memory_capacity[:H],
+                                       release_date_back[:,:H], proc_bck[:,:H], formulation, local=y_local)
 
-    # define constraints FORWARD
+    # C4: memory constraint of the devices
+    m.addConstr( y_local * utils.max_memory_demand <= memory_capacity[H+own] )
 
-    # C1: A job cannot be assigned to a time interval before the release time
-    for i in range(H_prime): #for all devices
-        for j in range(K): #for all jobs
-            for t in range(T): #for all timeslots
-                if t < release_date_fwd[j,i]:
-                    m.addConstr(x[i,j,t] == 0)
+    # the end of the backward job on the device, if the client trains there
+    (_, f_device, _) = schedule.local_completion(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+    m.addConstr( f >= f_device * y_local )
 
-    # C3: all job intervals are assigned to one machine
-    m.addConstr( y @ ones_H == ones_K )
-    
-    # C4: memory constraint 
-    m.addConstr((y.T * utils.max_memory_demand) @ ones_K <= memory_capacity.reshape(ones_H.shape))
-    
-    # C6: machine processes only a single job at each interval
-    for j in range(H_prime): #for all devices
-        m.addConstr( x[j,:,:].T @ ones_K <= ones_T )
-    
-    
-    # C9: new constraint - the merge of C2 and C3 (job should be processed all once and only in one machine)
-    for j in range(H_prime): #for all machines
-        for i in range(K):
-            m.addConstr( qsum(x[j,i,:]) == y[i,j]*proc_fwd[i,j])
+    # Define the objective function
 
-     # define constraints BACK
-    
-    # The backprop job cannot be assigned to a time interval before the backdrops release time
+    m.addConstr(comp == (trans_back_gradients[:,:H] * y).sum(axis=1) + trans_back_gradients[own,H+own] * y_local + f + proc_local_back)
 
-    for i in range(K): #for all jobs
-        for j in range(H_prime):
-            temp = proc_local_fwd[i] + trans_back_activations[i,j] + release_date_back[i,j]
-            temp = int(temp)
-            for t in range(temp):
-                m.addConstr(z[j,i,t] == 0)
+    max_constr = m.addConstr(maxobj == gp.max_(comp[i] for i in range(K)))
 
-            for t in range(T):
-                if t + temp >= T:
-                    break
-                
-                m.addConstr(z[j,i,t+temp] <= qsum(x[j,i,l] for l in range(t))/proc_fwd[i,j])
-    
-   
-    # C10: backprop job should be processed entirely once and in the same machine as fwd
-    for i in range(K): #for all jobs
-        for j in range(H_prime):
-            m.addConstr(qsum(z[j, i, t] for t in range(T))/ proc_bck[i, j] == y[i,j])
-    
-    # C11: machine processes only a single job at each interval
-    for j in range(H_prime): #for all devices
-        m.addConstr( x[j,:,:].T + z[j,:,:].T @ ones_K <= ones_T )
- 
-        
-    for j in range(H_prime): #for all machines
-        for i in range(K):
-            m.addConstrs( f[i] >= (t+1)*z[j,i,t] for t in range(T))
+    m.setObjective(maxobj, GRB.MINIMIZE)
 
+    devices = schedule.local_schedule(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                      release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+    return (m, x, y, z, (y_local, devices))
+
+
+'''
+The values of the variables of build_model or of build_sparse_model (with local) in the
+layout of build_model: x and z as (H+K,K,T) arrays of slots (T grows to the end of the jobs
+on the devices), y as a (K,H+K) array, rounded as the solvers return e.g. 0.9999999 for 1.
+'''
+def solution(K, H, x, y, z, local=None):
+    if local is None:
+        return (np.rint(x.X), np.rint(y.X), np.rint(z.X))
+    (y_local, devices) = local
+    on_device = (np.rint(y_local.X) >= 1)
+    devices = devices.take(on_device[devices.client])
+    T = max(x.shape[2], int(np.max(devices.end, initial=0)))
+    x_val = devices.dense(schedule.FORWARD, H+K, K, T)
+    z_val = devices.dense(schedule.BACKWARD, H+K, K, T)
+    x_val[:H,:,:x.shape[2]] = np.rint(x.X)
+    z_val[:H,:,:z.shape[2]] = np.rint(z.X)
+    y_val = np.hstack((np.rint(y.X), np.diag(on_device)))
+    return (x_val, y_val, z_val)
 
-    # Define the objective function
-    
-    m.addConstrs(comp[i] == qsum(trans_back_gradients[i,:] * y[i,:]) + f[i] + proc_local_back[i] for i in range(K))
-       
-    
-    max_constr = m.addConstr(maxobj == gp.max_(comp[i] for i in range(K)))
+
+def run(K, H, T, release_date_fwd, proc_fwd, 
+            proc_local_fwd, trans_back_activations, 
+            memory_capacity, 
+            release_date_back, proc_bck, 
+            proc_local_back, trans_back_gradients, formulation='prefix', sparse=False):
     
-    m.setObjective(maxobj, GRB.MINIMIZE)
+    H_prime = H + K
+
+    if T is None: # derive the time horizon from the FCFS schedule
+        (_, T) = horizon.compact_horizon(K, H, release_date_fwd, proc_fwd,
+                                         proc_local_fwd, trans_back_activations,
+                                         memory_capacity, None,
+                                         release_date_back, proc_bck,
+                                         proc_local_back, trans_back_gradients, hybrid=True)
+
+    # the devices of the clients in closed form with sparse
+    if sparse:
+        (m, x, y, z, local) = build_sparse_model(K, H, T, release_date_fwd, proc_fwd, 
+                                                 proc_local_fwd, trans_back_activations, 
+                                                 memory_capacity, 
+                                                 release_date_back, proc_bck, 
+                                                 proc_local_back, trans_back_gradients, formulation)
+    else:
+        (m, x, y, z) = build_model(K, H, T, release_date_fwd, proc_fwd, 
+                                   proc_local_fwd, trans_back_activations, 
+                                   memory_capacity, 
+                                   release_date_back, proc_bck, 
+                                   proc_local_back, trans_back_gradients, formulation)
+        local = None
     m.optimize()
 
-    print(f'Allocation policy: {np.rint(y.X)}')
+    (x_val, y_val, z_val) = solution(K, H, x, y, z, local)
+    print(f'Allocation policy: {y_val}')
     print('----- Scheduling policy -----')    
 
+    # the first client with a job in every slot of every machine, ' for a backward job
+    busy = (x_val > 0) | (z_val > 0)
+    first = np.argmax(busy, axis=1)
     for i in range(H_prime):
         if i < H:
             print(f'In machine-{i}', end='\t')
         else:
             print(f'In client-{i - H+1}', end='\t')
-        for k in range(T):
-            at_least = 0
-            for j in range(K):
-                #print(np.rint(x[i,j,k].X))
-                if(np.rint(x[i,j,k].X) <= 0 and np.rint(z[i,j,k].X) <= 0):
-                    #print('shit1')
-                    continue
-                else:
-                    if np.rint(x[i,j,k].X) > 0:
-                        print(f'{(j+1)}', end='\t')
-                        #print('shit2')
-                        at_least = 1
-                        break
-                    else:
-                        print(f'{(j+1)}\'', end='\t')
-                        #print('shit2')
-                        at_least = 1
-                        break
-            if(at_least == 0):
+        for k in range(x_val.shape[2]):
+            j = first[i,k]
+            if not busy[i,j,k]:
                 print(f'0', end='\t')
+            elif x_val[i,j,k] > 0:
+                print(f'{(j+1)}', end='\t')
+            else:
+                print(f'{(j+1)}\'', end='\t')
         print('')
     
-    g_var = []
     print("--------Completition time--------")
+    # every machine has slots in the model, also the devices
+    (_, cs_back, _, machine_back, _) = schedule.completion_times(x_val, z_val, H_prime, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients)
     for i in range(K): #for all jobs
-        my_machine = 0
-        for j in range(H_prime):
-            if np.rint(y[i,j].X) == 1:
-                my_machine = j
-                break
-        last_zero = -1
-        for k in range(T):
-            if np.rint(z[my_machine,i,k].X) >= 1:
-                last_zero = k+1
-        fmax = last_zero
-        g_var.append(fmax)
-        C = fmax + proc_local_back[i] + trans_back_gradients[i,my_machine]
-        if my_machine >= H:
-            print(f'C{i+1}: {C} - C-{my_machine - H+1}')
+        if machine_back[i] >= H:
+            print(f'C{i+1}: {cs_back[i]} - C-{machine_back[i] - H+1}')
         else:
-            print(f'C{i+1}: {C} - M-{my_machine}')
+            print(f'C{i+1}: {cs_back[i]} - M-{machine_back[i]}')
     print(f'objective function: {m.ObjVal}')
 
     return(m.ObjVal)
 
 
-def run_energy(K, H, T, release_date_fwd, proc_fwd, 
-                proc_local_fwd, trans_back_activations, 
-                memory_capacity, 
-                release_date_back, proc_bck, 
-                proc_local_back, trans_back_gradients, 
-                P_comp, P_transf, P_receive,
-                max_slot, network_bwd, ksi, alpha):
-
-    H_prime = H + K
-    ones_H = np.ones((H_prime,1))
-    ones_K = np.ones((K,1))
-    ones_T = np.ones((T,1))
+'''
+The model of run_energy: the model of the makespan (build_model, or build_sparse_model if
+sparse) with maxobj <= T, and the energy of every client, in computation (eng_comp) and in
+transfers to and from the helpers (eng_transf). The two objectives are normalized, the
+makespan by T (makespan_obj) and the energy by max_eng (energy_obj), and the objective is
+not set. Returns (m, x, y, z, local, objectives), local as in solution and objectives the
+dictionary of maxobj, bound (the constraint maxobj <= T), eng_comp, eng_transf, eng_total,
+makespan_obj, energy_obj and max_eng.
+'''
+def build_energy_model(K, H, T, release_date_fwd, proc_fwd, 
+                       proc_local_fwd, trans_back_activations, 
+                       memory_capacity, 
+                       release_date_back, proc_bck, 
+                       proc_local_back, trans_back_gradients, 
+                       P_comp, P_transf, P_receive,
+                       max_slot, network_bwd, ksi, sparse=False):
+
+    own = np.arange(K)
+    # the model of the makespan, with the devices of the clients in closed form with sparse
+    if sparse:
+        (m, x, y, z, local) = build_sparse_model(K, H, T, release_date_fwd, proc_fwd, 
+                                                 proc_local_fwd, trans_back_activations, 
+                                                 memory_capacity, 
+                                                 release_date_back, proc_bck, 
+                                                 proc_local_back, trans_back_gradients)
+        (y_helpers, y_local) = (y, local[0])
+    else:
+        (m, x, y, z) = build_model(K, H, T, release_date_fwd, proc_fwd, 
+                                   proc_local_fwd, trans_back_activations, 
+                                   memory_capacity, 
+                                   release_date_back, proc_bck, 
+                                   proc_local_back, trans_back_gradients)
+        local = None
+        (y_helpers, y_local) = (y[:,:H], y[own,H+own])
+    m.update()
+    maxobj = m.getVarByName("maxobj[0]")
+    bound = m.addConstr(maxobj <= T)
 
-    m = gp.Model("hybrid_solution")
-    
-    # define variables
-    x = m.addMVar(shape = (H_prime,K,T), vtype=GRB.BINARY, name="x")
-    y = m.addMVar(shape=(K,H_prime), vtype=GRB.BINARY, name="y")
-    z = m.addMVar(shape = (H_prime,K,T), vtype=GRB.BINARY, name="z")
-    
     # auxilary variables
-    f = m.addMVar(shape=(K), vtype=GRB.INTEGER, name="f")
-    maxobj = m.addMVar(shape=(1),vtype=GRB.INTEGER, name="maxobj")
-    comp = m.addMVar(shape=(K),vtype=GRB.INTEGER, name="comp")
     eng_comp = m.addMVar(shape=(K), vtype=GRB.CONTINUOUS, name="eng_comp")
     eng_transf = m.addMVar(shape=(K), vtype=GRB.CONTINUOUS, name="eng_transf")
     eng_total = m.addMVar(shape=(1), vtype=GRB.CONTINUOUS, name="eng_total")
-    
-    for j in range(K):
-        for i in range(H_prime):
-            if i < H:
-                continue
-            if i != H + j:
-                m.addConstr(y[j,i] == 0)
-
-    # define constraints FORWARD
-
-    # C1: A job cannot be assigned to a time interval before the release time
-    for i in range(H_prime): #for all devices
-        for j in range(K): #for all jobs
-            for t in range(T): #for all timeslots
-                if t < release_date_fwd[j,i]:
-                    m.addConstr(x[i,j,t] == 0)
-
-    # C3: all job intervals are assigned to one machine
-    m.addConstr( y @ ones_H == ones_K )
-    
-    # C4: memory constraint 
-    m.addConstr((y.T * utils.max_memory_demand) @ ones_K <= memory_capacity.reshape(ones_H.shape))
-    
-    # C6: machine processes only a single job at each interval
-    for j in range(H_prime): #for all devices
-        m.addConstr( x[j,:,:].T @ ones_K <= ones_T )
-    
-    
-    # C9: new constraint - the merge of C2 and C3 (job should be processed all once and only in one machine)
-    for j in range(H_prime): #for all machines
-        for i in range(K):
-            m.addConstr( qsum(x[j,i,:]) == y[i,j]*proc_fwd[i,j])
-
-     # define constraints BACK
-    
-    # The backprop job cannot be assigned to a time interval before the backdrops release time
-
-    for i in range(K): #for all jobs
-        for j in range(H_prime):
-            temp = proc_local_fwd[i] + trans_back_activations[i,j] + release_date_back[i,j]
-            temp = int(temp)
-            for t in range(temp):
-                m.addConstr(z[j,i,t] == 0)
 
-            for t in range(T):
-                if t + temp >= T:
-                    break
-                
-                m.addConstr(z[j,i,t+temp] <= qsum(x[j,i,l] for l in range(t))/proc_fwd[i,j])
-    
-   
-    # C10: backprop job should be processed entirely once and in the same machine as fwd
-    for i in range(K): #for all jobs
-        for j in range(H_prime):
-            m.addConstr(qsum(z[j, i, t] for t in range(T))/ proc_bck[i, j] == y[i,j])
-    
-    # C11: machine processes only a single job at each interval
-    for j in range(H_prime): #for all devices
-        m.addConstr( x[j,:,:].T + z[j,:,:].T @ ones_K <= ones_T )
- 
-        
-    for j in range(H_prime): #for all machines
-        for i in range(K):
-            m.addConstrs( f[i] >= (t+1)*z[j,i,t] for t in range(T))
-
-
-    # Define the objective function
-    
-    m.addConstrs(comp[i] == qsum(trans_back_gradients[i,:] * y[i,:]) + f[i] + proc_local_back[i] for i in range(K))
-    
-    m.addConstr(maxobj == gp.max_(comp[i] for i in range(K)))
-    m.addConstr(maxobj <= T)
-
-    for i in range(K):
-        m.addConstr(eng_comp[i] == (max_slot/1000)*P_comp[i]*(release_date_fwd[i,H+i]+release_date_back[i,H+i] \
-                                            + proc_local_fwd[i] + proc_local_back[i] \
-                                            + qsum(y[i,j]*(proc_fwd[i,j] + proc_bck[i,j]) for j in range(H,H_prime))))
-        
-        m.addConstr(eng_transf[i] == qsum((P_transf[i,j]+P_receive[i,j])*float(1/network_bwd[i,j])*y[i,j] for j in range(H))*(ksi[0] + ksi[1])*0.0008)
-    
-    m.addConstr(eng_total == qsum(eng_comp+eng_transf)) # make it Joule from mJ
+    # the coefficients of the energy of every client (see energy.py)
+    (fixed, device, transfer) = energy.coefficients(K, H, release_date_fwd, proc_fwd, proc_local_fwd,
+                                                    release_date_back, proc_bck, proc_local_back,
+                                                    P_comp, P_transf, P_receive, max_slot, network_bwd, ksi)
+    m.addConstr(eng_comp == fixed + device*y_local)
+    m.addConstr(eng_transf == (y_helpers*transfer).sum(axis=1))
+    m.addConstr(eng_total == eng_comp.sum() + eng_transf.sum()) # make it Joule from mJ
     
     # approach a: with propotional values
-    max_eng = 0
-    for i in range(K):
-        max_eng += float(max_slot/1000)*P_comp[i] * (release_date_fwd[i,H+i]+release_date_back[i,H+i] \
-                            + proc_local_fwd[i] + proc_local_back[i]) \
-                            + max(float(max_slot/1000)*P_comp[i] * (proc_fwd[i,H+i] + proc_bck[i,H+i]),
-                            + ((ksi[0] + ksi[1])*0.0008)*max([(P_transf[i,j]+P_receive[i,j])*float(1/network_bwd[i,j]) for j in range(H)]))
-        
-    #max_eng = max_eng
-    
+    max_eng = energy.max_energy(fixed, device, transfer)
 
     # approach b: with log 
     # log_object = m.addMVar(shape=(1), vtype=GRB.CONTINUOUS, name="log_object")
@@ -291,6 +241,30 @@ def run_energy(K, H, T, release_date_fwd, proc_fwd,
 
     m.addConstr(makespan_obj == maxobj/T)
     m.addConstr(energy_obj == eng_total/max_eng)
+
+    objectives = {'maxobj': maxobj, 'bound': bound, 'eng_comp': eng_comp, 'eng_transf': eng_transf, 'eng_total': eng_total,
+                  'makespan_obj': makespan_obj, 'energy_obj': energy_obj, 'max_eng': max_eng}
+    return (m, x, y, z, local, objectives)
+
+
+def run_energy(K, H, T, release_date_fwd, proc_fwd, 
+                proc_local_fwd, trans_back_activations, 
+                memory_capacity, 
+                release_date_back, proc_bck, 
+                proc_local_back, trans_back_gradients, 
+                P_comp, P_transf, P_receive,
+                max_slot, network_bwd, ksi, alpha, sparse=False):
+
+    H_prime = H + K
+    (m, x, y, z, local, objectives) = build_energy_model(K, H, T, release_date_fwd, proc_fwd, 
+                                                         proc_local_fwd, trans_back_activations, 
+                                                         memory_capacity, 
+                                                         release_date_back, proc_bck, 
+                                                         proc_local_back, trans_back_gradients, 
+                                                         P_comp, P_transf, P_receive,
+                                                         max_slot, network_bwd, ksi, sparse)
+    (maxobj, eng_comp, eng_transf, eng_total, makespan_obj, energy_obj, max_eng) = \
+        [objectives[name] for name in ('maxobj', 'eng_comp', 'eng_transf', 'eng_total', 'makespan_obj', 'energy_obj', 'max_eng')]
     m.setObjective(alpha*makespan_obj \
                    + (1-alpha)*energy_obj, GRB.MINIMIZE)
     
@@ -326,25 +300,15 @@ def run_energy(K, H, T, release_date_fwd, proc_fwd,
                 print(f'0', end='\t')
         print('')
     '''
-    g_var = []
     print("--------Completition time--------")
+    (x_val, _, z_val) = solution(K, H, x, y, z, local)
+    (_, cs_back, _, machine_back, _) = schedule.completion_times(x_val, z_val, H_prime, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients)
     for i in range(K): #for all jobs
-        my_machine = 0
-        for j in range(H_prime):
-            if np.rint(y[i,j].X) == 1:
-                my_machine = j
-                break
-        last_zero = -1
-        for k in range(T):
-            if np.rint(z[my_machine,i,k].X) >= 1:
-                last_zero = k+1
-        fmax = last_zero
-        g_var.append(fmax)
-        C = fmax + proc_local_back[i] + trans_back_gradients[i,my_machine]
-        if my_machine >= H:
-            print(f'C{i+1}: {C} - C-{my_machine - H+1}')
+        if machine_back[i] >= H:
+            print(f'C{i+1}: {cs_back[i]} - C-{machine_back[i] - H+1}')
         else:
-            print(f'C{i+1}: {C} - M-{my_machine}')
+            print(f'C{i+1}: {cs_back[i]} - M-{machine_back[i]}')
     print(f'objective function: {m.ObjVal}')
     
     print('print output:')
@@ -357,7 +321,94 @@ def run_energy(K, H, T, release_date_fwd, proc_fwd,
     print(makespan_obj.X)
     print(energy_obj.X)
 
-    return(maxobj.X[0])
+    return(maxobj.X)
+
+
+'''
+The Pareto front of the makespan and the energy of run_energy, with one model built once
+(build_energy_model) and only objective coefficients and right-hand sides changed between
+the solves, each solve starting from the last point with a solution (Start).
+method 'alpha' solves the weighted sums of run_energy for every alpha of alphas (default
+0, 0.1, ..., 1). method 'epsilon' minimizes the energy with the bound maxobj <= epsilon for
+every epsilon of epsilons, or, if epsilons is None, walks the front from T down: every
+point bounds the makespan by one slot less than the point before it, until no schedule is
+left. A point of 'epsilon' takes two solves, the least energy and then, with the energy
+bounded by it, the least makespan, so that it is not dominated by a schedule of the same
+energy.
+Returns a list with (alpha or epsilon, makespan, energy in Joule, allocation y as a (K,H+K)
+array, solve time in seconds, on_front) for every point with a solution, on_front being
+False for the points that another point dominates or repeats.
+'''
+def run_pareto(K, H, T, release_date_fwd, proc_fwd, 
+               proc_local_fwd, trans_back_activations, 
+               memory_capacity, 
+               release_date_back, proc_bck, 
+               proc_local_back, trans_back_gradients, 
+               P_comp, P_transf, P_receive,
+               max_slot, network_bwd, ksi, method='alpha', alphas=None, epsilons=None, sparse=False):
+
+    (m, x, y, z, local, objectives) = build_energy_model(K, H, T, release_date_fwd, proc_fwd, 
+                                                         proc_local_fwd, trans_back_activations, 
+                                                         memory_capacity, 
+                                                         release_date_back, proc_bck, 
+                                                         proc_local_back, trans_back_gradients, 
+                                                         P_comp, P_transf, P_receive,
+                                                         max_slot, network_bwd, ksi, sparse)
+    (maxobj, bound, eng_total) = (objectives['maxobj'], objectives['bound'], objectives['eng_total'])
+    (makespan_obj, energy_obj) = (objectives['makespan_obj'], objectives['energy_obj'])
+    # the objective is alpha*makespan_obj + (1-alpha)*energy_obj, and only its coefficients change
+    m.setObjective(makespan_obj + energy_obj, GRB.MINIMIZE)
+    # the bound of the energy in 'epsilon', max_eng when it is not bounded
+    cap = m.addConstr(eng_total <= objectives['max_eng'])
+    m.update()
+    variables = m.getVars()
+
+    if method == 'alpha':
+        parameters = list(np.linspace(0, 1, 11)) if alphas is None else list(alphas)
+    elif method == 'epsilon':
+        parameters = [T] if epsilons is None else list(epsilons)
+    else:
+        raise ValueError(f'unknown method {method}')
+
+    points = []
+    start = None # the values of the last solve with a solution
+    n = 0
+    while n < len(parameters):
+        parameter = parameters[n]
+        n += 1
+        if method == 'alpha':
+            (makespan_obj.Obj, energy_obj.Obj) = (parameter, 1 - parameter)
+        else:
+            (makespan_obj.Obj, energy_obj.Obj) = (0, 1)
+            (bound.RHS, cap.RHS) = (parameter, objectives['max_eng'])
+        if start is not None: # warm start from the last point with a solution
+            m.setAttr('Start', variables, start)
+        m.optimize()
+        if m.SolCount == 0:
+            continue
+        solve_time = m.Runtime
+        start = m.getAttr('X', variables)
+        (w, e, allocation) = (maxobj.X, eng_total.X[0], solution(K, H, x, y, z, local)[1])
+        if method == 'epsilon': # the least makespan with the least energy
+            cap.RHS = e + m.Params.FeasibilityTol*max(1, e)
+            (makespan_obj.Obj, energy_obj.Obj) = (1, 0)
+            m.setAttr('Start', variables, start)
+            m.optimize()
+            solve_time += m.Runtime
+            if m.SolCount > 0:
+                start = m.getAttr('X', variables)
+                (w, e, allocation) = (maxobj.X, eng_total.X[0], solution(K, H, x, y, z, local)[1])
+        points.append((parameter, w, e, allocation, solve_time))
+        if method == 'epsilon' and epsilons is None and w - 1 >= 0:
+            parameters.append(int(np.rint(w)) - 1)
+
+    # the points that no other point dominates, the first of the repeated ones
+    front = []
+    for (n, (_, w, e, _, _)) in enumerate(points):
+        dominated = any((w2 <= w and e2 <= e and (w2 < w or e2 < e)) or (n2 < n and w2 == w and e2 == e)
+                        for (n2, (_, w2, e2, _, _)) in enumerate(points))
+        front.append(not dominated)
+    return [point + (on_front,) for (point, on_front) in zip(points, front)]
 
 
 def run_second(K, H, T, release_date_fwd, proc_fwd, 
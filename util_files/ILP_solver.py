@@ -1,36 +1,76 @@
 import numpy as np
+import scipy.sparse as sp
 
 import gurobipy as gp
 from gurobipy import GRB
 from gurobipy import quicksum as qsum
 import warnings
 
-import utils 
+import utils
+import horizon
 warnings.filterwarnings("ignore")
 
 
-def run(K, H, T, release_date_fwd, proc_fwd, 
-            proc_local_fwd, trans_back_activations, 
-            memory_capacity, 
-            release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients, filename=''):
-    
+'''
+Returns a (H,K,T) mask with ones in the slots that a job can use, i.e., from
+its release date (given as a (K,H) array) and onwards.
+Used to fix the variable upper bounds in bulk.
+'''
+def release_mask(release_date, T):
+    release_date = np.asarray(release_date)
+    return (np.arange(T)[None, None, :] >= release_date.T[:, :, None]).astype(float)
+
+'''
+The backward job of client i on machine j can start in slot t+temp[j,i] only if the
+forward job has been completed in the first t slots, i.e.,
+    proc_fwd[i,j]*z[j,i,t+temp] <= sum_{l<t} x[j,i,l]
+Returns the two sparse matrices (Ax, Az) over the flattened x and z such that
+the constraint is Az @ z - Ax @ x <= 0.
+
+With cumulative=True, Ax is over the flattened cumulative-progress variables
+c[j,i,t] = sum_{l<=t} x[j,i,l] instead, so the right-hand side is the single
+term c[j,i,t-1] and the matrix has O(H*K*T) nonzeros instead of O(H*K*T^2).
+'''
+def precedence_matrices(H, K, T, proc_fwd, temp, cumulative=False):
+    B = H*K
+    temp = np.asarray(temp).reshape(B).astype(np.int64)
+    p = np.asarray(proc_fwd).T.reshape(B).astype(float)
+    n = np.clip(T - temp, 0, None) # rows per (machine, job) block
+
+    row_start = np.concatenate(([0], np.cumsum(n)[:-1]))
+    R = int(np.sum(n))
+
+    # the z-part: one entry per row
+    block = np.repeat(np.arange(B), n)
+    t = np.arange(R) - np.repeat(row_start, n)
+    Az = sp.csr_matrix((np.repeat(p, n), (np.arange(R), block*T + temp[block] + t)), shape=(R, B*T))
+
+    if cumulative:
+        # the c-part: c[j,i,t-1] for t >= 1
+        rows = np.nonzero(t >= 1)[0]
+        Ax = sp.csr_matrix((np.ones(rows.shape[0]), (rows, block[rows]*T + t[rows] - 1)), shape=(R, B*T))
+        return (Ax, Az)
+
+    # the x-part: all pairs l < t < n, the pairs of the strict lower triangle are
+    # ordered by t, so each block uses a prefix of them
+    tt, ll = np.tril_indices(int(np.max(n, initial=0)), -1)
+    c = n*(n-1)//2
+    c_start = np.concatenate(([0], np.cumsum(c)[:-1]))
+    block = np.repeat(np.arange(B), c)
+    offset = np.arange(int(np.sum(c))) - np.repeat(c_start, c)
+    Ax = sp.csr_matrix((np.ones(offset.shape[0]), (row_start[block] + tt[offset], block*T + ll[offset])), shape=(R, B*T))
+
+    return (Ax, Az)
+
+
+def add_constraints_loops(m, x, y, z, f, K, H, T, release_date_fwd, proc_fwd,
+                            proc_local_fwd, trans_back_activations,
+                            memory_capacity,
+                            release_date_back, proc_bck):
     ones_H = np.ones((H,1))
     ones_K = np.ones((K,1))
     ones_T = np.ones((T,1))
 
-    m = gp.Model("optimal_solution")
-    
-    # define variables
-    x = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="x")
-    y = m.addMVar(shape=(K,H), vtype=GRB.BINARY, name="y")
-    z = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="z")
-    
-    # auxilary variables
-    f = m.addMVar(shape=(K), vtype=GRB.INTEGER, name="f")
-    maxobj = m.addMVar(shape=(1),vtype=GRB.INTEGER, name="maxobj")
-    comp = m.addMVar(shape=(K),vtype=GRB.INTEGER, name="comp")
-
     # define constraints FORWARD
 
     # C1: A job cannot be assigned to a time interval before the release time
@@ -42,22 +82,22 @@ def run(K, H, T, release_date_fwd, proc_fwd,
 
     # C3: all job intervals are assigned to one machine
     m.addConstr( y @ ones_H == ones_K )
-    
+
     # C4: memory constraint
     m.addConstr((y.T * utils.max_memory_demand) @ ones_K <= memory_capacity.reshape(ones_H.shape))
-    
+
     # C6: machine processes only a single job at each interval
     for j in range(H): #for all devices
         m.addConstr( x[j,:,:].T @ ones_K <= ones_T )
-    
-    
+
+
     # C9: new constraint - the merge of C2 and C3 (job should be processed all once and only in one machine)
     for j in range(H): #for all machines
         for i in range(K):
             m.addConstr( qsum(x[j,i,:]) == y[i,j]*proc_fwd[i,j])
 
      # define constraints BACK
-    
+
     # The backprop job cannot be assigned to a time interval before the backdrops release time
 
     for i in range(K): #for all jobs
@@ -70,33 +110,153 @@ def run(K, H, T, release_date_fwd, proc_fwd,
             for t in range(T):
                 if t + temp >= T:
                     break
-                
+
                 m.addConstr(z[j,i,t+temp] <= qsum(x[j,i,l] for l in range(t))/proc_fwd[i,j])
-    
-   
+
+
     # C10: backprop job should be processed entirely once and in the same machine as fwd
     for i in range(K): #for all jobs
         for j in range(H):
             m.addConstr(qsum(z[j, i, t] for t in range(T))/ proc_bck[i, j] == y[i,j])
-    
+
     # C11: machine processes only a single job at each interval
     for j in range(H): #for all devices
         m.addConstr( x[j,:,:].T + z[j,:,:].T @ ones_K <= ones_T )
- 
-        
+
+
     for j in range(H): #for all machines
         for i in range(K):
             m.addConstrs( f[i] >= (t+1)*z[j,i,t] for t in range(T))
 
 
+'''
+The backward precedence constraint of the (H,K,T) x and z (see precedence_matrices), in the
+formulation 'prefix' or 'cumulative' (with the cumulative-progress variables c).
+'''
+def add_precedence(m, x, z, K, H, T, proc_fwd, temp, formulation='prefix'):
+    if formulation == 'cumulative':
+        # cumulative progress of the forward job: c[j,i,t] = sum_{l<=t} x[j,i,l]
+        c = m.addMVar(shape = (H,K,T), lb=0, ub=np.max(proc_fwd), name="c")
+        m.addConstr( c[:,:,0] == x[:,:,0] )
+        m.addConstr( c[:,:,1:] - c[:,:,:-1] == x[:,:,1:] )
+        progress = c
+    else:
+        progress = x
+
+    (Ax, Az) = precedence_matrices(H, K, T, proc_fwd, temp.T, formulation == 'cumulative')
+    if Ax.shape[0] > 0:
+        m.addConstr( Az @ z.reshape(-1) - Ax @ progress.reshape(-1) <= 0 )
+
+
+'''
+The constraints of the machines. In the hybrid case local is the (K) variables of the
+clients that train on their own device instead, which complete the assignment C3.
+'''
+def add_constraints_vectorized(m, x, y, z, f, K, H, T, release_date_fwd, proc_fwd,
+                                proc_local_fwd, trans_back_activations,
+                                memory_capacity,
+                                release_date_back, proc_bck, formulation='prefix', local=None):
+    ones_H = np.ones((H,1))
+    ones_K = np.ones((K,1))
+
+    # C1: A job cannot be assigned to a time interval before the release time
+    x.UB = release_mask(release_date_fwd, T)
+
+    # C3: all job intervals are assigned to one machine
+    if local is None:
+        m.addConstr( y @ ones_H == ones_K )
+    else:
+        m.addConstr( y.sum(axis=1) + local == 1 )
+
+    # C4: memory constraint
+    m.addConstr((y.T * utils.max_memory_demand) @ ones_K <= memory_capacity.reshape(ones_H.shape))
+
+    # C6: machine processes only a single job at each interval
+    m.addConstr( x.sum(axis=1) <= 1 )
+
+    # C9: job should be processed all once and only in one machine
+    m.addConstr( x.sum(axis=2) == y.T * proc_fwd.T )
+
+    # The backprop job cannot be assigned to a time interval before the backdrops release time
+    temp = proc_local_fwd[:,None] + trans_back_activations + release_date_back
+    z.UB = release_mask(temp, T)
+
+    add_precedence(m, x, z, K, H, T, proc_fwd, temp, formulation)
+
+    # C10: backprop job should be processed entirely once and in the same machine as fwd
+    m.addConstr( z.sum(axis=2) == y.T * proc_bck.T )
+
+    # C11: machine processes only a single job at each interval (forward or backward)
+    m.addConstr( x.sum(axis=1) + z.sum(axis=1) <= 1 )
+
+    m.addConstr( z * (np.arange(T) + 1) <= f[None,:,None] )
+
+
+def build_model(K, H, T, release_date_fwd, proc_fwd,
+                proc_local_fwd, trans_back_activations,
+                memory_capacity,
+                release_date_back, proc_bck,
+                proc_local_back, trans_back_gradients, vectorized=True,
+                formulation='prefix', name="optimal_solution"):
+
+    m = gp.Model(name)
+
+    # define variables
+    x = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="x")
+    y = m.addMVar(shape=(K,H), vtype=GRB.BINARY, name="y")
+    z = m.addMVar(shape = (H,K,T), vtype=GRB.BINARY, name="z")
+
+    # auxilary variables
+    f = m.addMVar(shape=(K), vtype=GRB.INTEGER, name="f")
+    maxobj = m.addMVar(shape=(1),vtype=GRB.INTEGER, name="maxobj")
+    comp = m.addMVar(shape=(K),vtype=GRB.INTEGER, name="comp")
+
+    # formulation of the backward precedence constraint:
+    #   'prefix': z[j,i,t+temp] <= sum_{l<t} x[j,i,l]/proc_fwd[i,j], O(H*K*T^2) nonzeros
+    #   'cumulative': the same with cumulative-progress variables, O(H*K*T) nonzeros
+    if vectorized or formulation == 'cumulative':
+        add_constraints_vectorized(m, x, y, z, f, K, H, T, release_date_fwd, proc_fwd,
+                                    proc_local_fwd, trans_back_activations,
+                                    memory_capacity,
+                                    release_date_back, proc_bck, formulation)
+    else:
+        add_constraints_loops(m, x, y, z, f, K, H, T, release_date_fwd, proc_fwd,
+                                proc_local_fwd, trans_back_activations,
+                                memory_capacity,
+                                release_date_back, proc_bck)
+
     # Define the objective function
-    
+
     m.addConstrs(comp[i] == qsum(trans_back_gradients[i,:] * y[i,:]) + f[i] + proc_local_back[i] for i in range(K))
-       
-    
+
+
     max_constr = m.addConstr(maxobj == gp.max_(comp[i] for i in range(K)))
-    
+
     m.setObjective(maxobj, GRB.MINIMIZE)
+
+    return (m, x, y, z)
+
+
+def run(K, H, T, release_date_fwd, proc_fwd,
+            proc_local_fwd, trans_back_activations,
+            memory_capacity,
+            release_date_back, proc_bck,
+            proc_local_back, trans_back_gradients, filename='', vectorized=True,
+            formulation='prefix'):
+
+    if T is None: # derive the time horizon from the FCFS schedule
+        (_, T) = horizon.compact_horizon(K, H, release_date_fwd, proc_fwd,
+                                         proc_local_fwd, trans_back_activations,
+                                         memory_capacity, None,
+                                         release_date_back, proc_bck,
+                                         proc_local_back, trans_back_gradients)
+
+    (m, x, y, z) = build_model(K, H, T, release_date_fwd, proc_fwd,
+                               proc_local_fwd, trans_back_activations,
+                               memory_capacity,
+                               release_date_back, proc_bck,
+                               proc_local_back, trans_back_gradients, vectorized,
+                               formulation)
     m.optimize()
 
     '''
@@ -120,7 +280,7 @@ def run(K, H, T, release_date_fwd, proc_fwd,
         #print('')
         f_y.write('\n')
     '''
-    
+
     return(m.ObjVal)
 
 if __name__ == '__main__':
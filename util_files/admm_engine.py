@@ -0,0 +1,304 @@
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+import concurrent.futures
+import multiprocessing
+import time
+
+import fcfs_engine
+import schedule
+
+
+'''
+The coupling constraints of the x-subproblem (P1) of the ADMM, added once to the model m
+that already has the constraints of the forward jobs: for every client i and machine j
+    contr_add[i,j] == sum_t x[j,i,t] - y_par[i,j]*proc_fwd[i,j] (+ mu[i,j])
+    contr_abs[i,j] == |contr_add[i,j]|
+    comp[i] == trans_back_activations[i,:] @ y_par[i,:] + f[i] + proc_local_fwd[i]
+    w >= comp[i]
+and the objective w + (rho/2)*sum(contr_abs) (+ sum(mu*contr_add)).
+y_par and mu are only in the right-hand sides and in the objective coefficients, so every
+iteration updates them in place (update_x) instead of removing and adding the constraints,
+and the model keeps its state. With dual_in_objective (ADMM_hybrid), mu is the coefficient
+of contr_add in the objective, otherwise (ADMM_solution) it is in the right-hand side.
+work, if given, is the (M,K) expression of the slots of every client on every machine
+instead of x.sum(axis=2) (ADMM_hybrid, where the devices of the clients have no slots).
+Returns the subproblem, a dictionary with the model and the handles that update_x needs.
+'''
+def x_coupling(m, x, f, comp, w, contr_add, contr_abs,
+               proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=False, work=None):
+    (K, M) = proc_fwd.shape
+    if work is None:
+        work = x.sum(axis=2)
+
+    # the terms with y_par and mu are moved to the right-hand side, 0 until the first update
+    add = m.addConstr(contr_add.T - work == np.zeros((M,K)))
+    finish = m.addConstr(comp - f == np.zeros(K))
+    for i in range(K):
+        for j in range(M):
+            m.addConstr(contr_abs[i,j] == gp.abs_(contr_add[i,j]))
+    m.addConstrs(w >= comp[i] for i in range(K))
+    m.setObjective(w.sum() + (rho/2)*contr_abs.sum(), GRB.MINIMIZE)
+
+    return {'model': m, 'x': x, 'contr_add': contr_add, 'add': add, 'finish': finish,
+            'contr_abs': contr_abs, 'proc': proc_fwd, 'proc_local': proc_local_fwd, 'trans_back': trans_back_activations,
+            'dual_in_objective': dual_in_objective}
+
+
+'''
+Sets y_par and mu in the x-subproblem built by x_coupling and, if given, the solution of
+the previous iteration as the start of the next solve.
+'''
+def update_x(sub, y_par, mu, x_start=None):
+    rhs = -y_par*sub['proc']
+    if sub['dual_in_objective']:
+        sub['contr_add'].Obj = mu
+    else:
+        rhs = rhs + mu
+    sub['add'].RHS = rhs.T
+    sub['finish'].RHS = np.sum(sub['trans_back']*y_par, axis=1) + sub['proc_local']
+    if x_start is not None:
+        sub['x'].Start = x_start
+    sub['model'].update()
+
+
+'''
+The coupling constraints of the y-subproblem (P2) of the ADMM, added once to the model m
+that already has the allocation constraints: for every client i and machine j
+    contr_add[i,j] == ll[j,i] - y[i,j]*proc_fwd[i,j] (+ mu[i,j])
+    contr_abs[i,j] == |contr_add[i,j]|
+    comp[i] == trans_back_activations[i,:] @ y[i,:] + f_par[i] + proc_local_fwd[i]
+    w >= comp[i]
+where ll is the processing that P1 gave to every client on every machine and f_par the
+end of its forward job. See x_coupling.
+'''
+def y_coupling(m, y, comp, w, contr_add, contr_abs,
+               proc_fwd, proc_local_fwd, trans_back_activations, rho, dual_in_objective=False):
+    (K, M) = proc_fwd.shape
+
+    add = m.addConstr(contr_add + proc_fwd*y == np.zeros((K,M)))
+    finish = m.addConstr(comp - (trans_back_activations*y).sum(axis=1) == np.zeros(K))
+    for i in range(K):
+        for j in range(M):
+            m.addConstr(contr_abs[i,j] == gp.abs_(contr_add[i,j]))
+    m.addConstrs(w >= comp[i] for i in range(K))
+    m.setObjective(w.sum() + (rho/2)*contr_abs.sum(), GRB.MINIMIZE)
+
+    return {'model': m, 'y': y, 'contr_add': contr_add, 'add': add, 'finish': finish,
+            'contr_abs': contr_abs, 'proc_local': proc_local_fwd, 'dual_in_objective': dual_in_objective}
+
+
+'''
+Sets ll (M,K), f_par and mu in the y-subproblem built by y_coupling and, if given, the
+allocation of the previous iteration as the start of the next solve.
+'''
+def update_y(sub, ll, f_par, mu, y_start=None):
+    rhs = ll.T
+    if sub['dual_in_objective']:
+        sub['contr_add'].Obj = mu
+    else:
+        rhs = rhs + mu
+    sub['add'].RHS = rhs
+    sub['finish'].RHS = f_par + sub['proc_local']
+    if y_start is not None:
+        sub['y'].Start = y_start
+    sub['model'].update()
+
+
+'''
+P_f and then P_b of the clients Kx assigned to one helper: feasibility_check and
+backward_for_each_machine are the functions of ADMM_solution or ADMM_hybrid, the other
+arguments are the parameters of the clients on the helper, and threads the limit of the
+threads of each Gurobi model (0 for the default). The functions return either the dense
+(1,len(Kx),T) schedule of a model or its intervals (single_machine.py), and the backward
+one gets the forward schedule in the same form.
+Returns (intervals, wall time, cpu time): the schedule of both phases on the helper 0
+with the clients 0..len(Kx)-1 (see schedule.py), the time of the two solves and the CPU
+time of the process that ran them (with the threads of Gurobi).
+'''
+def helper_subproblems(feasibility_check, backward_for_each_machine,
+                       release_datex, procx, proc_localx, trans_backx,
+                       release_datez, procz, proc_localz, trans_backz,
+                       memory_capacity, threads=0):
+    start_cpu = time.process_time()
+    n = len(procx)
+    Tx = np.max(release_datex) + n*np.max(procx)  # to constrain the T
+    start_sub = time.time()
+    x = feasibility_check(n, release_datex, procx, proc_localx, trans_backx, memory_capacity, Tx, threads)
+    machine_time = time.time() - start_sub
+    intervals = x if isinstance(x, schedule.Schedule) else schedule.from_dense(x, schedule.FORWARD)
+
+    # the backward jobs are released after the end of the forward ones
+    f_temp = intervals.ends(n, schedule.FORWARD)
+    release_datez = (release_datez + (f_temp + proc_localx + trans_backx)).astype(release_datez.dtype)
+    Tz = np.max(release_datez) + n*np.max(procz)  # to constrain the T
+    if not isinstance(x, schedule.Schedule):
+        x_extend = np.zeros((1,n,Tz))
+        x_extend[0,:,:min(Tx,Tz)] = x[0,:,:min(Tx,Tz)]
+        x = x_extend
+
+    start_sub = time.time()
+    z = backward_for_each_machine(n, release_datez, procz, proc_localz, trans_backz, memory_capacity, Tz, x, threads)
+    machine_time += time.time() - start_sub
+    if not isinstance(z, schedule.Schedule):
+        z = schedule.from_dense(z, schedule.BACKWARD)
+
+    return (schedule.concat((intervals, z)), machine_time, time.process_time() - start_cpu)
+
+
+'''
+The Gurobi parameters of the parent process (e.g., OutputFlag=0 of the scripts) that the
+workers of helper_pool apply to their own default environment.
+'''
+POOL_PARAMS = ('OutputFlag', 'LogToConsole')
+
+def _init_worker(params):
+    for (name, value) in params.items():
+        gp.setParam(name, value)
+
+
+'''
+A pool of worker processes for helper_subproblems, or None for workers <= 1 (the
+helpers are solved one after the other). The processes are spawned, so that each one
+has its own Gurobi environment, with the POOL_PARAMS of the parent.
+'''
+def helper_pool(workers):
+    if workers <= 1:
+        return None
+    params = {name: gp.getParamInfo(name)[2] for name in POOL_PARAMS}
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                                  initializer=_init_worker, initargs=(params,))
+
+
+'''
+Runs helper_subproblems for every job, a tuple of its arguments after the two functions,
+in the pool (see helper_pool) or one after the other if pool is None.
+Returns the results in the order of the jobs, the wall time of all of them and the sum
+of their CPU times.
+'''
+def solve_helpers(pool, feasibility_check, backward_for_each_machine, jobs, threads=0):
+    start = time.time()
+    if pool is None:
+        results = [helper_subproblems(feasibility_check, backward_for_each_machine, *job, threads) for job in jobs]
+    else:
+        futures = [pool.submit(helper_subproblems, feasibility_check, backward_for_each_machine, *job, threads) for job in jobs]
+        results = [future.result() for future in futures]
+    wall_time = time.time() - start
+    return (results, wall_time, sum(result[2] for result in results))
+
+
+'''
+The stopping rule and the penalty schedule of the ADMM (see stop and balance_rho):
+max_iter iterations at most (3, as the fixed schedule of the paper), rho the initial
+penalty, eps_primal and eps_dual the tolerances of the primal and the dual residual (in
+slots, None to ignore them), stable the number of iterations without any change of the
+allocation y after which it stops (None to ignore it), time_budget the seconds after
+which no new iteration starts (None for no limit). With balance (e.g. 10) rho is
+multiplied (divided) by tau when the primal residual is more than balance times the
+dual one (or the reverse), within [rho_min, rho_max]; None keeps rho fixed.
+'''
+def control(max_iter=3, rho=350, eps_primal=None, eps_dual=None, stable=None,
+            time_budget=None, balance=None, tau=2, rho_min=1, rho_max=1e6):
+    return {'max_iter': max_iter, 'rho': rho, 'eps_primal': eps_primal, 'eps_dual': eps_dual,
+            'stable': stable, 'time_budget': time_budget, 'balance': balance, 'tau': tau,
+            'rho_min': rho_min, 'rho_max': rho_max}
+
+
+'''
+The residuals of an iteration: the primal residual ||ll.T - y*proc_fwd|| of the coupling
+constraints and the dual residual rho*||(y - y_prev)*proc_fwd|| of the change of y
+(Frobenius norms, in slots).
+'''
+def residuals(ll, y, y_prev, proc_fwd, rho):
+    primal = np.linalg.norm(ll.T - y*proc_fwd)
+    dual = rho*np.linalg.norm((y - y_prev)*proc_fwd)
+    return (primal, dual)
+
+
+'''
+Whether the ADMM stops after the iteration iter (counted from 0), with the residuals of
+the iteration, the number of iterations in a row without changes of y and the seconds
+since the start. Returns the reason ('residuals', 'stable', 'time' or 'max_iter'), or
+None to continue. The last iteration also solves the backward problem.
+'''
+def stop(ctrl, iter, primal, dual, stable, elapsed):
+    if ctrl['eps_primal'] is not None or ctrl['eps_dual'] is not None:
+        if (ctrl['eps_primal'] is None or primal <= ctrl['eps_primal']) and (ctrl['eps_dual'] is None or dual <= ctrl['eps_dual']):
+            return 'residuals'
+    if ctrl['stable'] is not None and stable >= ctrl['stable']:
+        return 'stable'
+    if ctrl['time_budget'] is not None and elapsed >= ctrl['time_budget']:
+        return 'time'
+    if iter + 1 >= ctrl['max_iter']:
+        return 'max_iter'
+    return None
+
+
+'''
+Residual balancing of the penalty: returns rho*tau if the primal residual is more than
+balance times the dual one, rho/tau in the opposite case and rho otherwise (always
+within [rho_min, rho_max] of ctrl).
+'''
+def balance_rho(ctrl, rho, primal, dual):
+    if ctrl['balance'] is None:
+        return rho
+    if primal > ctrl['balance']*dual:
+        rho = rho*ctrl['tau']
+    elif dual > ctrl['balance']*primal:
+        rho = rho/ctrl['tau']
+    return min(max(rho, ctrl['rho_min']), ctrl['rho_max'])
+
+
+'''
+Sets the penalty rho in the objectives of the subproblems built by x_coupling and
+y_coupling. Returns the dual variables for the new penalty: when mu is in the right-hand
+side (the scaled form of ADMM_solution) it is scaled by rho_old/rho, when it is the
+coefficient of contr_add in the objective (ADMM_hybrid) it does not change.
+'''
+def set_rho(subs, mu, rho_old, rho):
+    for sub in subs:
+        sub['contr_abs'].Obj = rho/2
+        sub['model'].update()
+    if subs[0]['dual_in_objective']:
+        return mu
+    return mu*(rho_old/rho)
+
+
+'''
+Optimizes the model m, with the time left until the wall-clock deadline (a time.time()
+value, None for no deadline) as its time limit. Returns False if the deadline expired
+before or during the solve, True otherwise.
+'''
+def optimize(m, deadline=None):
+    if deadline is not None:
+        left = deadline - time.time()
+        if left <= 0:
+            return False
+        m.setParam('TimeLimit', left)
+    m.optimize()
+    return m.Status != GRB.TIME_LIMIT
+
+
+'''
+Keeps in the dictionary best the schedule with the smallest makespan found so far:
+the allocation y, the completion time of every client, the makespan and the iteration
+that gave it. Returns True if this one is the new best.
+'''
+def keep_best(best, iteration, y, completion):
+    makespan = np.max(completion)
+    if 'makespan' in best and best['makespan'] <= makespan:
+        return False
+    best.update({'y': np.copy(y), 'completion': np.asarray(completion), 'makespan': makespan, 'iteration': iteration})
+    return True
+
+
+'''
+A feasible schedule for the allocation y of an iteration: the FCFS of fcfs_engine on
+every machine, with scenario the tuple (release_date_fwd, proc_fwd, proc_local_fwd,
+trans_back_activations, release_date_back, proc_bck, proc_local_back,
+trans_back_gradients). It is kept in best if it is better (see keep_best).
+'''
+def fcfs_candidate(best, iteration, y, scenario):
+    y = np.rint(y)
+    (completion, _) = fcfs_engine.fcfs(y.shape[0], y.shape[1], *scenario, y)
+    return keep_best(best, iteration, y, completion)
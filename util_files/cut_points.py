@@ -0,0 +1,200 @@
+import numpy as np
+import random
+import copy
+
+import profiles
+import utils
+import verbosity
+
+
+'''
+All the valid pairs of splitting points of a model: the data owner keeps at least its
+first and its last layer, so 1 <= point_a < point_b < layers.
+Returns a (P,2) array, ordered by point_a and then by point_b.
+'''
+def valid_points(profile):
+    (a, b) = np.triu_indices(profile['layers'], k=1)
+    return np.stack((a[a >= 1], b[a >= 1]), axis=1)
+
+
+'''
+Forward and backward time of the three parts of the model on a device, for P pairs of
+splitting points: the first layers [0,point_a), the layers of the helper [point_a,point_b)
+and the last layers [point_b,layers). Returns three (P,2) arrays (forward, backward).
+'''
+def parts(profile, device, points):
+    prefix = profile[device]
+    first = prefix[points[:,0]] - prefix[0]
+    medium = prefix[points[:,1]] - prefix[points[:,0]]
+    last = prefix[-1] - prefix[points[:,1]]
+    return (first, medium, last)
+
+
+'''
+Activations sent to the helper and back to the data owner, and memory of the helper
+part (in MB), for P pairs of splitting points. Returns three (P) arrays.
+'''
+def memory(profile, points):
+    activations_to_cn = profile['activations'][points[:,0]-1]
+    activations_to_do = profile['activations'][points[:,1]-1]
+    store_compute_node = (profile['store'][points[:,1]] - profile['store'][points[:,0]])/1024 # prefer MB
+    return (activations_to_cn, activations_to_do, store_compute_node)
+
+
+'''
+Stacks the outputs of create_scenario (or create_scenario_hybrid, whose tensors are
+pairs of the original and the hybrid layout) along a new first axis.
+'''
+def stack(scenarios):
+    stacked = []
+    for values in zip(*scenarios):
+        if isinstance(values[0], (list, tuple)):
+            stacked.append([np.stack(layout) for layout in zip(*values)])
+        else:
+            stacked.append(np.stack(values))
+    return tuple(stacked)
+
+
+'''
+The tensors of utils.create_scenario for many pairs of splitting points at once (all the
+valid ones by default), each one with a first axis of size P: release_date (P,K,H),
+proc (P,K,H), proc_local (P,K), ..., memory_capacity (P,H), memory_demand (P,K).
+The random draws of create_scenario (network classes, devices) do not depend on the
+splitting points, so they are made once and the totals of all the pairs come from the
+prefix sums of the profile store. The values are the ones of create_scenario for each pair.
+In the heterogeneous scenario (2) the draws depend on the splitting points, so
+create_scenario is called for every pair (with a copy of rng, so that all the pairs
+have the same network classes).
+utils.max_memory_demand is not set, it is memory_demand[p].max() for the pair p.
+rng (a numpy Generator) selects the vectorized draw of utils.network_classes, rounding
+is the policy of utils.to_slots.
+Returns (points, scenario tensors).
+'''
+def create_scenarios(filename, K, H, scenario, max_slot, points=None, rng=None, rounding='ceil'):
+    profile = profiles.load_profile(filename)
+    points = valid_points(profile) if points is None else np.asarray(points).reshape(-1,2)
+
+    if scenario != 1:
+        return (points, stack([utils.create_scenario(filename, a, b, K, H, scenario, max_slot, copy.deepcopy(rng), rounding) for (a, b) in points]))
+
+    vm = parts(profile, 'VM', points)[1]
+    laptop = parts(profile, 'laptop', points)[1]
+    # data owner devices: 0 for d1, 1 for d2, 2 for jetson gpu, 3 for jetson cpu
+    owner = [parts(profile, device, points) for device in ('d1', 'd2', 'jetson-gpu', 'jetson-cpu')]
+    first = np.stack([part[0] for part in owner], axis=1) # (P,4,2)
+    last = np.stack([part[2] for part in owner], axis=1)
+    (activations_to_cn, activations_to_do, store_compute_node) = memory(profile, points)
+
+    # the draws of create_scenario
+    random.seed(42)
+    network_type = utils.network_classes(K, H, rng)
+    machine_devices = np.array([random.randint(0,1) for i in range(H)])
+    do_devices = np.array([random.randint(0,3) for i in range(K)])
+
+    my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
+    trans_back_gradients = my_net(activations_to_cn[:,None,None], network_type)
+    trans_back = my_net(activations_to_do[:,None,None], network_type)
+    release_date = trans_back_gradients + first[:,do_devices,0][:,:,None]
+    release_date_back = trans_back + last[:,do_devices,1][:,:,None]
+    proc_local = last[:,do_devices,0]
+    proc_local_back = first[:,do_devices,1]
+
+    helper = np.stack((vm, laptop), axis=1) # (P,2,2)
+    proc = np.broadcast_to(helper[:,machine_devices,0][:,None,:], release_date.shape)
+    proc_bck = np.broadcast_to(helper[:,machine_devices,1][:,None,:], release_date.shape)
+
+    memory_demand_ = np.ceil(np.ones((len(points),K)) * store_compute_node[:,None])
+    memory_capacity = np.repeat((memory_demand_.max(axis=1).astype(int)*K)[:,None], H, axis=1)
+
+    # re-define the parameters as slots
+    max_value = np.max(np.concatenate([np.rint(v).reshape(len(points),-1) for v in (release_date, release_date_back,
+                                                                                  proc_local, proc_local_back,
+                                                                                  trans_back, trans_back_gradients)], axis=1), axis=1)
+    slots = lambda v, at_least_one=False : utils.to_slots(v*max_slot, max_value.reshape((-1,) + (1,)*(v.ndim-1)), rounding, at_least_one, rng)
+
+    tensors = (slots(release_date), slots(proc, True),
+               slots(proc_local), slots(trans_back),
+               memory_capacity, memory_demand_,
+               slots(release_date_back), slots(proc_bck, True),
+               slots(proc_local_back), slots(trans_back_gradients))
+    verbosity.scenario('create_scenarios', tensors, points=points, K=K, H=H)
+    return (points, tensors)
+
+
+'''
+The tensors of utils.create_scenario_hybrid for many pairs of splitting points at once
+(all the valid ones by default), with a first axis of size P. As in create_scenario_hybrid,
+each tensor (but memory_demand) is the pair [original layout (P,K,H), hybrid layout (P,K,H+K)].
+The heterogeneous scenario (2) calls create_scenario_hybrid for every pair.
+Returns (points, scenario tensors).
+'''
+def create_scenarios_hybrid(filename, K, H, max_slot, scenario, points=None, rng=None, rounding='ceil'):
+    profile = profiles.load_profile(filename)
+    points = valid_points(profile) if points is None else np.asarray(points).reshape(-1,2)
+    P = len(points)
+    H_prime = H + K
+
+    if scenario != 1:
+        return (points, stack([utils.create_scenario_hybrid(filename, a, b, K, H, max_slot, scenario, copy.deepcopy(rng), rounding) for (a, b) in points]))
+
+    laptop = parts(profile, 'laptop', points)[1]
+    # data owner devices: 0 for d1, 1 for jetson cpu, 2 for jetson gpu
+    owner = [parts(profile, device, points) for device in ('d1', 'jetson-cpu', 'jetson-gpu')]
+    (first, medium, last) = [np.stack([part[n] for part in owner], axis=1) for n in range(3)] # (P,3,2)
+    (activations_to_cn, activations_to_do, store_compute_node) = memory(profile, points)
+
+    # the draws of create_scenario_hybrid, all the helpers are laptops
+    random.seed(42)
+    network_type = utils.network_classes(K, H, rng)
+    do_devices = np.array([random.randint(0,2) for i in range(K)])
+    local_memory = np.array([random.choice([0, 1]) for i in range(K)]) # the choice between 1 and the demand
+
+    my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
+    slow = np.where(network_type <= 1, 5, 1)
+    to_cn = my_net(activations_to_cn[:,None,None], network_type)*slow
+    to_do = my_net(activations_to_do[:,None,None], network_type)*slow
+
+    release_date = np.zeros((P,K,H_prime))
+    release_date[:,:,:H] = to_cn
+    release_date += first[:,do_devices,0][:,:,None]
+    release_date_back = np.zeros((P,K,H_prime))
+    release_date_back[:,:,:H] = to_do
+    release_date_back += last[:,do_devices,1][:,:,None]
+    trans_back = np.zeros((P,K,H_prime))
+    trans_back[:,:,:H] = to_do
+    trans_back_gradients = np.zeros((P,K,H_prime))
+    trans_back_gradients[:,:,:H] = to_cn
+    proc_local = last[:,do_devices,0]
+    proc_local_back = first[:,do_devices,1]
+
+    proc = np.zeros((P,K,H_prime))
+    proc[:,:,:H] = (laptop[:,0] + 2*max_slot)[:,None,None]
+    proc[:,np.arange(K),H+np.arange(K)] = medium[:,do_devices,0]
+    proc_bck = np.zeros((P,K,H_prime))
+    proc_bck[:,:,:H] = (laptop[:,1] + 2*max_slot)[:,None,None]
+    proc_bck[:,np.arange(K),H+np.arange(K)] = medium[:,do_devices,1]
+
+    memory_demand_ = np.ceil(np.ones((P,K)) * store_compute_node[:,None])
+    demand = memory_demand_.max(axis=1).astype(int)[:,None]
+    memory_capacity = np.zeros((P,H_prime))
+    if H == 5 or H == 10:
+        memory_capacity[:,:H] = np.where(np.arange(H) <= 1, demand*int(K/2), demand)
+    else:
+        memory_capacity[:,:H] = demand*K
+    memory_capacity[:,H:] = np.where(local_memory == 1, demand, 1)
+
+    # re-define the parameters as slots
+    slots = lambda v, at_least_one=False : utils.to_slots(v, max_slot, rounding, at_least_one, rng)
+    both = lambda v : [v[...,:H].copy(), v]
+    (release_date, trans_back,
+    release_date_back, trans_back_gradients) = [slots(v) for v in (release_date, trans_back, release_date_back, trans_back_gradients)]
+    (proc, proc_bck) = [slots(v, True) for v in (proc, proc_bck)]
+    (proc_local, proc_local_back) = [slots(v) for v in (proc_local, proc_local_back)]
+
+    tensors = (both(release_date), both(proc),
+               [proc_local, proc_local.copy()], both(trans_back),
+               both(memory_capacity), memory_demand_,
+               both(release_date_back), both(proc_bck),
+               [proc_local_back, proc_local_back.copy()], both(trans_back_gradients))
+    verbosity.scenario('create_scenarios_hybrid', tensors, points=points, K=K, H=H)
+    return (points, tensors)
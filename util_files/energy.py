@@ -0,0 +1,58 @@
+import numpy as np
+
+
+'''
+The energy of the clients of the hybrid problem (in Joule), as ILP_hybrid.run_energy counts
+it, from the per-client coefficients:
+- fixed, the computation of the layers of the client itself (the release dates and the
+  local parts), spent on whatever machine it trains,
+- device, the computation of the layers of the helpers, spent only if it trains on its own
+  device,
+- transfer, the sending and receiving of the activations and gradients with each helper,
+  spent only on that helper.
+Returns (fixed, device, transfer), (K), (K) and (K,H) arrays.
+'''
+def coefficients(K, H, release_date_fwd, proc_fwd, proc_local_fwd,
+                 release_date_back, proc_bck, proc_local_back,
+                 P_comp, P_transf, P_receive, max_slot, network_bwd, ksi):
+    own = np.arange(K)
+    P_comp = np.asarray(P_comp, dtype=float)
+    fixed = (max_slot/1000)*P_comp*(release_date_fwd[own,H+own] + release_date_back[own,H+own] + proc_local_fwd + proc_local_back)
+    device = (max_slot/1000)*P_comp*(proc_fwd[own,H+own] + proc_bck[own,H+own])
+    transfer = (P_transf[:,:H] + P_receive[:,:H])/network_bwd[:,:H]*(ksi[0] + ksi[1])*0.0008
+    return (fixed, device, transfer)
+
+
+'''
+The energy of every client on every machine of the compact layout (K,H+1): the H helpers
+and, in the column H, its own device.
+'''
+def table(fixed, device, transfer):
+    return fixed[:,None] + np.hstack((transfer, device[:,None]))
+
+
+'''
+The normalization of the energy in run_energy: the sum over the clients of their largest
+energy, on their device or on the helper of the most expensive transfers.
+'''
+def max_energy(fixed, device, transfer):
+    return np.sum(fixed + np.maximum(device, np.max(transfer, axis=1)))
+
+
+'''
+The energy of assignments y, one-hot rows of (..., K, H+K) arrays in the hybrid layout
+(the own device of the client i is the machine H+i) or of (..., K, H+1) arrays in the
+compact one, any leading axes being a batch of assignments scored together.
+Returns (eng_comp, eng_transf, eng_total): the computation and transfer energy of every
+client, (..., K), and the total, (...).
+'''
+def evaluate(y, H, fixed, device, transfer):
+    y = np.asarray(y, dtype=float)
+    K = y.shape[-2]
+    if y.shape[-1] == H + 1:
+        local = y[...,H]
+    else:
+        local = y[...,np.arange(K),H+np.arange(K)]
+    eng_comp = fixed + device*local
+    eng_transf = np.sum(y[...,:H]*transfer, axis=-1)
+    return (eng_comp, eng_transf, np.sum(eng_comp + eng_transf, axis=-1))
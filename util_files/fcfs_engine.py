@@ -0,0 +1,185 @@
+import numpy as np
+import heapq
+
+
+'''
+Parameters of each client on the machine it is assigned to (y is one-hot per row).
+Works for both layouts: H helpers, or H helpers followed by the K local devices (hybrid).
+Returns the assigned clients, their machines and the per-client vectors
+(release of the forward job, forward processing, delay between the end of the forward
+and the release of the backward job, backward processing, time after the backward job).
+'''
+def client_parameters(release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                      release_date_back, proc_bck, proc_local_back, trans_back_gradients, y):
+    y = np.asarray(y)
+    clients = np.nonzero(np.any(y == 1, axis=1))[0]
+    machine = np.argmax(y[clients] == 1, axis=1)
+
+    release = release_date_fwd[clients, machine]
+    fwd = proc_fwd[clients, machine]
+    delay = trans_back_activations[clients, machine] + proc_local_fwd[clients] + release_date_back[clients, machine]
+    bck = proc_bck[clients, machine]
+    tail = trans_back_gradients[clients, machine] + proc_local_back[clients]
+
+    return (clients, machine, release, fwd, delay, bck, tail)
+
+
+'''
+Discrete-event FCFS scheduler with the semantics of utils.fifo: on each machine the task
+(forward or backward) with the earliest release is served first and ties go to the task
+that became available first. The backward job of a client is released when its forward
+job ends plus the delay. Each machine keeps its tasks in a heap keyed by
+(release, arrival order), so a machine with n clients costs O(n log n).
+Returns the completion time of each client (0 if not assigned) and the makespan.
+'''
+def fcfs(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+         release_date_back, proc_bck, proc_local_back, trans_back_gradients, y):
+
+    (clients, machine,
+    release, fwd, delay,
+    bck, tail) = client_parameters(release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                   release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
+
+    f_temp = np.zeros(K)
+    end = np.zeros(len(clients))
+
+    # the clients of each machine, in increasing index (the arrival order of utils.fifo)
+    order = np.argsort(machine, kind='stable')
+    bounds = np.searchsorted(machine[order], np.arange(np.asarray(y).shape[1]+1))
+
+    release, fwd, delay, bck = release.tolist(), fwd.tolist(), delay.tolist(), bck.tolist()
+    for m in range(len(bounds)-1):
+        jobs = order[bounds[m]:bounds[m+1]].tolist()
+        heap = [(release[j], seq, j, False) for seq, j in enumerate(jobs)]
+        heapq.heapify(heap)
+        seq = len(jobs)
+        machine_time = 0
+        while heap:
+            (value, _, j, back) = heapq.heappop(heap)
+            if machine_time <= value: # the first one or a big wait
+                machine_time = value
+            if back:
+                machine_time += bck[j]
+                end[j] = machine_time
+            else:
+                machine_time += fwd[j]
+                heapq.heappush(heap, (machine_time + delay[j], seq, j, True))
+                seq += 1
+
+    f_temp[clients] = end + tail
+    makespan = np.max(f_temp) if K > 0 else 0
+
+    return (f_temp, makespan)
+
+
+'''
+Stacks B scenarios of possibly different sizes into (B,K,M) and (B,K) arrays, padding
+with clients and machines that are not used (their rows/columns of y are zero).
+Each scenario is the tuple (release_date_fwd, proc_fwd, proc_local_fwd,
+trans_back_activations, release_date_back, proc_bck, proc_local_back,
+trans_back_gradients, y), with M machines (H, or H+K for the hybrid layout).
+'''
+def stack_scenarios(scenarios):
+    K = max(np.asarray(s[-1]).shape[0] for s in scenarios)
+    M = max(np.asarray(s[-1]).shape[1] for s in scenarios)
+
+    stacked = []
+    for n in range(9):
+        if n in (2, 6): # proc_local_fwd, proc_local_back
+            out = np.zeros((len(scenarios),K))
+        else:
+            out = np.zeros((len(scenarios),K,M))
+        for b, s in enumerate(scenarios):
+            a = np.asarray(s[n])
+            out[(b,) + tuple(slice(0,d) for d in a.shape)] = a
+        stacked.append(out)
+
+    return tuple(stacked)
+
+
+'''
+FCFS of B scenarios at once, vectorized over the batch: (B,K,M) arrays for the per
+machine parameters and y, (B,K) for proc_local_fwd and proc_local_back (a single
+scenario is broadcast against a stack of y and vice versa).
+The clients are grouped per (scenario, machine) into rows of a (G,L) table, L being the
+largest number of clients of a machine, and at every step all the machines serve their
+next task together. The forward jobs never change their release, so they are served in
+the order of (release, client) through a pointer. The backward jobs are stored in the
+order they arrive, so a row-wise argmin also breaks the ties as fcfs() does. A forward
+job wins a tie against a backward one, since it arrived before it.
+There are 2L steps of O(G*L) each.
+Returns the (B,K) completion times and the (B,) makespans.
+'''
+def fcfs_batch(release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+               release_date_back, proc_bck, proc_local_back, trans_back_gradients, y):
+
+    (release_date_fwd, proc_fwd, trans_back_activations,
+    release_date_back, proc_bck, trans_back_gradients, y) = np.broadcast_arrays(release_date_fwd, proc_fwd, trans_back_activations,
+                                                                                release_date_back, proc_bck, trans_back_gradients,
+                                                                                np.asarray(y) == 1)
+    (B, K, M) = y.shape
+    proc_local_fwd = np.broadcast_to(proc_local_fwd, (B,K))
+    proc_local_back = np.broadcast_to(proc_local_back, (B,K))
+
+    # the assigned clients, ordered by (scenario, machine, release of the forward job, client)
+    (b, k) = np.nonzero(np.any(y, axis=2))
+    m = np.argmax(y, axis=2)[b,k]
+    release = release_date_fwd[b,k,m].astype(float)
+    order = np.argsort(release, kind='stable')
+    order = order[np.argsort((b*M + m)[order], kind='stable')]
+    (b, k, m, release) = (b[order], k[order], m[order], release[order])
+
+    # their place in the (G,L) table
+    new_group = np.concatenate(([True], np.diff(b*M + m) != 0)) if len(b) else np.zeros(0, dtype=bool)
+    group = np.cumsum(new_group) - 1
+    start = np.nonzero(new_group)[0]
+    G = len(start)
+    pos = np.arange(len(b)) - start[group]
+    L = int(np.max(pos, initial=-1)) + 1
+
+    def table(values, fill):
+        out = np.full((G,L+1), fill, dtype=float) # the last column stays empty
+        out[group,pos] = values
+        return out
+
+    fwd = table(proc_fwd[b,k,m], 0)
+    delay = table(trans_back_activations[b,k,m] + proc_local_fwd[b,k] + release_date_back[b,k,m], 0)
+    bck = table(proc_bck[b,k,m], 0)
+    release = table(release, np.inf)
+
+    # the tables are indexed flat, row*(L+1) + column
+    rows = np.arange(G)*(L+1)
+    release, fwd, delay, bck = release.ravel(), fwd.ravel(), delay.ravel(), bck.ravel()
+    next_fwd = rows.copy() # the next forward job of each machine
+    arrivals = rows.copy() # where the next backward job is appended
+    back_release = np.full(G*(L+1), np.inf)
+    back_job = np.zeros(G*(L+1), dtype=int)
+    end = np.zeros(G*(L+1))
+    machine_time = np.zeros(G)
+
+    for step in range(2*L):
+        first_fwd = release[next_fwd]
+        bj = rows + np.argmin(back_release.reshape(G,L+1), axis=1)
+        first_bck = back_release[bj]
+
+        take_fwd = first_fwd <= first_bck
+        first = np.where(take_fwd, first_fwd, first_bck)
+        active = np.isfinite(first)
+        job = np.where(take_fwd, next_fwd, back_job[bj])
+        machine_time = np.where(active, np.maximum(machine_time, first) + np.where(take_fwd, fwd[job], bck[job]), machine_time)
+
+        g = np.nonzero(active & take_fwd)[0] # forward jobs served, their backward job arrives
+        back_release[arrivals[g]] = machine_time[g] + delay[job[g]]
+        back_job[arrivals[g]] = job[g]
+        arrivals[g] += 1
+        next_fwd[g] += 1
+
+        g = np.nonzero(active & ~take_fwd)[0] # backward jobs served
+        end[job[g]] = machine_time[g]
+        back_release[bj[g]] = np.inf
+
+    f_temp = np.zeros((B,K))
+    f_temp[b,k] = end[group*(L+1) + pos] + trans_back_gradients[b,k,m] + proc_local_back[b,k]
+    makespan = np.max(f_temp, axis=1) if K > 0 else np.zeros(B)
+
+    return (f_temp, makespan)
@@ -1,6 +1,9 @@
 import numpy as np
 import random
+import fcfs_engine
+import verbosity
 import utils
+import energy
 
 
 def check_memory(capacity, load):
@@ -24,19 +27,11 @@ def check_balance(distributions_):
     return (larger - smaller)
 
 
-def run(K, H, release_date_fwd, proc_fwd, 
-            proc_local_fwd, trans_back_activations, 
-            memory_capacity, memory_demand,
-            release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients, y=[]):
-    
-    # random seed 
-    random.seed(42)
-
-    f_temp = np.zeros(K)
-    f_temp_faster_machine = []
-
-    # machine selection
+'''
+The client assignment of the balanced-greedy algorithm: each client goes to the helper
+(that fits in memory) keeping the number of clients per helper the most balanced.
+'''
+def balanced_greedy(K, H, memory_capacity, memory_demand):
     y = np.zeros((K,H))
     
     distribution = [0 for i in range(H)] #how many devices on machine
@@ -63,26 +58,19 @@ def run(K, H, release_date_fwd, proc_fwd,
             load_[best_load[0]] += memory_demand[i]
             y[i,best_load[0]] = 1  
 
-
-    f_temp_slower = utils.fifo(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
-         release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
-
-    return f_temp_slower
+    return y
 
 
-def run_hybrid(K, H, release_date_fwd, proc_fwd, 
-            proc_local_fwd, trans_back_activations, 
+'''
+The same for the hybrid case (H helpers followed by the K local devices). A client stays
+on its own device when this is estimated to be faster than offloading.
+'''
+def balanced_greedy_hybrid(K, H, release_date_fwd, proc_fwd, 
+            trans_back_activations, 
             memory_capacity, memory_demand,
             release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients, y=[]):
-    
-    # random seed 
-    random.seed(42)
+            trans_back_gradients):
     H_prime = H + K
-    f_temp = np.zeros(K)
-    f_temp_faster_machine = []
-
-    # machine selection
     y = np.zeros((K,H_prime))
     
     distribution = [0 for i in range(H)] #how many devices on machine
@@ -128,9 +116,184 @@ def run_hybrid(K, H, release_date_fwd, proc_fwd,
             y[i,best_load[0]] = 1  
             #print(f'{i} - [{best_load[0]}]')
 
- 
-    print(y)
-    f_temp_slower = utils.fifo(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
+    return y
+
+
+def run(K, H, release_date_fwd, proc_fwd, 
+            proc_local_fwd, trans_back_activations, 
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck, 
+            proc_local_back, trans_back_gradients, y=[]):
+    
+    # random seed 
+    random.seed(42)
+
+    # machine selection
+    y = balanced_greedy(K, H, memory_capacity, memory_demand)
+
+    (_, f_temp_slower) = fcfs_engine.fcfs(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
+         release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
+
+    return f_temp_slower
+
+
+def run_hybrid(K, H, release_date_fwd, proc_fwd, 
+            proc_local_fwd, trans_back_activations, 
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck, 
+            proc_local_back, trans_back_gradients, y=[]):
+    
+    # random seed 
+    random.seed(42)
+
+    # machine selection
+    y = balanced_greedy_hybrid(K, H, release_date_fwd, proc_fwd, 
+                                trans_back_activations, 
+                                memory_capacity, memory_demand,
+                                release_date_back, proc_bck, 
+                                trans_back_gradients)
+
+    verbosity.logger.debug('%s', y)
+    (_, f_temp_slower) = fcfs_engine.fcfs(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
          release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
 
-    return (y,f_temp_slower) #ATTENTION: NOT COMPATIBLE WITH OTHERS
\ No newline at end of file
+    return (y,f_temp_slower) #ATTENTION: NOT COMPATIBLE WITH OTHERS
+
+
+'''
+The parameters (K,H+K) of the hybrid layout in the compact layout (K,H+1) of the energy
+heuristic: the H helpers and, in the column H, the own device of every client, so that
+nothing is quadratic in K.
+'''
+def compact(H, *parameters):
+    own = np.arange(parameters[0].shape[0])
+    return tuple(np.hstack((p[:,:H], p[own,H+own][:,None])) for p in parameters)
+
+
+'''
+The energy-aware greedy allocation of the hybrid case, with the objective of
+ILP_hybrid.run_energy: alpha*makespan/T + (1-alpha)*energy/max_eng, costs being the
+(K,H+1) energies of energy.table. The clients, the slowest on their own device first, go
+one at a time to the machine (a helper with room in memory or the own device) of the
+least objective, the makespan estimated by the completion of the client alone on the
+machine (chain) and by the bound min release + sum of the processing + min tail of the
+helpers. As in run_energy the makespan is at most T: the machines with a larger estimate
+are taken only if there is no other. Raises ValueError if a client does not fit in memory
+anywhere.
+Returns the machine of every client in the compact layout (H for the own device).
+'''
+def energy_greedy_hybrid(K, H, T, alpha, costs, max_eng, release, work, tail, chain, slots, device_fits):
+    # lists, as a client only looks at H+1 machines and numpy costs more than it saves there
+    (release, work, tail, chain, weighted) = (a.tolist() for a in (release, work, tail, chain, (1-alpha)*costs/max_eng))
+    # the state of the helpers, the own device (H) stays empty so that its estimate is chain
+    (first, total, last, longest) = ([np.inf]*(H+1), [0]*(H+1), [np.inf]*(H+1), [0]*(H+1))
+    room = [int(slots[j]) for j in range(H)] + [0]
+    machine = np.full(K, H)
+    span = 0 # the estimated makespan so far
+    for i in np.argsort(-np.asarray(chain)[:,H], kind='stable').tolist():
+        (r, w, t, c) = (release[i], work[i], tail[i], chain[i])
+        best = (np.inf, np.inf, H) # (excess of T, cost, machine)
+        for j in range(H+1):
+            if (j < H and room[j] <= 0) or (j == H and not device_fits[i]):
+                continue
+            estimate = max(min(first[j], r[j]) + total[j] + w[j] + min(last[j], t[j]), longest[j], c[j])
+            makespan = max(estimate, span)
+            option = (max(makespan - T, 0), makespan*alpha/T + weighted[i][j], j)
+            if option < best:
+                (best, best_estimate) = (option, estimate)
+        if best[0] == np.inf:
+            raise ValueError(f'client {i} does not fit in the memory of any machine')
+        j = best[2]
+        if j < H:
+            (first[j], total[j], last[j], longest[j]) = (min(first[j], r[j]), total[j] + w[j], min(last[j], t[j]), best_estimate)
+            room[j] -= 1
+        span = max(span, best_estimate)
+        machine[i] = j
+    return machine
+
+
+'''
+The energy-aware heuristic of the hybrid case, the counterpart of ILP_hybrid.run_energy
+without a solver: the greedy allocation of energy_greedy_hybrid scheduled with FCFS, then
+a local search of at most iterations moves of one client to another machine, the client
+of the makespan first and then the clients not on the machine of their least energy. A
+move only reschedules (FCFS) the helpers it changes, and is kept if the objective drops,
+or first the makespan if it exceeds T, the bound of run_energy.
+The memory of the helpers and of the devices is the one of the ILP (utils.max_memory_demand
+per client).
+Returns (machine, cs, makespan, energy, objective): the machine of every client in the
+hybrid layout (H+i for its own device), the completion times, the makespan, the energy
+in Joule and the objective of run_energy.
+'''
+def run_energy_hybrid(K, H, T, release_date_fwd, proc_fwd, 
+                      proc_local_fwd, trans_back_activations, 
+                      memory_capacity, 
+                      release_date_back, proc_bck, 
+                      proc_local_back, trans_back_gradients, 
+                      P_comp, P_transf, P_receive,
+                      max_slot, network_bwd, ksi, alpha, iterations=20):
+
+    own = np.arange(K)
+    (fixed, device, transfer) = energy.coefficients(K, H, release_date_fwd, proc_fwd, proc_local_fwd,
+                                                    release_date_back, proc_bck, proc_local_back,
+                                                    P_comp, P_transf, P_receive, max_slot, network_bwd, ksi)
+    (costs, max_eng) = (energy.table(fixed, device, transfer), energy.max_energy(fixed, device, transfer))
+    (release, fwd, activations, release_back, bck, gradients) = compact(H, release_date_fwd, proc_fwd, trans_back_activations,
+                                                                        release_date_back, proc_bck, trans_back_gradients)
+    tail = gradients + proc_local_back[:,None]
+    # the completion of a client alone on a machine, on its device the one of schedule.local_completion
+    chain = release + fwd + activations + proc_local_fwd[:,None] + release_back + bck + tail
+    slots = np.floor(np.asarray(memory_capacity[:H])/utils.max_memory_demand).astype(int)
+    device_fits = (np.asarray(memory_capacity[H:]) >= utils.max_memory_demand)
+
+    machine = energy_greedy_hybrid(K, H, T, alpha, costs, max_eng, release, fwd + bck, tail, chain, slots, device_fits)
+
+    # FCFS of the clients of the helpers in the list, the others alone on their device
+    def completion(clients, machines):
+        y = np.zeros((len(clients),H+1))
+        y[np.arange(len(clients)), machines] = (machines < H)
+        f = fcfs_engine.fcfs(len(clients), H+1, release[clients], fwd[clients], proc_local_fwd[clients], activations[clients],
+                             release_back[clients], bck[clients], proc_local_back[clients], gradients[clients], y)[0]
+        return np.where(machines < H, f, chain[clients,H])
+
+    # the objective and, first, the excess of the makespan over T
+    score = lambda makespan, spent: (max(makespan - T, 0), alpha*makespan/T + (1-alpha)*spent/max_eng)
+    cs = completion(own, machine)
+    spent = np.sum(costs[own,machine])
+    objective = score(np.max(cs), spent)
+    load = np.bincount(machine, minlength=H+1)[:H]
+
+    tried = 0
+    while tried < iterations:
+        critical = int(np.argmax(cs))
+        moves = [(critical, j) for j in range(H+1) if j != machine[critical]]
+        allowed = np.where(np.append(load < slots, True), costs, np.inf)
+        allowed[~device_fits,H] = np.inf
+        saving = costs[own,machine] - np.min(allowed, axis=1)
+        moves += [(int(i), int(np.argmin(allowed[i]))) for i in np.argsort(-saving)[:iterations] if saving[i] > 0]
+        improved = False
+        for (i, j) in moves:
+            a = machine[i]
+            if (j < H and load[j] >= slots[j]) or (j == H and not device_fits[i]) or tried >= iterations:
+                continue
+            after = spent - costs[i,a] + costs[i,j]
+            changed = (machine == a) & (a < H) | (machine == j) & (j < H)
+            changed[i] = True
+            rest = np.max(cs[~changed], initial=0)
+            if score(max(rest, chain[i,j]), after) >= objective: # no better, even at its bound
+                continue
+            tried += 1
+            clients = np.nonzero(changed)[0]
+            machines = machine[clients]
+            machines[clients == i] = j
+            new = completion(clients, machines)
+            value = score(max(rest, np.max(new)), after)
+            if value < (objective[0], objective[1] - 1e-12):
+                (cs[clients], machine[i], spent, objective) = (new, j, after, value)
+                load = np.bincount(machine, minlength=H+1)[:H]
+                improved = True
+                break
+        if not improved:
+            break
+
+    return (np.where(machine < H, machine, H + own), cs, np.max(cs), spent, objective[1])
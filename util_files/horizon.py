@@ -0,0 +1,105 @@
+import numpy as np
+
+import utils
+import heuristic_FCFS as fcfs_sol
+import fcfs_engine
+import verbosity
+
+
+'''
+The bounds on the time horizon used so far by the testing scripts: every helper may
+receive all the K clients, so the horizon grows with K*max(proc).
+Returns (T_fwd, T), the horizon of the forward part only and of the whole schedule.
+'''
+def loose_horizon(K, H, release_date_fwd, proc_fwd,
+                    proc_local_fwd, trans_back_activations,
+                    release_date_back, proc_bck,
+                    proc_local_back, trans_back_gradients, hybrid=False):
+
+    proc_fwd_ = np.max(proc_fwd[:,0:H])*K
+    proc_bck_ = np.max(proc_bck[:,0:H])*K
+    if hybrid: # a client may also run on its own device
+        proc_fwd_ = max(proc_fwd_, np.max([proc_fwd[k,H+k] for k in range(K)]))
+        proc_bck_ = max(proc_bck_, np.max([proc_bck[k,H+k] for k in range(K)]))
+
+    T_fwd = np.max(release_date_fwd) + proc_fwd_
+    T = T_fwd + np.max(release_date_back) + proc_bck_ \
+            + np.max(proc_local_fwd) + np.max(proc_local_back) \
+            + np.max(trans_back_activations) + np.max(trans_back_gradients)
+
+    return (int(T_fwd), int(T))
+
+
+'''
+Forward part of the FCFS policy: on each machine the forward jobs are served in the order
+of their release dates. Returns the completion time of each forward job.
+'''
+def forward_fcfs(release_date_fwd, proc_fwd, y):
+    K = y.shape[0]
+    f = np.zeros(K)
+    for machine in range(y.shape[1]):
+        my_jobs = np.nonzero(y[:,machine] == 1)[0]
+        my_jobs = my_jobs[np.argsort(release_date_fwd[my_jobs,machine], kind='stable')]
+        machine_time = 0
+        for j in my_jobs:
+            machine_time = max(machine_time, release_date_fwd[j,machine]) + proc_fwd[j,machine]
+            f[j] = machine_time
+    return f
+
+
+'''
+Time horizon derived from a heuristic schedule. The clients are assigned with the
+balanced-greedy algorithm and are scheduled with FCFS (see heuristic_FCFS.py).
+This schedule is feasible, so:
+- T_fwd, the last forward slot of FCFS, is enough for the forward problem, and
+- T, the FCFS makespan minus the least time that follows the last backward slot of a
+  client (proc_local_back + trans_back_gradients), is enough for the whole problem
+  without cutting off its optimal solution: the optimal makespan is at most the FCFS one,
+  and in the optimal schedule every client ends its backward slots at least its own tail
+  before its completion, so not after the FCFS makespan minus the least tail.
+Only the last backward slot of this FCFS schedule would not be enough, as the optimal
+schedule can put its last backward slot later (e.g., on a client with a shorter tail).
+If the assignment does not respect the memory, the loose bounds are returned.
+memory_demand=None stands for the uniform demand (utils.max_memory_demand) of ILP_solver.
+'''
+def compact_horizon(K, H, release_date_fwd, proc_fwd,
+                    proc_local_fwd, trans_back_activations,
+                    memory_capacity, memory_demand,
+                    release_date_back, proc_bck,
+                    proc_local_back, trans_back_gradients, hybrid=False):
+
+    if memory_demand is None:
+        memory_demand = np.ones(K)*utils.max_memory_demand
+
+    if hybrid:
+        y = fcfs_sol.balanced_greedy_hybrid(K, H, release_date_fwd, proc_fwd,
+                                            trans_back_activations,
+                                            memory_capacity, memory_demand,
+                                            release_date_back, proc_bck,
+                                            trans_back_gradients)
+    else:
+        y = fcfs_sol.balanced_greedy(K, H, memory_capacity, memory_demand)
+
+    if np.any(np.sum(y, axis=1) != 1) or np.any(memory_demand @ y > memory_capacity):
+        verbosity.logger.warning('Infeasible FCFS assignment, using the loose time horizon')
+        return loose_horizon(K, H, release_date_fwd, proc_fwd,
+                            proc_local_fwd, trans_back_activations,
+                            release_date_back, proc_bck,
+                            proc_local_back, trans_back_gradients, hybrid)
+
+    T_fwd = np.max(forward_fcfs(release_date_fwd, proc_fwd, y))
+
+    (_, makespan) = fcfs_engine.fcfs(K, y.shape[1], release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                     release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
+    T = makespan - np.min(proc_local_back + np.min(trans_back_gradients, axis=1))
+
+    return (int(np.ceil(T_fwd)), int(np.ceil(max(T, T_fwd))))
+
+
+'''
+Number of binary variables of the time-indexed models: x (and z) are (machines,K,T).
+'''
+def model_size(K, machines, T_fwd, T):
+    ilp = 2*machines*K*T        # x and z of ILP_solver/ILP_hybrid
+    admm = machines*K*T_fwd     # x of the forward subproblem of the ADMM solutions
+    return (ilp, admm)
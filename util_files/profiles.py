@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import hashlib
+import os
+
+
+DEVICES = ('VM', 'laptop', 'd1', 'd2', 'jetson-cpu', 'jetson-gpu')
+cache_dir = '.profile_cache' # created next to the workbooks
+_profiles = {} # the profiles loaded by this process, per (file, modification time, size)
+
+
+'''
+sha256 of the content of a workbook, the key of its cache file.
+'''
+def file_hash(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+'''
+Reads all the sheets of a profiling workbook with a single parse of the file.
+Returns a dictionary sheet -> (layers, columns) float array. The device sheets have
+the forward time in the first column and the backward time in the other two, the
+memory sheet has the activations and the rest of the stored data of each layer.
+'''
+def parse_workbook(filename):
+    sheets = pd.read_excel(io=filename, sheet_name=None, header=None)
+    return {name: df.values.astype(float) for name, df in sheets.items()}
+
+
+'''
+Profile of a workbook: the per-layer data in the form of prefix sums, so that the
+total of any range of layers costs O(1).
+- profile[device] is (layers+1, 2), the forward and backward time of the layers [0,i),
+- profile['store'] is (layers+1), the memory (activations and the rest) of the layers [0,i),
+- profile['activations'] is (layers), the activations of each layer,
+- profile['layers'] is the number of layers.
+The workbook is parsed once: the per-layer data is kept in memory and on disk in
+.profile_cache/<workbook>-<sha256>.npz, so a changed workbook gets a new cache file.
+Set use_cache=False to read the workbook again.
+'''
+def load_profile(filename, use_cache=True):
+    status = os.stat(filename)
+    key = (os.path.abspath(filename), status.st_mtime_ns, status.st_size)
+    if use_cache and key in _profiles:
+        return _profiles[key]
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(filename)), cache_dir)
+    cache_file = os.path.join(directory, f'{os.path.splitext(os.path.basename(filename))[0]}-{file_hash(filename)}.npz')
+
+    if use_cache and os.path.exists(cache_file):
+        with np.load(cache_file) as data:
+            sheets = {name: data[name] for name in data.files}
+    else:
+        sheets = parse_workbook(filename)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            np.savez(cache_file, **sheets)
+        except OSError: # e.g. a read-only folder, the profile is still kept in memory
+            pass
+
+    profile = build_profile(sheets)
+    _profiles[key] = profile
+    return profile
+
+
+'''
+Prefix sums of the sheets of a workbook (see load_profile).
+'''
+def build_profile(sheets):
+    profile = {}
+    for name in DEVICES:
+        if name in sheets:
+            data = sheets[name]
+            per_layer = np.stack((data[:,0], data[:,1] + data[:,2]), axis=1)
+            profile[name] = np.concatenate((np.zeros((1,2)), np.cumsum(per_layer, axis=0)))
+
+    memory = sheets['memory']
+    profile['store'] = np.concatenate(([0], np.cumsum(memory[:,0] + memory[:,1])))
+    profile['activations'] = memory[:,0]
+    profile['layers'] = len(memory)
+    return profile
+
+
+'''
+Forward and backward time of the layers [a,b) on a device (b=None for the last layer).
+'''
+def segment(profile, device, a, b=None):
+    b = profile['layers'] if b is None else b
+    (fwd, bwd) = profile[device][b] - profile[device][a]
+    return (float(fwd), float(bwd))
+
+
+'''
+Memory of the layers [a,b) (b=None for the last layer).
+'''
+def store(profile, a, b=None):
+    b = profile['layers'] if b is None else b
+    return float(profile['store'][b] - profile['store'][a])
+
+
+'''
+Activations transmitted when the model is cut after the first point layers.
+'''
+def activations(profile, point):
+    return float(profile['activations'][point-1])
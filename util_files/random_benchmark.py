@@ -1,20 +1,17 @@
 import numpy as np
 import random
-import utils
+import fcfs_engine
+import verbosity
 
 def check_memory(capacity, load):
     #print(f'mem: {load} {load*memory_demand} {capacity}')
     return ((load) <= capacity)
 
-def run(K, H, release_date_fwd, proc_fwd, 
-            proc_local_fwd, trans_back_activations, 
-            memory_capacity, memory_demand,
-            release_date_back, proc_bck, 
-            proc_local_back, trans_back_gradients, y=[]):
-    
-    # random seed 
-    random.seed(42)
-
+'''
+The client assignment of the benchmark: the clients are visited in a random order and
+each one goes to a random helper among those that fit in memory.
+'''
+def random_assignment(K, H, memory_capacity, memory_demand):
     distribution = [0 for i in range(H)]
     load_ = [0 for i in range(H)]
     y = np.zeros((K,H))
@@ -41,8 +38,22 @@ def run(K, H, release_date_fwd, proc_fwd,
             load_[fit[my_machine]] += memory_demand[i]
             distribution[fit[my_machine]] += 1
 
-        
-    f_temp_slower = utils.fifo(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
+    return y
+
+
+def run(K, H, release_date_fwd, proc_fwd, 
+            proc_local_fwd, trans_back_activations, 
+            memory_capacity, memory_demand,
+            release_date_back, proc_bck, 
+            proc_local_back, trans_back_gradients, y=[]):
+    
+    # random seed 
+    random.seed(42)
+
+    # machine selection
+    y = random_assignment(K, H, memory_capacity, memory_demand)
+
+    (_, f_temp_slower) = fcfs_engine.fcfs(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
          release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
 
     return f_temp_slower
@@ -87,9 +98,8 @@ def run_hybrid(K, H, release_date_fwd, proc_fwd,
             load_[my_machine] += memory_demand[i]
             #distribution[fit[my_machine]] += 1
 
-    print('--------------------- RANDOM ------------------------')
-    print(y)
-    f_temp_slower = utils.fifo(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
+    verbosity.logger.debug('random assignment:\n%s', y)
+    (_, f_temp_slower) = fcfs_engine.fcfs(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
          release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
 
     return f_temp_slower
@@ -144,9 +154,8 @@ def run_hybrid2(K, H, release_date_fwd, proc_fwd,
                 load_[my_machine] += memory_demand[i]
                 #distribution[fit[my_machine]] += 1
 
-    print('--------------------- RANDOM ------------------------')
-    print(y)
-    f_temp_slower = utils.fifo(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
+    verbosity.logger.debug('random assignment:\n%s', y)
+    (_, f_temp_slower) = fcfs_engine.fcfs(K, H+K, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations, 
          release_date_back, proc_bck, proc_local_back, trans_back_gradients, y)
 
     return f_temp_slower
\ No newline at end of file
@@ -0,0 +1,207 @@
+import numpy as np
+
+
+FORWARD = 0
+BACKWARD = 1
+
+
+'''
+A schedule as intervals instead of a dense (H,K,T) array of slots: the row n says that
+the helper helper[n] processes the job of phase phase[n] (FORWARD or BACKWARD) of the
+client client[n] in the slots [start[n], end[n]). A preempted job has one row per
+interval. The dense view is built only on request (see dense), the completion times
+and the last machines come from the intervals (see ends and last_slots).
+'''
+class Schedule:
+    def __init__(self, helper, client, phase, start, end):
+        self.helper = np.asarray(helper, dtype=int)
+        self.client = np.asarray(client, dtype=int)
+        self.phase = np.asarray(phase, dtype=int)
+        self.start = np.asarray(start, dtype=int)
+        self.end = np.asarray(end, dtype=int)
+
+    def __len__(self):
+        return len(self.start)
+
+    '''
+    The memory of the intervals, in bytes.
+    '''
+    @property
+    def nbytes(self):
+        return sum(v.nbytes for v in (self.helper, self.client, self.phase, self.start, self.end))
+
+    '''
+    The intervals of the rows keep, a boolean array or indices.
+    '''
+    def take(self, keep):
+        return Schedule(self.helper[keep], self.client[keep], self.phase[keep], self.start[keep], self.end[keep])
+
+    '''
+    The intervals of one phase.
+    '''
+    def select(self, phase):
+        return self.take(self.phase == phase)
+
+    '''
+    The same intervals with the helpers and the clients renamed: a schedule of one helper
+    (helper 0, clients 0..n-1) becomes the one of the helper helper and of the clients
+    clients (a list of n indices).
+    '''
+    def relabel(self, helper, clients):
+        return Schedule(np.full(len(self), helper), np.asarray(clients, dtype=int)[self.client],
+                        self.phase, self.start, self.end)
+
+    '''
+    The end of the last interval of every client of K in the phase (0 if none), i.e., the
+    end of its job as the f of the models.
+    '''
+    def ends(self, K, phase):
+        keep = (self.phase == phase)
+        f = np.zeros(K, dtype=int)
+        np.maximum.at(f, self.client[keep], self.end[keep])
+        return f
+
+    '''
+    As last_slots() for the dense view of the phase: the end of the last
+    interval of every client of K (-1 if none) and its helper (the first one on ties, 0
+    if none), as two (K) arrays.
+    '''
+    def last_slots(self, K, phase):
+        keep = np.flatnonzero(self.phase == phase)
+        order = keep[np.lexsort((self.helper[keep], -self.end[keep], self.client[keep]))]
+        first = order[np.concatenate(([True], np.diff(self.client[order]) != 0))] if len(order) else order
+        last = np.full(K, -1)
+        machine = np.zeros(K, dtype=int)
+        last[self.client[first]] = self.end[first]
+        machine[self.client[first]] = self.helper[first]
+        return (last, machine)
+
+    '''
+    The (T) boolean array of the slots in which the helper is busy, in any phase.
+    '''
+    def busy(self, T, helper=0):
+        keep = (self.helper == helper)
+        count = np.zeros(T+1, dtype=int)
+        np.add.at(count, np.minimum(self.start[keep], T), 1)
+        np.add.at(count, np.minimum(self.end[keep], T), -1)
+        return np.cumsum(count[:T]) > 0
+
+    '''
+    The dense (H,K,T) view of the phase, with 1 in the slots of every job; T grows to
+    the end of the last interval if it is shorter.
+    '''
+    def dense(self, phase, H, K, T=0):
+        keep = np.flatnonzero(self.phase == phase)
+        T = max(T, int(np.max(self.end[keep], initial=0)))
+        out = np.zeros((H,K,T))
+        lengths = self.end[keep] - self.start[keep]
+        rows = np.repeat(keep, lengths)
+        slots = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths) + self.start[rows]
+        out[self.helper[rows], self.client[rows], slots] = 1
+        return out
+
+
+'''
+The intervals of a dense (H,K,T) array of slots of one phase (e.g., x.X of a model), the
+values being rounded as the solvers return e.g. 0.9999999 for 1.
+'''
+def from_dense(x, phase):
+    busy = np.rint(x) >= 1
+    (H, K, T) = busy.shape
+    padded = np.zeros((H,K,T+2), dtype=np.int8)
+    padded[:,:,1:-1] = busy
+    change = np.diff(padded, axis=2)
+    (helper, client, start) = np.nonzero(change == 1)
+    end = np.nonzero(change == -1)[2]
+    return Schedule(helper, client, np.full(len(start), phase), start, end)
+
+
+'''
+The last slot of every client in a dense (M,K,T) array of x or z values: returns the end
+of the last slot that the client occupies (-1 if none) and the machine of that slot (the
+first one on ties, 0 if none), as two (K) arrays. The values are rounded, as the
+solvers return e.g. 0.9999999 for 1.
+'''
+def last_slots(x):
+    busy = np.rint(x) >= 1
+    (M, K, T) = busy.shape
+    last = np.where(np.any(busy, axis=2), T - np.argmax(busy[:,:,::-1], axis=2), -1) # (M,K)
+    machine = np.argmax(last, axis=0)
+    return (last[machine, np.arange(K)], machine)
+
+
+'''
+The completion times of a schedule on the H helpers, the evaluator of the ADMM: x and z
+are the dense (M,K,T) slots of the forward and of the backward jobs (only the first H
+machines are read), or x is a Schedule of both phases and z is None. A client ends its
+forward job at its last forward slot, on the helper of that slot, and completes after
+its last backward slot plus proc_local_back and trans_back_gradients. In the hybrid
+layout the clients of local (a (K) boolean array, by default the ones without backward
+slots on the helpers) train on their own device H+i and complete at the completion of
+local_completion.
+Returns (cs, cs_back, machine, machine_back, makespan): the completion times of the
+forward jobs and of the whole training, the machines of the last forward and backward
+slots, and the largest completion time.
+'''
+def completion_times(x, z, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                     release_date_back, proc_bck, proc_local_back, trans_back_gradients, hybrid=False, local=None):
+    K = len(proc_local_fwd)
+    own = np.arange(K)
+    if z is None:
+        helpers = x.take(x.helper < H)
+        (f, machine) = helpers.last_slots(K, FORWARD)
+        (f_back, machine_back) = helpers.last_slots(K, BACKWARD)
+    else:
+        (f, machine) = last_slots(x[:H])
+        (f_back, machine_back) = last_slots(z[:H])
+
+    cs = f + proc_local_fwd + trans_back_activations[own, machine]
+    cs_back = f_back + proc_local_back + trans_back_gradients[own, machine_back]
+    if hybrid:
+        local = (f_back == -1) if local is None else np.asarray(local, dtype=bool)
+        C_local = local_completion(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                   release_date_back, proc_bck, proc_local_back, trans_back_gradients)[2]
+        cs_back = np.where(local, C_local, cs_back)
+        machine_back = np.where(local, H + own, machine_back)
+
+    return (cs, cs_back, machine, machine_back, np.max(cs_back))
+
+
+'''
+The clients that train on their own device (the machine H+i of the hybrid layout) in closed
+form, as nothing else runs there: the forward job from release_date_fwd, then proc_local_fwd
+and trans_back_activations, the backward job from release_date_back after them, then
+proc_local_back and trans_back_gradients. These are the earliest slots of the time-indexed
+models, and the completion is the one of the local clients in completion_times.
+Returns (f_fwd, f_back, completion): the end of the forward and of the backward job of
+every client on its device, and its completion time, as (K) arrays.
+'''
+def local_completion(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                     release_date_back, proc_bck, proc_local_back, trans_back_gradients):
+    own = np.arange(len(proc_local_fwd))
+    device = H + own
+    f_fwd = release_date_fwd[own,device] + proc_fwd[own,device]
+    f_back = f_fwd + proc_local_fwd + trans_back_activations[own,device] + release_date_back[own,device] + proc_bck[own,device]
+    return (f_fwd, f_back, f_back + proc_local_back + trans_back_gradients[own,device])
+
+
+'''
+The jobs of every client on its own device (the machine H+i), in the slots of
+local_completion, as intervals of both phases.
+'''
+def local_schedule(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                   release_date_back, proc_bck, proc_local_back, trans_back_gradients):
+    K = len(proc_local_fwd)
+    own = np.arange(K)
+    (f_fwd, f_back, _) = local_completion(H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activations,
+                                          release_date_back, proc_bck, proc_local_back, trans_back_gradients)
+    return Schedule(np.tile(H + own, 2), np.tile(own, 2), np.repeat([FORWARD, BACKWARD], K),
+                    np.concatenate((f_fwd - proc_fwd[own,H+own], f_back - proc_bck[own,H+own])), np.concatenate((f_fwd, f_back)))
+
+
+'''
+One schedule with the intervals of all the schedules.
+'''
+def concat(schedules):
+    return Schedule(*[np.concatenate([getattr(s, name) for s in schedules] + [np.zeros(0, dtype=int)])
+                      for name in ('helper', 'client', 'phase', 'start', 'end')])
@@ -0,0 +1,188 @@
+import numpy as np
+import heapq
+
+import schedule as sched
+
+
+'''
+Preemptive Jackson schedule of K jobs on one machine with T slots: at every slot the
+machine processes, among the released jobs (slot t >= release_date), the one with the
+largest tail (ties go to the earliest release, then to the smallest index). It minimizes
+max(end + tail) over the preemptive schedules (1|r_j,pmtn|Lmax), also when the slots of
+busy (a (T) boolean array, e.g. the forward jobs) are not available, as they are only
+removed from the time line. The schedule changes only at the releases, so there are
+O(K) events of O(log K) each.
+Returns the intervals of the jobs (see schedule.py), of the phase phase on the helper 0.
+'''
+def jackson(release_date, proc, tail, T, busy=None, phase=sched.FORWARD):
+    K = len(proc)
+    free = np.arange(T) if busy is None else np.flatnonzero(~np.asarray(busy, dtype=bool))
+    # the releases in the time line of the free slots
+    release = np.searchsorted(free, np.ceil(release_date)).tolist()
+    left = np.rint(proc).astype(int).tolist()
+    tail = np.asarray(tail).tolist()
+
+    intervals = [] # (client, start, end) in the time line of the free slots
+    order = sorted(range(K), key=lambda i: (release[i], i))
+    heap = [] # (-tail, release, index) of the released jobs
+    (n, t) = (0, 0)
+    while n < K or heap:
+        if not heap: # a big wait
+            t = max(t, release[order[n]])
+        while n < K and release[order[n]] <= t:
+            i = order[n]
+            heapq.heappush(heap, (-tail[i], release[i], i))
+            n += 1
+        (key, r, i) = heapq.heappop(heap)
+        # the job runs until its end or the next release, whichever comes first
+        end = t + left[i] if n == K else min(t + left[i], release[order[n]])
+        if end > len(free):
+            raise ValueError(f'the jobs do not fit in the {len(free)} free slots of the horizon {T}')
+        if intervals and intervals[-1][0] == i and intervals[-1][2] == t: # not preempted at the release
+            intervals[-1] = (i, intervals[-1][1], end)
+        else:
+            intervals.append((i, t, end))
+        left[i] -= end - t
+        t = end
+        if left[i] > 0:
+            heapq.heappush(heap, (key, r, i))
+
+    return to_slots(free, intervals, phase)
+
+
+'''
+The intervals (client, start, end) of the time line of the free slots free (the sorted
+slots that are available) as a schedule of the phase phase on the helper 0: an interval
+is split where the free slots have a gap.
+'''
+def to_slots(free, intervals, phase):
+    gaps = np.flatnonzero(np.diff(free) > 1) + 1
+    (client, start, end) = ([], [], [])
+    for (i, a, b) in intervals:
+        cuts = [a] + gaps[(gaps > a) & (gaps < b)].tolist() + [b]
+        client += [i]*(len(cuts)-1)
+        start += [free[c] for c in cuts[:-1]]
+        end += [free[c-1] + 1 for c in cuts[1:]]
+    return sched.Schedule(np.zeros(len(client)), client, np.full(len(client), phase), start, end)
+
+
+'''
+The (T) occupancy bitmap of the slots of the forward jobs x, intervals or a dense (1,K,T)
+array (longer arrays are cut at T).
+'''
+def occupied(x, T):
+    if isinstance(x, sched.Schedule):
+        return x.busy(T)
+    busy = np.zeros(T, dtype=bool)
+    slots = np.any(np.rint(x[0]) >= 1, axis=0)[:T]
+    busy[:len(slots)] = slots
+    return busy
+
+
+'''
+The forward subproblem of one helper without a solver, a drop-in for feasibility_check of
+ADMM_solution and ADMM_hybrid: the tail of every client is trans_back + proc_local, the
+time after the end of its forward job until its completion. threads is not used.
+Returns the intervals of the forward jobs (see schedule.py), whose dense view is the
+(1,K,T) x of feasibility_check.
+'''
+def forward(K, release_date, proc, proc_local, trans_back, memory_capacity, T, threads=0):
+    return jackson(release_date, proc, np.asarray(trans_back) + proc_local, T)
+
+
+'''
+The backward subproblem of one helper without a solver, a drop-in for
+backward_for_each_machine: the slots of the forward jobs in x, intervals or a dense
+(1,K,T) array, are not available.
+Returns the intervals of the backward jobs.
+'''
+def backward(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x, threads=0):
+    return jackson(release_date, proc, np.asarray(trans_back) + proc_local, T, occupied(x, T), sched.BACKWARD)
+
+
+'''
+Algorithm 2 of the paper, the backward subproblem of one helper by blocks, a drop-in for
+backward_for_each_machine as backward. The slots of x are removed from the time line,
+so that every query for a free slot is a lookup in the occupancy bitmap (or a binary
+search for the releases) instead of a scan of the K clients.
+Step 1 schedules the clients in the order of their release, each one as soon as possible.
+Step 2 splits this schedule in blocks, the runs of slots without idle time. Then, in every
+block with more than one client, step 3 finds the client l with the smallest tail
+(trans_back + proc_local, the ties go to the earliest release, then to the smallest
+index), step 4 schedules the other clients of the block again as soon as possible in the
+order of their release, l taking the slots left, and step 5 repeats this in the
+sub-blocks, the runs of the other clients between the slots of l. The result is an optimal preemptive schedule, as the one of
+Jackson. memory_capacity and threads are not used.
+A client other than l keeps one interval in the time line of the free slots, so a block is
+the list of its clients in the order of their release (and of their start). Only the
+clients after l move, so a rescheduling costs the clients that it moves, not a scan of the
+slots of the block; l gets its final intervals, the gaps between the others.
+Returns the intervals of the backward jobs.
+'''
+def algo2(K, release_date, proc, proc_local, trans_back, memory_capacity, T, x, threads=0):
+    free = np.flatnonzero(~occupied(x, T))
+    release = np.searchsorted(free, np.ceil(release_date))
+    left = np.rint(proc).astype(int)
+    tail = np.asarray(trans_back) + proc_local
+    order = np.lexsort((np.arange(K), release))
+
+    # the interval [start, end) of every client in the time line of the free slots
+    (start, end) = (np.zeros(K, dtype=int), np.zeros(K, dtype=int))
+
+    # step 1: as soon as possible, in the order of the release
+    (start[order], end[order]) = asap(order, release, left, 0)
+    if K > 0 and end[order[-1]] > len(free):
+        raise ValueError(f'the jobs do not fit in the {len(free)} free slots of the horizon {T}')
+
+    # step 2: the blocks
+    intervals = [] # (clients, starts, ends) of the clients that are done
+    blocks = split(order, start, end)
+    while blocks:
+        clients = blocks.pop()
+        if len(clients) == 1: # no need to reschedule
+            intervals.append((clients, start[clients], end[clients]))
+            continue
+        # step 3: the l-client
+        n = np.argmin(tail[clients])
+        (l, a, b) = (clients[n], start[clients[n]], end[clients[-1]])
+        # step 4: reschedule, l in the slots that the others leave; the clients before l
+        # keep their slots, the ones after l move
+        moved = clients[n+1:]
+        (start[moved], end[moved]) = asap(moved, release, left, a)
+        (gap_start, gap_end) = (np.concatenate(([a], end[moved])), np.concatenate((start[moved], [b])))
+        gap = (gap_start < gap_end)
+        intervals.append((np.full(np.sum(gap), l), gap_start[gap], gap_end[gap]))
+        # step 5: the sub-blocks, the ones of the moved clients and the clients before l,
+        # which join the first one if it starts where l started
+        sub_blocks = split(moved, start, end)
+        if n > 0 and sub_blocks and start[moved[0]] == a:
+            sub_blocks[0] = np.concatenate((clients[:n], sub_blocks[0]))
+        elif n > 0:
+            sub_blocks.insert(0, clients[:n])
+        blocks += sub_blocks
+
+    (client, a, b) = [np.concatenate([interval[n] for interval in intervals] + [np.zeros(0, dtype=int)]) for n in range(3)]
+    first = np.argsort(a)
+    return to_slots(free, zip(client[first].tolist(), a[first].tolist(), b[first].tolist()), sched.BACKWARD)
+
+
+'''
+The clients of order one after the other, each one as soon as possible after start and its
+release: the start of the n-th one is the largest release - (work of the ones before) up
+to n, plus that work.
+Returns the starts and the ends of the clients, in the order of order.
+'''
+def asap(order, release, left, start):
+    work = np.cumsum(left[order]) - left[order]
+    starts = np.maximum.accumulate(np.maximum(release[order] - work, start)) + work
+    return (starts, starts + left[order])
+
+
+'''
+The blocks of the clients of order, sorted by their intervals [start, end): a block ends
+where the next client does not start at the end of the previous one.
+Returns the list of the blocks, the arrays of their clients.
+'''
+def split(order, start, end):
+    cuts = np.flatnonzero(start[order[1:]] != end[order[:-1]]) + 1
+    return np.split(order, cuts) if len(order) else []
@@ -4,6 +4,9 @@ import random
 import matplotlib.pyplot as plt
 import math
 
+import profiles
+import verbosity
+
 class bcolors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -32,33 +35,124 @@ def my_net(data,bandwidth):
     
     return delay
 
-def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_laptop = pd.read_excel(io=filename, sheet_name='laptop', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_d2 = pd.read_excel(io=filename, sheet_name='d2', header=None)
-    df_jetson_cpu = pd.read_excel(io=filename, sheet_name='jetson-cpu', header=None)
-    df_jetson_gpu = pd.read_excel(io=filename, sheet_name='jetson-gpu', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+'''
+Network class of each (client, helper) connection, following the Atari stats:
+
+class-0        <= 4 Mbps      --> 30%
+class-1        >4 and <= 10   --> 42%
+class-2        >10 and <= 15  --> 12%
+class-3        > 15 and <= 20 --> 28%
+
+Returns the (K,H) bandwidths.
+Without rng, the connections of each class are drawn one by one from the global random
+(seeded by the caller), retrying the ones already taken, as in the experiments of the paper.
+This costs O((K*H)^2). With a numpy Generator, the same number of connections per class
+comes from one permutation and the bandwidths from one vectorized draw, in O(K*H).
+'''
+def network_classes(K, H, rng=None):
+    network_type = np.zeros((K,H))
+
+    total_connections = K*H
+
+    num_class0 = int((total_connections*30)/100)
+    num_class1 = int((total_connections*42)/100)
+    num_class2 = int((total_connections*12)/100)
+    num_class3 = int((total_connections*28)/100)
+
+    num_class2 += K*H - (num_class0+num_class1+num_class2+num_class3)
+
+    if rng is not None:
+        classes = np.repeat(np.arange(4), [num_class0, num_class1, num_class2, num_class3])
+        low = np.array([1, 5, 11, 16])[classes]
+        high = np.array([4, 10, 15, 20])[classes]
+        bandwidth = np.zeros(total_connections)
+        bandwidth[rng.permutation(total_connections)] = rng.integers(low, high, endpoint=True)
+        return bandwidth.reshape((K,H))
+
+    completed = []
+    for i in range(num_class0):
+        while True:
+            net_line = int(random.randint(0,total_connections-1))
+
+            if not (net_line in completed):
+                break
+
+        completed.append(net_line)
+        network_type[int(net_line/H),int(net_line%H)] = random.randint(1,4)
+
+
+    for i in range(num_class1):
+
+        while True:
+            net_line = int(random.randint(0,total_connections-1))
+
+            if not (net_line in completed):
+                break
+
+        completed.append(net_line)
+        network_type[int(net_line/H),int(net_line%H)] = random.randint(5,10)
+
+    for i in range(num_class2):
+
+        while True:
+            net_line = int(random.randint(0,total_connections-1))
+
+            if not (net_line in completed):
+                break
+
+        completed.append(net_line)
+        network_type[int(net_line/H),int(net_line%H)] = random.randint(11,15)
+
+    for i in range(num_class3):
+
+        while True:
+            net_line = int(random.randint(0,total_connections-1))
+
+            if not (net_line in completed):
+                break
+
+        completed.append(net_line)
+        network_type[int(net_line/H),int(net_line%H)] = random.randint(16,20)
+
+    return network_type
+
+'''
+Converts durations into slots of length slot (a number, or an array that broadcasts).
+rounding is the policy for the durations that are not a whole number of slots:
+- 'ceil': the next slot, so that a task never has less time than it needs (the default),
+- 'round': the closest number of slots,
+- 'stochastic': the next slot with probability equal to the fraction, so that the number
+  of slots is right on average. It draws from rng, a numpy Generator.
+With at_least_one, the durations of 0 slots take 1 (the processing times).
+Returns an int array.
+'''
+def to_slots(values, slot, rounding='ceil', at_least_one=False, rng=None):
+    scaled = np.asarray(values)/slot
+    if rounding == 'ceil':
+        slots = np.ceil(scaled)
+    elif rounding == 'round':
+        slots = np.rint(scaled)
+    elif rounding == 'stochastic':
+        rng = np.random.default_rng() if rng is None else rng
+        slots = np.floor(scaled)
+        slots += rng.random(np.shape(scaled)) < scaled - slots
+    else:
+        raise ValueError(f'unknown rounding policy {rounding}, use ceil, round or stochastic')
+
+    slots = slots.astype(int)
+    if at_least_one:
+        slots = np.where(slots == 0, 1, slots)
+    return slots
+
+def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot, rng=None, rounding='ceil'):
+    profile = profiles.load_profile(filename)
     
 
     # processing time on vms
-    vm_data = df_vm.values.tolist()
-
-    vm_proc_fwd = 0
-    vm_proc_back = 0
-    for i in range(point_a, point_b):
-        vm_proc_fwd += vm_data[i][0]
-        vm_proc_back += vm_data[i][1] + vm_data[i][2]
+    (vm_proc_fwd, vm_proc_back) = profiles.segment(profile, 'VM', point_a, point_b)
 
     # processing time on my laptop
-    laptop_data = df_laptop.values.tolist()
-    
-    laptop_proc_fwd = 0
-    laptop_proc_back = 0
-    for i in range(point_a, point_b):
-        laptop_proc_fwd += laptop_data[i][0]
-        laptop_proc_back += laptop_data[i][1] + laptop_data[i][2]
+    (laptop_proc_fwd, laptop_proc_back) = profiles.segment(profile, 'laptop', point_a, point_b)
 
     max_proc_fwd = int(max([vm_proc_fwd]))
     min_proc_fwd = int(min([vm_proc_fwd]))
@@ -67,68 +161,20 @@ def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
     min_proc_back = int(min([vm_proc_back, laptop_proc_back]))
     
     # processing time on d1
-    d1_data = df_d1.values.tolist()
-    d1_proc_fwd_first = 0
-    d1_proc_fwd_last = 0
-    d1_proc_back_first = 0
-    d1_proc_back_last = 0
-
-
-    for i in range(0, point_a):
-            d1_proc_fwd_first += d1_data[i][0]
-            d1_proc_back_first += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last += d1_data[i][0]
-        d1_proc_back_last += d1_data[i][1] + d1_data[i][2]
+    (d1_proc_fwd_first, d1_proc_back_first) = profiles.segment(profile, 'd1', 0, point_a)
+    (d1_proc_fwd_last, d1_proc_back_last) = profiles.segment(profile, 'd1', point_b)
 
     # processing time on jetson-cpu
-    jetson_cpu_data = df_jetson_cpu.values.tolist()
-
-    jetson_cpu_proc_fwd_first = 0
-    jetson_cpu_proc_fwd_last = 0
-    jetson_cpu_proc_back_first = 0
-    jetson_cpu_proc_back_last = 0
-    
-    for i in range(0, point_a):
-        jetson_cpu_proc_fwd_first += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
+    (jetson_cpu_proc_fwd_first, jetson_cpu_proc_back_first) = profiles.segment(profile, 'jetson-cpu', 0, point_a)
+    (jetson_cpu_proc_fwd_last, jetson_cpu_proc_back_last) = profiles.segment(profile, 'jetson-cpu', point_b)
 
     # processing time on jetson-gpu
-    jetson_gpu_data = df_jetson_gpu.values.tolist()
-
-    jetson_gpu_proc_fwd_first = 0
-    jetson_gpu_proc_fwd_last = 0
-    jetson_gpu_proc_back_first = 0
-    jetson_gpu_proc_back_last = 0
-    for i in range(0, point_a):
-        jetson_gpu_proc_fwd_first += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
+    (jetson_gpu_proc_fwd_first, jetson_gpu_proc_back_first) = profiles.segment(profile, 'jetson-gpu', 0, point_a)
+    (jetson_gpu_proc_fwd_last, jetson_gpu_proc_back_last) = profiles.segment(profile, 'jetson-gpu', point_b)
 
     # processing time on d2
-    d2_data = df_d2.values.tolist()
-
-    d2_proc_fwd_first = 0
-    d2_proc_fwd_last = 0
-    d2_proc_back_first = 0
-    d2_proc_back_last = 0
-    
-
-    for i in range(0, point_a):
-        d2_proc_fwd_first += d2_data[i][0]
-        d2_proc_back_first += d2_data[i][1] + d2_data[i][2]
-
-    for i in range(point_b, len(d2_data)):
-        d2_proc_fwd_last += d2_data[i][0]
-        d2_proc_back_last += d2_data[i][1] + d2_data[i][2]
+    (d2_proc_fwd_first, d2_proc_back_first) = profiles.segment(profile, 'd2', 0, point_a)
+    (d2_proc_fwd_last, d2_proc_back_last) = profiles.segment(profile, 'd2', point_b)
 
     max_fwd_first = int(max([d1_proc_fwd_first, d2_proc_fwd_first, jetson_cpu_proc_fwd_first, jetson_gpu_proc_fwd_first]))
     min_fwd_first = int(min([d1_proc_fwd_first, d2_proc_fwd_first, jetson_cpu_proc_fwd_first, jetson_gpu_proc_fwd_first]))
@@ -141,24 +187,15 @@ def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
 
     max_back_last = int(max([d1_proc_back_last, d2_proc_back_last, jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
     min_back_last = int(min([d1_proc_back_last, d2_proc_back_last, jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
-
-    memory_data = df_memory.values.tolist()
     
     # travel data
-    activations_to_cn = memory_data[point_a-1][0]
-    activations_to_do = memory_data[point_b-1][0]
+    activations_to_cn = profiles.activations(profile, point_a)
+    activations_to_do = profiles.activations(profile, point_b)
 
     # store data
-    store_data_owner = 0
-    for i in range(0, point_a):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
+    store_data_owner = profiles.store(profile, 0, point_a) + profiles.store(profile, point_b)
 
-    store_compute_node = 0
-    for i in range(point_a, point_b):
-        store_compute_node += memory_data[i][0] + memory_data[i][1]
+    store_compute_node = profiles.store(profile, point_a, point_b)
     store_compute_node = (store_compute_node/1024) # prefer MB
 
     my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
@@ -173,75 +210,7 @@ def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
     random.seed(42)
 
     # randomly select the network connections using the Atari stats
-    network_type = np.zeros((K,H))
-
-    '''
-    We consider the following cases:
-
-    class-0        <= 4 Mbps      --> 30%
-    class-1        >4 and <= 10   --> 42%
-    class-2        >10 and <= 15  --> 12%
-    class-3        > 15 and <= 20 --> 28%
-    '''
-
-    class0 = []
-    class1 = []
-    class2 = []
-    class3 = []
-
-    total_connections = K*H
-
-    num_class0 = int((total_connections*30)/100)
-    num_class1 = int((total_connections*42)/100)
-    num_class2 = int((total_connections*12)/100)
-    num_class3 = int((total_connections*28)/100)
-
-    num_class2 += K*H - (num_class0+num_class1+num_class2+num_class3)
-
-    completed = []
-    for i in range(num_class0):
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(1,4)
-
-
-    for i in range(num_class1):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(5,10)
-    
-    for i in range(num_class2):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(11,15)
-    
-    for i in range(num_class3):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(16,20)
+    network_type = network_classes(K, H, rng)
 
     # helper device type 
     # we have:
@@ -402,67 +371,31 @@ def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
     for i in range(H):
         memory_capacity[i] = int(max(memory_demand_))*K
 
-    unique_values = []
-    for j in range(K):
-        for i in range(H):
-            unique_values.append(int(np.rint(release_date[j,i])))
-            unique_values.append(int(np.rint(release_date_back[j,i])))
-
-    for j in range(K):
-        unique_values.append(int(np.rint(proc_local[j])))
-        unique_values.append(int(np.rint(proc_local_back[j])))
-
-
-    for j in range(K):
-        for i in range(H):
-            unique_values.append(int(np.rint(trans_back[j,i])))
-            unique_values.append(int(np.rint(trans_back_gradients[j,i])))
-
-    max_value = max(unique_values)
-    print(max_value)
+    # the longest task (the processing times on the helpers are not counted) takes max_slot slots
+    max_value = int(max(np.max(np.rint(v)) for v in (release_date, release_date_back,
+                                                     proc_local, proc_local_back,
+                                                     trans_back, trans_back_gradients)))
+    verbosity.logger.debug('longest task: %s', max_value)
     # Re-difine parameters as splots
     max_slot_back = max_slot
  
-    for j in range(K):
-        for i in range(H):
-            
-            release_date[j,i] = np.ceil((release_date[j,i]*max_slot)/max_value).astype(int)
-            trans_back[j,i] = np.ceil((trans_back[j,i]*max_slot)/max_value).astype(int)
-            
-            release_date_back[j,i] = np.ceil((release_date_back[j,i]*max_slot)/max_value).astype(int)
-            trans_back_gradients[j,i] = np.ceil((trans_back_gradients[j,i]*max_slot)/max_value).astype(int)
+    release_date = to_slots(release_date*max_slot, max_value, rounding, rng=rng)
+    trans_back = to_slots(trans_back*max_slot, max_value, rounding, rng=rng)
+    
+    release_date_back = to_slots(release_date_back*max_slot, max_value, rounding, rng=rng)
+    trans_back_gradients = to_slots(trans_back_gradients*max_slot, max_value, rounding, rng=rng)
 
-            if i == 0:
-                proc_local[j] = np.ceil((proc_local[j]*max_slot)/max_value).astype(int)
-                proc_local_back[j] = np.ceil((proc_local_back[j]*max_slot)/max_value).astype(int)
+    proc_local = to_slots(proc_local*max_slot, max_value, rounding, rng=rng)
+    proc_local_back = to_slots(proc_local_back*max_slot, max_value, rounding, rng=rng)
 
-            proc[j,i] =  np.ceil((proc[j,i]*max_slot)/max_value).astype(int)
-            
-            if proc[j,i] == 0:
-                    proc[j,i] = 1
-
-            proc_bck[j,i] =  np.ceil((proc_bck[j,i]*max_slot)/max_value).astype(int)
-
-            if proc_bck[j,i] == 0:
-                    proc_bck[j,i] = 1
-
-    print('release date')
-    print(release_date)
-    print('proc')
-    print(proc)
-    print('proc local')
-    print(proc_local)
-    print('trans back')
-    print(trans_back)
-    print('release data back')
-    print(release_date_back)
-    print('proc back')
-    print(proc_bck)
-    print('proc local back')
-    print(proc_local_back)
-    print('trans back')
-    print(trans_back_gradients)
-    print('------')
+    proc = to_slots(proc*max_slot, max_value, rounding, True, rng)
+    proc_bck = to_slots(proc_bck*max_slot, max_value, rounding, True, rng)
+    
+    
+    verbosity.scenario('create_scenario', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
     
     return (release_date, proc, 
     proc_local, trans_back, 
@@ -471,33 +404,16 @@ def create_scenario(filename, point_a, point_b, K, H, scenario, max_slot):
     proc_local_back, trans_back_gradients)
 
 def create_scenario_hybrid_energy(filename, point_a, point_b, K, H, 
-                                 max_slot):
-    
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_laptop = pd.read_excel(io=filename, sheet_name='laptop', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_jetson_cpu = pd.read_excel(io=filename, sheet_name='jetson-cpu', header=None)
-    df_jetson_gpu = pd.read_excel(io=filename, sheet_name='jetson-gpu', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+                                 max_slot, rng=None, rounding='ceil'):
+    
+    profile = profiles.load_profile(filename)
     scenario = 1
     H_prime = H + K
     # processing time on vms
-    vm_data = df_vm.values.tolist()
-
-    vm_proc_fwd = 0
-    vm_proc_back = 0
-    for i in range(point_a, point_b):
-        vm_proc_fwd += vm_data[i][0]
-        vm_proc_back += vm_data[i][1] + vm_data[i][2]
+    (vm_proc_fwd, vm_proc_back) = profiles.segment(profile, 'VM', point_a, point_b)
 
     # processing time on my laptop
-    laptop_data = df_laptop.values.tolist()
-    
-    laptop_proc_fwd = 0
-    laptop_proc_back = 0
-    for i in range(point_a, point_b):
-        laptop_proc_fwd += laptop_data[i][0]
-        laptop_proc_back += laptop_data[i][1] + laptop_data[i][2]
+    (laptop_proc_fwd, laptop_proc_back) = profiles.segment(profile, 'laptop', point_a, point_b)
 
     max_proc_fwd = int(max([vm_proc_fwd, laptop_proc_fwd/100]))
     min_proc_fwd = int(min([vm_proc_fwd, laptop_proc_fwd/100]))
@@ -506,71 +422,19 @@ def create_scenario_hybrid_energy(filename, point_a, point_b, K, H,
     min_proc_back = int(min([vm_proc_back, laptop_proc_back/100]))
     
     # processing time on d1
-    d1_data = df_d1.values.tolist()
-    d1_proc_fwd_first = 0
-    d1_proc_fwd_medium = 0
-    d1_proc_fwd_last = 0
-    d1_proc_back_first = 0
-    d1_proc_back_medium = 0
-    d1_proc_back_last = 0
-
-
-    for i in range(0, point_a):
-            d1_proc_fwd_first += d1_data[i][0]
-            d1_proc_back_first += d1_data[i][1] + d1_data[i][2]
-
-    for i in range(point_a, point_b):
-        d1_proc_fwd_medium += d1_data[i][0]
-        d1_proc_back_medium += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last += d1_data[i][0]
-        d1_proc_back_last += d1_data[i][1] + d1_data[i][2]
+    (d1_proc_fwd_first, d1_proc_back_first) = profiles.segment(profile, 'd1', 0, point_a)
+    (d1_proc_fwd_medium, d1_proc_back_medium) = profiles.segment(profile, 'd1', point_a, point_b)
+    (d1_proc_fwd_last, d1_proc_back_last) = profiles.segment(profile, 'd1', point_b)
 
     # processing time on jetson-cpu
-    jetson_cpu_data = df_jetson_cpu.values.tolist()
-
-    jetson_cpu_proc_fwd_first = 0
-    jetson_cpu_proc_fwd_medium = 0
-    jetson_cpu_proc_fwd_last = 0
-    jetson_cpu_proc_back_first = 0
-    jetson_cpu_proc_back_medium = 0
-    jetson_cpu_proc_back_last = 0
-    
-    for i in range(0, point_a):
-        jetson_cpu_proc_fwd_first += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_a, point_b):
-        jetson_cpu_proc_fwd_medium += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_medium += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    
-    for i in range(point_b, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
+    (jetson_cpu_proc_fwd_first, jetson_cpu_proc_back_first) = profiles.segment(profile, 'jetson-cpu', 0, point_a)
+    (jetson_cpu_proc_fwd_medium, jetson_cpu_proc_back_medium) = profiles.segment(profile, 'jetson-cpu', point_a, point_b)
+    (jetson_cpu_proc_fwd_last, jetson_cpu_proc_back_last) = profiles.segment(profile, 'jetson-cpu', point_b)
 
     # processing time on jetson-gpu
-    jetson_gpu_data = df_jetson_gpu.values.tolist()
-
-    jetson_gpu_proc_fwd_first = 0
-    jetson_gpu_proc_fwd_medium = 0
-    jetson_gpu_proc_fwd_last = 0
-    jetson_gpu_proc_back_first = 0
-    jetson_gpu_proc_back_medium = 0
-    jetson_gpu_proc_back_last = 0
-
-    for i in range(0, point_a):
-        jetson_gpu_proc_fwd_first += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    for i in range(point_a, point_b):
-        jetson_gpu_proc_fwd_medium += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_medium += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
+    (jetson_gpu_proc_fwd_first, jetson_gpu_proc_back_first) = profiles.segment(profile, 'jetson-gpu', 0, point_a)
+    (jetson_gpu_proc_fwd_medium, jetson_gpu_proc_back_medium) = profiles.segment(profile, 'jetson-gpu', point_a, point_b)
+    (jetson_gpu_proc_fwd_last, jetson_gpu_proc_back_last) = profiles.segment(profile, 'jetson-gpu', point_b)
 
 
     max_fwd_first = int(max([d1_proc_fwd_first, jetson_cpu_proc_fwd_first, jetson_gpu_proc_fwd_first]))
@@ -590,26 +454,17 @@ def create_scenario_hybrid_energy(filename, point_a, point_b, K, H,
 
     max_back_last = int(max([d1_proc_back_last, jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
     min_back_last = int(min([d1_proc_back_last,jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
-
-    memory_data = df_memory.values.tolist()
     
     # travel data
-    activations_to_cn = memory_data[point_a-1][0] #ξ1
-    activations_to_do = memory_data[point_b-1][0] #ξ2
+    activations_to_cn = profiles.activations(profile, point_a) #ξ1
+    activations_to_do = profiles.activations(profile, point_b) #ξ2
 
     ksi = (activations_to_cn, activations_to_do)
 
     # store data
-    store_data_owner = 0
-    for i in range(0, point_a):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
+    store_data_owner = profiles.store(profile, 0, point_a) + profiles.store(profile, point_b)
 
-    store_compute_node = 0
-    for i in range(point_a, point_b):
-        store_compute_node += memory_data[i][0] + memory_data[i][1]
+    store_compute_node = profiles.store(profile, point_a, point_b)
     store_compute_node = (store_compute_node/1024) # prefer MB
 
     my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000 # Kbits/sec /1000 to make ms
@@ -830,49 +685,23 @@ def create_scenario_hybrid_energy(filename, point_a, point_b, K, H,
 
     max_slot_back = max_slot #v 2000#r 1500
     max_slot_maxx = max_slot#v 5000# r-4000
-    for j in range(K):
-        for i in range(H_prime):
-            release_date[j,i] = np.ceil(release_date[j,i]/max_slot).astype(int)
-            trans_back[j,i] = np.ceil(trans_back[j,i]/max_slot).astype(int)
-            
-            release_date_back[j,i] = np.ceil(release_date_back[j,i]/max_slot_maxx).astype(int)
-            trans_back_gradients[j,i] = np.ceil(trans_back_gradients[j,i]/max_slot).astype(int)
+    release_date = to_slots(release_date, max_slot, rounding, rng=rng)
+    trans_back = to_slots(trans_back, max_slot, rounding, rng=rng)
 
-            if i == 0:
-                proc_local[j] = np.ceil(proc_local[j]/max_slot).astype(int)
-                proc_local_back[j] = np.ceil(proc_local_back[j]/max_slot_back).astype(int)
+    release_date_back = to_slots(release_date_back, max_slot_maxx, rounding, rng=rng)
+    trans_back_gradients = to_slots(trans_back_gradients, max_slot, rounding, rng=rng)
 
-            
-            proc[j,i] =  np.ceil(proc[j,i]/max_slot).astype(int)
-            
-            if proc[j,i] == 0:
-                proc[j,i] = 1
-
-
-            
-            proc_bck[j,i] =  np.ceil(proc_bck[j,i]/max_slot_back).astype(int)
+    proc_local = to_slots(proc_local, max_slot, rounding, rng=rng)
+    proc_local_back = to_slots(proc_local_back, max_slot_back, rounding, rng=rng)
 
-            if proc_bck[j,i] == 0:
-                proc_bck[j,i] = 1
+    proc = to_slots(proc, max_slot, rounding, rng=rng, at_least_one=True)
+    proc_bck = to_slots(proc_bck, max_slot_back, rounding, rng=rng, at_least_one=True)
     
     
-    print('release date')
-    print(release_date)
-    print('proc')
-    print(proc)
-    print('proc local')
-    print(proc_local)
-    print('trans back')
-    print(trans_back)
-    print('release data back')
-    print(release_date_back)
-    print('proc back')
-    print(proc_bck)
-    print('proc local back')
-    print(proc_local_back)
-    print('trans back')
-    print(trans_back_gradients)
-    print('------')
+    verbosity.scenario('create_scenario_hybrid_energy', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
     
     
     
@@ -884,113 +713,40 @@ def create_scenario_hybrid_energy(filename, point_a, point_b, K, H,
     P_comp, P_transf, P_receive,
     max_slot, network_type, ksi)
 
-def create_scenario_hybrid_energy_exploration(filename, point_a, point_b, K, H, max_slot):
+def create_scenario_hybrid_energy_exploration(filename, point_a, point_b, K, H, max_slot, rng=None, rounding='ceil'):
     
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_laptop = pd.read_excel(io=filename, sheet_name='laptop', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_jetson_cpu = pd.read_excel(io=filename, sheet_name='jetson-cpu', header=None)
-    df_jetson_gpu = pd.read_excel(io=filename, sheet_name='jetson-gpu', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+    profile = profiles.load_profile(filename)
     
     H_prime = H + K
     # processing time on vms
-    vm_data = df_vm.values.tolist()
+    (vm_proc_fwd, vm_proc_back) = profiles.segment(profile, 'VM', point_a, point_b)
 
-    vm_proc_fwd = 0
-    vm_proc_back = 0
-    for i in range(point_a, point_b):
-        vm_proc_fwd += vm_data[i][0]
-        vm_proc_back += vm_data[i][1] + vm_data[i][2]
-
-   
     # processing time on d1
-    d1_data = df_d1.values.tolist()
-    d1_proc_fwd_first = 0
-    d1_proc_fwd_medium = 0
-    d1_proc_fwd_last = 0
-    d1_proc_back_first = 0
-    d1_proc_back_medium = 0
-    d1_proc_back_last = 0
-
-
-    for i in range(0, point_a):
-        d1_proc_fwd_first += d1_data[i][0]
-        d1_proc_back_first += d1_data[i][1] + d1_data[i][2]
-
-    for i in range(point_a, point_b):
-        d1_proc_fwd_medium += d1_data[i][0]
-        d1_proc_back_medium += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last += d1_data[i][0]
-        d1_proc_back_last += d1_data[i][1] + d1_data[i][2]
+    (d1_proc_fwd_first, d1_proc_back_first) = profiles.segment(profile, 'd1', 0, point_a)
+    (d1_proc_fwd_medium, d1_proc_back_medium) = profiles.segment(profile, 'd1', point_a, point_b)
+    (d1_proc_fwd_last, d1_proc_back_last) = profiles.segment(profile, 'd1', point_b)
 
     # processing time on jetson-cpu
-    jetson_cpu_data = df_jetson_cpu.values.tolist()
-
-    jetson_cpu_proc_fwd_first = 0
-    jetson_cpu_proc_fwd_medium = 0
-    jetson_cpu_proc_fwd_last = 0
-    jetson_cpu_proc_back_first = 0
-    jetson_cpu_proc_back_medium = 0
-    jetson_cpu_proc_back_last = 0
-    
-    for i in range(0, point_a):
-        jetson_cpu_proc_fwd_first += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_a, point_b):
-        jetson_cpu_proc_fwd_medium += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_medium += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    
-    for i in range(point_b, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
+    (jetson_cpu_proc_fwd_first, jetson_cpu_proc_back_first) = profiles.segment(profile, 'jetson-cpu', 0, point_a)
+    (jetson_cpu_proc_fwd_medium, jetson_cpu_proc_back_medium) = profiles.segment(profile, 'jetson-cpu', point_a, point_b)
+    (jetson_cpu_proc_fwd_last, jetson_cpu_proc_back_last) = profiles.segment(profile, 'jetson-cpu', point_b)
 
     # processing time on jetson-gpu
-    jetson_gpu_data = df_jetson_gpu.values.tolist()
-
-    jetson_gpu_proc_fwd_first = 0
-    jetson_gpu_proc_fwd_medium = 0
-    jetson_gpu_proc_fwd_last = 0
-    jetson_gpu_proc_back_first = 0
-    jetson_gpu_proc_back_medium = 0
-    jetson_gpu_proc_back_last = 0
-
-    for i in range(0, point_a):
-        jetson_gpu_proc_fwd_first += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    for i in range(point_a, point_b):
-        jetson_gpu_proc_fwd_medium += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_medium += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
+    (jetson_gpu_proc_fwd_first, jetson_gpu_proc_back_first) = profiles.segment(profile, 'jetson-gpu', 0, point_a)
+    (jetson_gpu_proc_fwd_medium, jetson_gpu_proc_back_medium) = profiles.segment(profile, 'jetson-gpu', point_a, point_b)
+    (jetson_gpu_proc_fwd_last, jetson_gpu_proc_back_last) = profiles.segment(profile, 'jetson-gpu', point_b)
 
 
-    memory_data = df_memory.values.tolist()
-    
     # travel data
-    activations_to_cn = memory_data[point_a-1][0] #ξ1
-    activations_to_do = memory_data[point_b-1][0] #ξ2
+    activations_to_cn = profiles.activations(profile, point_a) #ξ1
+    activations_to_do = profiles.activations(profile, point_b) #ξ2
 
     ksi = (activations_to_cn, activations_to_do)
 
     # store data
-    store_data_owner = 0
-    for i in range(0, point_a):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
+    store_data_owner = profiles.store(profile, 0, point_a) + profiles.store(profile, point_b)
 
-    store_compute_node = 0
-    for i in range(point_a, point_b):
-        store_compute_node += memory_data[i][0] + memory_data[i][1]
+    store_compute_node = profiles.store(profile, point_a, point_b)
     store_compute_node = (store_compute_node/1024) # prefer MB
 
     my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
@@ -1134,55 +890,28 @@ def create_scenario_hybrid_energy_exploration(filename, point_a, point_b, K, H,
     max_slot = 500
     max_slot_back = 500 #v 2000#r 1500
     max_slot_maxx = 500#v 5000# r-4000
-    for j in range(K):
-        for i in range(H_prime):
-            release_date[j,i] = np.ceil(release_date[j,i]/max_slot).astype(int)
-            trans_back[j,i] = np.ceil(trans_back[j,i]/max_slot).astype(int)
-            
-            release_date_back[j,i] = np.ceil(release_date_back[j,i]/max_slot_maxx).astype(int)
-            trans_back_gradients[j,i] = np.ceil(trans_back_gradients[j,i]/max_slot).astype(int)
+    release_date = to_slots(release_date, max_slot, rounding, rng=rng)
+    trans_back = to_slots(trans_back, max_slot, rounding, rng=rng)
 
-            if i == 0:
-                proc_local[j] = np.ceil(proc_local[j]/max_slot).astype(int)
-                proc_local_back[j] = np.ceil(proc_local_back[j]/max_slot_back).astype(int)
+    release_date_back = to_slots(release_date_back, max_slot_maxx, rounding, rng=rng)
+    trans_back_gradients = to_slots(trans_back_gradients, max_slot, rounding, rng=rng)
 
-            
-            proc[j,i] =  np.ceil(proc[j,i]/max_slot).astype(int)
-            
-            if proc[j,i] == 0:
-                proc[j,i] = 1
+    proc_local = to_slots(proc_local, max_slot, rounding, rng=rng)
+    proc_local_back = to_slots(proc_local_back, max_slot_back, rounding, rng=rng)
 
-            proc_bck[j,i] =  np.ceil(proc_bck[j,i]/max_slot_back).astype(int)
+    proc = to_slots(proc, max_slot, rounding, rng=rng, at_least_one=True)
+    proc_bck = to_slots(proc_bck, max_slot_back, rounding, rng=rng, at_least_one=True)
 
-            if proc_bck[j,i] == 0:
-                proc_bck[j,i] = 1
-            
-            if i == 0:
-                proc[j,i] *= 2
-                proc_bck[j,i] *= 2
-            
-            if i >= 2 and i < H+3:
-                proc[j,i] *= 2
-                proc_bck[j,i] *= 2
-    
-    
-    print('release date')
-    print(release_date)
-    print('proc')
-    print(proc)
-    print('proc local')
-    print(proc_local)
-    print('trans back')
-    print(trans_back)
-    print('release data back')
-    print(release_date_back)
-    print('proc back')
-    print(proc_bck)
-    print('proc local back')
-    print(proc_local_back)
-    print('trans back')
-    print(trans_back_gradients)
-    print('------')
+    proc[:,0] *= 2
+    proc_bck[:,0] *= 2
+    proc[:,2:H+3] *= 2
+    proc_bck[:,2:H+3] *= 2
+    
+    
+    verbosity.scenario('create_scenario_hybrid_energy_exploration', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
 
     
     
@@ -1195,32 +924,15 @@ def create_scenario_hybrid_energy_exploration(filename, point_a, point_b, K, H,
     max_slot, network_type, ksi)
 
 def create_scenario_hybrid(filename, point_a, point_b, K, H, 
-                                 max_slot, scenario):
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_laptop = pd.read_excel(io=filename, sheet_name='laptop', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_jetson_cpu = pd.read_excel(io=filename, sheet_name='jetson-cpu', header=None)
-    df_jetson_gpu = pd.read_excel(io=filename, sheet_name='jetson-gpu', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+                                 max_slot, scenario, rng=None, rounding='ceil'):
+    profile = profiles.load_profile(filename)
     
     H_prime = H + K
     # processing time on vms
-    vm_data = df_vm.values.tolist()
-
-    vm_proc_fwd = 0
-    vm_proc_back = 0
-    for i in range(point_a, point_b):
-        vm_proc_fwd += vm_data[i][0]
-        vm_proc_back += vm_data[i][1] + vm_data[i][2]
+    (vm_proc_fwd, vm_proc_back) = profiles.segment(profile, 'VM', point_a, point_b)
 
     # processing time on my laptop
-    laptop_data = df_laptop.values.tolist()
-    
-    laptop_proc_fwd = 0
-    laptop_proc_back = 0
-    for i in range(point_a, point_b):
-        laptop_proc_fwd += laptop_data[i][0]
-        laptop_proc_back += laptop_data[i][1] + laptop_data[i][2]
+    (laptop_proc_fwd, laptop_proc_back) = profiles.segment(profile, 'laptop', point_a, point_b)
 
     max_proc_fwd = int(max([vm_proc_fwd]))
     min_proc_fwd = int(min([vm_proc_fwd]))
@@ -1229,71 +941,19 @@ def create_scenario_hybrid(filename, point_a, point_b, K, H,
     min_proc_back = int(min([vm_proc_back]))
     
     # processing time on d1
-    d1_data = df_d1.values.tolist()
-    d1_proc_fwd_first = 0
-    d1_proc_fwd_medium = 0
-    d1_proc_fwd_last = 0
-    d1_proc_back_first = 0
-    d1_proc_back_medium = 0
-    d1_proc_back_last = 0
-
-
-    for i in range(0, point_a):
-        d1_proc_fwd_first += d1_data[i][0]
-        d1_proc_back_first += d1_data[i][1] + d1_data[i][2]
-
-    for i in range(point_a, point_b):
-        d1_proc_fwd_medium += d1_data[i][0]
-        d1_proc_back_medium += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last += d1_data[i][0]
-        d1_proc_back_last += d1_data[i][1] + d1_data[i][2]
+    (d1_proc_fwd_first, d1_proc_back_first) = profiles.segment(profile, 'd1', 0, point_a)
+    (d1_proc_fwd_medium, d1_proc_back_medium) = profiles.segment(profile, 'd1', point_a, point_b)
+    (d1_proc_fwd_last, d1_proc_back_last) = profiles.segment(profile, 'd1', point_b)
 
     # processing time on jetson-cpu
-    jetson_cpu_data = df_jetson_cpu.values.tolist()
-
-    jetson_cpu_proc_fwd_first = 0
-    jetson_cpu_proc_fwd_medium = 0
-    jetson_cpu_proc_fwd_last = 0
-    jetson_cpu_proc_back_first = 0
-    jetson_cpu_proc_back_medium = 0
-    jetson_cpu_proc_back_last = 0
-    
-    for i in range(0, point_a):
-        jetson_cpu_proc_fwd_first += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_a, point_b):
-        jetson_cpu_proc_fwd_medium += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_medium += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    
-    for i in range(point_b, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
+    (jetson_cpu_proc_fwd_first, jetson_cpu_proc_back_first) = profiles.segment(profile, 'jetson-cpu', 0, point_a)
+    (jetson_cpu_proc_fwd_medium, jetson_cpu_proc_back_medium) = profiles.segment(profile, 'jetson-cpu', point_a, point_b)
+    (jetson_cpu_proc_fwd_last, jetson_cpu_proc_back_last) = profiles.segment(profile, 'jetson-cpu', point_b)
 
     # processing time on jetson-gpu
-    jetson_gpu_data = df_jetson_gpu.values.tolist()
-
-    jetson_gpu_proc_fwd_first = 0
-    jetson_gpu_proc_fwd_medium = 0
-    jetson_gpu_proc_fwd_last = 0
-    jetson_gpu_proc_back_first = 0
-    jetson_gpu_proc_back_medium = 0
-    jetson_gpu_proc_back_last = 0
-
-    for i in range(0, point_a):
-        jetson_gpu_proc_fwd_first += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    for i in range(point_a, point_b):
-        jetson_gpu_proc_fwd_medium += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_medium += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
+    (jetson_gpu_proc_fwd_first, jetson_gpu_proc_back_first) = profiles.segment(profile, 'jetson-gpu', 0, point_a)
+    (jetson_gpu_proc_fwd_medium, jetson_gpu_proc_back_medium) = profiles.segment(profile, 'jetson-gpu', point_a, point_b)
+    (jetson_gpu_proc_fwd_last, jetson_gpu_proc_back_last) = profiles.segment(profile, 'jetson-gpu', point_b)
 
 
     max_fwd_first = int(max([d1_proc_fwd_first, jetson_cpu_proc_fwd_first, jetson_gpu_proc_fwd_first]))
@@ -1313,24 +973,15 @@ def create_scenario_hybrid(filename, point_a, point_b, K, H,
 
     max_back_last = int(max([d1_proc_back_last, jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
     min_back_last = int(min([d1_proc_back_last,jetson_cpu_proc_back_first, jetson_gpu_proc_back_last]))
-
-    memory_data = df_memory.values.tolist()
     
     # travel data
-    activations_to_cn = memory_data[point_a-1][0]
-    activations_to_do = memory_data[point_b-1][0]
+    activations_to_cn = profiles.activations(profile, point_a)
+    activations_to_do = profiles.activations(profile, point_b)
 
     # store data
-    store_data_owner = 0
-    for i in range(0, point_a):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
+    store_data_owner = profiles.store(profile, 0, point_a) + profiles.store(profile, point_b)
 
-    store_compute_node = 0
-    for i in range(point_a, point_b):
-        store_compute_node += memory_data[i][0] + memory_data[i][1]
+    store_compute_node = profiles.store(profile, point_a, point_b)
     store_compute_node = (store_compute_node/1024) # prefer MB
 
     my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
@@ -1345,75 +996,7 @@ def create_scenario_hybrid(filename, point_a, point_b, K, H,
     random.seed(42)
 
     # randomly select the network connections using the Atari stats
-    network_type = np.zeros((K,H))
-
-    '''
-    We consider the following cases:
-
-    class-0        <= 4 Mbps      --> 30%
-    class-1        >4 and <= 10   --> 42%
-    class-2        >10 and <= 15  --> 12%
-    class-3        > 15 and <= 20 --> 28%
-    '''
-
-    class0 = []
-    class1 = []
-    class2 = []
-    class3 = []
-
-    total_connections = K*H
-
-    num_class0 = int((total_connections*30)/100)
-    num_class1 = int((total_connections*42)/100)
-    num_class2 = int((total_connections*12)/100)
-    num_class3 = int((total_connections*28)/100)
-
-    num_class2 += K*H - (num_class0+num_class1+num_class2+num_class3)
-
-    completed = []
-    for i in range(num_class0):
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(1,4)
-
-
-    for i in range(num_class1):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(5,10)
-    
-    for i in range(num_class2):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(11,15)
-    
-    for i in range(num_class3):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(16,20)
+    network_type = network_classes(K, H, rng)
 
     # if H == 10:
     #     for i in range(2):
@@ -1642,85 +1225,38 @@ def create_scenario_hybrid(filename, point_a, point_b, K, H,
     
     max_slot_back = max_slot #v 2000#r 1500
     max_slot_maxx = max_slot#v 5000# r-4000
-    for j in range(K):
-        for i in range(H_prime):
-            if i < H:
-                release_date[0][j,i] = np.ceil(release_date[0][j,i]/max_slot).astype(int)
-                trans_back[0][j,i] = np.ceil(trans_back[0][j,i]/max_slot).astype(int)
-                
-                release_date_back[0][j,i] = np.ceil(release_date_back[0][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[0][j,i] = np.ceil(trans_back_gradients[0][j,i]/max_slot).astype(int)
-            
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
-            else:
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
-
-            if i == 0:
-                proc_local[0][j] = np.ceil(proc_local[0][j]/max_slot).astype(int)
-                proc_local_back[0][j] = np.ceil(proc_local_back[0][j]/max_slot_back).astype(int)
-
-                proc_local[1][j] = np.ceil(proc_local[1][j]/max_slot).astype(int)
-                proc_local_back[1][j] = np.ceil(proc_local_back[1][j]/max_slot_back).astype(int)
-
-            if i < H:
-                proc[0][j,i] =  np.ceil(proc[0][j,i]/max_slot).astype(int)
-            
-                if proc[0][j,i] == 0:
-                        proc[0][j,i] = 1
+    # the hybrid layout is quantized once and the original one takes its helper columns, so
+    # that both have the same slots also with the stochastic rounding (as in
+    # cut_points.create_scenarios_hybrid); only the release dates of scenario 2, where the
+    # original layout also holds the first layers of the clients, are quantized on their own
+    if scenario == 2:
+        release_date[0] = to_slots(release_date[0], max_slot, rounding, rng=rng)
+        release_date_back[0] = to_slots(release_date_back[0], max_slot_maxx, rounding, rng=rng)
+    release_date[1] = to_slots(release_date[1], max_slot, rounding, rng=rng)
+    trans_back[1] = to_slots(trans_back[1], max_slot, rounding, rng=rng)
 
-                proc_bck[0][j,i] =  np.ceil(proc_bck[0][j,i]/max_slot_back).astype(int)
-                if proc_bck[0][j,i] == 0:
-                        proc_bck[0][j,i] = 1
+    release_date_back[1] = to_slots(release_date_back[1], max_slot_maxx, rounding, rng=rng)
+    trans_back_gradients[1] = to_slots(trans_back_gradients[1], max_slot, rounding, rng=rng)
 
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-            
-                if proc[1][j,i] == 0:
-                        proc[1][j,i] = 1
-
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                        proc_bck[1][j,i] = 1
-            else:
-                
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-                
-                if proc[1][j,i] == 0:
-                   proc[1][j,i] = 1
+    proc_local[1] = to_slots(proc_local[1], max_slot, rounding, rng=rng)
+    proc_local_back[1] = to_slots(proc_local_back[1], max_slot_back, rounding, rng=rng)
 
+    proc[1] = to_slots(proc[1], max_slot, rounding, rng=rng, at_least_one=True)
+    proc_bck[1] = to_slots(proc_bck[1], max_slot_back, rounding, rng=rng, at_least_one=True)
 
-                
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                    proc_bck[1][j,i] = 1
+    helpers = [trans_back, trans_back_gradients, proc, proc_bck]
+    if scenario != 2:
+        helpers += [release_date, release_date_back]
+    for v in helpers:
+        v[0] = v[1][:,:H].copy()
+    for v in (proc_local, proc_local_back): # the client vectors
+        v[0] = v[1].copy()
     
     
-    print('release date')
-    print(release_date[1])
-    print('proc')
-    print(proc[1])
-    print('proc local')
-    print(proc_local[1])
-    print('trans back')
-    print(trans_back[1])
-    print('release data back')
-    print(release_date_back[1])
-    print('proc back')
-    print(proc_bck[1])
-    print('proc local back')
-    print(proc_local_back[1])
-    print('trans back')
-    print(trans_back_gradients[1])
-    print('------')
+    verbosity.scenario('create_scenario_hybrid', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
 
     
     
@@ -1732,16 +1268,9 @@ def create_scenario_hybrid(filename, point_a, point_b, K, H,
 
 def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H, 
                                  max_slot, scenario):
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_laptop = pd.read_excel(io=filename, sheet_name='laptop', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_jetson_cpu = pd.read_excel(io=filename, sheet_name='jetson-cpu', header=None)
-    df_jetson_gpu = pd.read_excel(io=filename, sheet_name='jetson-gpu', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+    profile = profiles.load_profile(filename)
     
     H_prime = H + K
-    # processing time on vms
-    vm_data = df_vm.values.tolist()
 
     point_a = 2
     point_b = 20
@@ -1749,40 +1278,20 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
     point_a_2 = 2
     point_b_2 = 5
 
+    cuts = [(point_a, point_b), (point_a_2, point_b_2)]
 
-    vm_proc_fwd = [0, 0]
-    vm_proc_back = [0, 0]
-
-    for i in range(point_a, point_b):
-        vm_proc_fwd[0] += vm_data[i][0] + max_slot
-        vm_proc_back[0] += vm_data[i][1] + vm_data[i][2] + max_slot
-
-    for i in range(point_a_2, point_b_2):
-        vm_proc_fwd[1] += vm_data[i][0]
-        vm_proc_back[1] += vm_data[i][1] + vm_data[i][2]
+    # processing time on vms
+    vm_proc = [profiles.segment(profile, 'VM', a, b) for (a, b) in cuts]
+    vm_proc_fwd = [vm_proc[0][0] + (point_b - point_a)*max_slot, vm_proc[1][0]]
+    vm_proc_back = [vm_proc[0][1] + (point_b - point_a)*max_slot, vm_proc[1][1]]
 
-    print('~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~')
-    print(f'{vm_proc_fwd[0]} {vm_proc_fwd[1]}')
-    print(f'{vm_proc_back[0]} {vm_proc_back[1]}')
-    print('~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~')
+    verbosity.logger.debug('%s forward %s %s, backward %s %s', 'vm', *vm_proc_fwd, *vm_proc_back)
     # processing time on my laptop
-    laptop_data = df_laptop.values.tolist()
-    
-    laptop_proc_fwd = [0, 0]
-    laptop_proc_back = [0, 0]
-
-    for i in range(point_a, point_b):
-        laptop_proc_fwd[0] += laptop_data[i][0]
-        laptop_proc_back[0] += laptop_data[i][1] + laptop_data[i][2]
-
-    for i in range(point_a_2, point_b_2):
-        laptop_proc_fwd[1] += laptop_data[i][0]
-        laptop_proc_back[1] += laptop_data[i][1] + laptop_data[i][2]
+    laptop_proc = [profiles.segment(profile, 'laptop', a, b) for (a, b) in cuts]
+    laptop_proc_fwd = [fwd for (fwd, bwd) in laptop_proc]
+    laptop_proc_back = [bwd for (fwd, bwd) in laptop_proc]
 
-    print('~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~')
-    print(f'{laptop_proc_fwd[0]} {laptop_proc_fwd[1]}')
-    print(f'{laptop_proc_back[0]} {laptop_proc_back[1]}')
-    print('~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~')
+    verbosity.logger.debug('%s forward %s %s, backward %s %s', 'laptop', *laptop_proc_fwd, *laptop_proc_back)
 
     max_proc_fwd = [int(max([vm_proc_fwd[0], laptop_proc_fwd[0]])), int(max([vm_proc_fwd[1], laptop_proc_fwd[1]]))]
     min_proc_fwd = [int(min([vm_proc_fwd[0], laptop_proc_fwd[0]])), int(min([vm_proc_fwd[1], laptop_proc_fwd[1]]))]
@@ -1790,112 +1299,28 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
     max_proc_back = [int(max([vm_proc_back[0], laptop_proc_back[0]])), int(max([vm_proc_back[1], laptop_proc_back[1]]))]
     min_proc_back = [int(min([vm_proc_back[0], laptop_proc_back[0]])), int(min([vm_proc_back[1], laptop_proc_back[1]]))]
     
-    # processing time on d1
-    d1_data = df_d1.values.tolist()
-    d1_proc_fwd_first = [0, 0]
-    d1_proc_fwd_medium = [0, 0]
-    d1_proc_fwd_last = [0, 0]
-    d1_proc_back_first = [0, 0]
-    d1_proc_back_medium = [0, 0]
-    d1_proc_back_last = [0, 0]
-
-
-    for i in range(0, point_a):
-        d1_proc_fwd_first[0] += d1_data[i][0]
-        d1_proc_back_first[0] += d1_data[i][1] + d1_data[i][2]
-
-    for i in range(point_a, point_b):
-        d1_proc_fwd_medium[0] += d1_data[i][0]
-        d1_proc_back_medium[0] += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last[0] += d1_data[i][0]
-        d1_proc_back_last[0] += d1_data[i][1] + d1_data[i][2]
-
-    # second split d1
-    for i in range(0, point_a_2):
-        d1_proc_fwd_first[1] += d1_data[i][0]
-        d1_proc_back_first[1] += d1_data[i][1] + d1_data[i][2]
-
-    for i in range(point_a_2, point_b_2):
-        d1_proc_fwd_medium[1] += d1_data[i][0]
-        d1_proc_back_medium[1] += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b_2, len(d1_data)):
-        d1_proc_fwd_last[1] += d1_data[i][0]
-        d1_proc_back_last[1] += d1_data[i][1] + d1_data[i][2]
-
-    # processing time on jetson-cpu
-    jetson_cpu_data = df_jetson_cpu.values.tolist()
-
-    jetson_cpu_proc_fwd_first = [0, 0]
-    jetson_cpu_proc_fwd_medium = [0, 0]
-    jetson_cpu_proc_fwd_last = [0, 0]
-    jetson_cpu_proc_back_first = [0, 0]
-    jetson_cpu_proc_back_medium = [0, 0]
-    jetson_cpu_proc_back_last = [0, 0]
-    
-    for i in range(0, point_a):
-        jetson_cpu_proc_fwd_first[0] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first[0] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_a, point_b):
-        jetson_cpu_proc_fwd_medium[0] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_medium[0] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    
-    for i in range(point_b, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last[0] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last[0] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    # second cut
-    for i in range(0, point_a_2):
-        jetson_cpu_proc_fwd_first[1] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_first[1] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-    
-    for i in range(point_a_2, point_b_2):
-        jetson_cpu_proc_fwd_medium[1] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_medium[1] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    
-    for i in range(point_b_2, len(jetson_cpu_data)):
-        jetson_cpu_proc_fwd_last[1] += jetson_cpu_data[i][0]
-        jetson_cpu_proc_back_last[1] += jetson_cpu_data[i][1] + jetson_cpu_data[i][2]
-
-    # processing time on jetson-gpu
-    jetson_gpu_data = df_jetson_gpu.values.tolist()
-
-    jetson_gpu_proc_fwd_first = [0, 0]
-    jetson_gpu_proc_fwd_medium = [0, 0]
-    jetson_gpu_proc_fwd_last = [0, 0]
-    jetson_gpu_proc_back_first = [0, 0]
-    jetson_gpu_proc_back_medium = [0, 0]
-    jetson_gpu_proc_back_last = [0, 0]
-
-    for i in range(0, point_a):
-        jetson_gpu_proc_fwd_first[0] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first[0] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    for i in range(point_a, point_b):
-        jetson_gpu_proc_fwd_medium[0] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_medium[0] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last[0] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last[0] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    # second cut
-    for i in range(0, point_a_2):
-        jetson_gpu_proc_fwd_first[1] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_first[1] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-
-    for i in range(point_a_2, point_b_2):
-        jetson_gpu_proc_fwd_medium[1] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_medium[1] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
-    
-    for i in range(point_b_2, len(jetson_gpu_data)):
-        jetson_gpu_proc_fwd_last[1] += jetson_gpu_data[i][0]
-        jetson_gpu_proc_back_last[1] += jetson_gpu_data[i][1] + jetson_gpu_data[i][2]
+    # processing time on d1, jetson-cpu and jetson-gpu, for both cuts
+    # (the layers before the first point, between the two and after the second)
+    d1_first = [profiles.segment(profile, 'd1', 0, a) for (a, b) in cuts]
+    d1_medium = [profiles.segment(profile, 'd1', a, b) for (a, b) in cuts]
+    d1_last = [profiles.segment(profile, 'd1', b) for (a, b) in cuts]
+    (d1_proc_fwd_first, d1_proc_back_first) = [list(v) for v in zip(*d1_first)]
+    (d1_proc_fwd_medium, d1_proc_back_medium) = [list(v) for v in zip(*d1_medium)]
+    (d1_proc_fwd_last, d1_proc_back_last) = [list(v) for v in zip(*d1_last)]
+
+    jetson_cpu_first = [profiles.segment(profile, 'jetson-cpu', 0, a) for (a, b) in cuts]
+    jetson_cpu_medium = [profiles.segment(profile, 'jetson-cpu', a, b) for (a, b) in cuts]
+    jetson_cpu_last = [profiles.segment(profile, 'jetson-cpu', b) for (a, b) in cuts]
+    (jetson_cpu_proc_fwd_first, jetson_cpu_proc_back_first) = [list(v) for v in zip(*jetson_cpu_first)]
+    (jetson_cpu_proc_fwd_medium, jetson_cpu_proc_back_medium) = [list(v) for v in zip(*jetson_cpu_medium)]
+    (jetson_cpu_proc_fwd_last, jetson_cpu_proc_back_last) = [list(v) for v in zip(*jetson_cpu_last)]
+
+    jetson_gpu_first = [profiles.segment(profile, 'jetson-gpu', 0, a) for (a, b) in cuts]
+    jetson_gpu_medium = [profiles.segment(profile, 'jetson-gpu', a, b) for (a, b) in cuts]
+    jetson_gpu_last = [profiles.segment(profile, 'jetson-gpu', b) for (a, b) in cuts]
+    (jetson_gpu_proc_fwd_first, jetson_gpu_proc_back_first) = [list(v) for v in zip(*jetson_gpu_first)]
+    (jetson_gpu_proc_fwd_medium, jetson_gpu_proc_back_medium) = [list(v) for v in zip(*jetson_gpu_medium)]
+    (jetson_gpu_proc_fwd_last, jetson_gpu_proc_back_last) = [list(v) for v in zip(*jetson_gpu_last)]
 
     max_fwd_first = [int(max([d1_proc_fwd_first[0], jetson_gpu_proc_fwd_first[0]])), int(max([d1_proc_fwd_first[1], jetson_gpu_proc_fwd_first[1]]))]
     min_fwd_first = [int(min([d1_proc_fwd_first[0], jetson_gpu_proc_fwd_first[0]])), int(min([d1_proc_fwd_first[1], jetson_gpu_proc_fwd_first[1]]))]
@@ -1914,37 +1339,15 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
 
     max_back_last = [int(max([d1_proc_back_last[0], jetson_gpu_proc_back_last[0]])), int(max([d1_proc_back_last[1], jetson_gpu_proc_back_last[1]]))]
     min_back_last = [int(min([d1_proc_back_last[0], jetson_gpu_proc_back_last[0]])), int(min([d1_proc_back_last[1], jetson_gpu_proc_back_last[1]]))]
-
-    memory_data = df_memory.values.tolist()
     
     # travel data
-    activations_to_cn = [memory_data[point_a-1][0], memory_data[point_a_2-1][0]]
-    activations_to_do = [memory_data[point_b-1][0], memory_data[point_b_2-1][0]]
+    activations_to_cn = [profiles.activations(profile, a) for (a, b) in cuts]
+    activations_to_do = [profiles.activations(profile, b) for (a, b) in cuts]
 
     # store data
-    store_data_owner = [0, 0]
-    for i in range(0, point_a):
-        store_data_owner[0] += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner[0] += memory_data[i][0] + memory_data[i][1]
-
-    # second cut
-    for i in range(0, point_a_2):
-        store_data_owner[1] += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b_2, len(d1_data)):
-        store_data_owner[1] += memory_data[i][0] + memory_data[i][1]
-
-
-    store_compute_node = [0, 0]
-    for i in range(point_a, point_b):
-        store_compute_node[0] += memory_data[i][0] + memory_data[i][1]
-    store_compute_node[0] = (store_compute_node[0]/1024) # prefer MB
+    store_data_owner = [profiles.store(profile, 0, a) + profiles.store(profile, b) for (a, b) in cuts]
 
-    for i in range(point_a_2, point_b_2):
-        store_compute_node[1] += memory_data[i][0] + memory_data[i][1]
-    store_compute_node[1] = (store_compute_node[1]/1024) # prefer MB
+    store_compute_node = [profiles.store(profile, a, b)/1024 for (a, b) in cuts] # prefer MB
 
 
     my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
@@ -1959,75 +1362,7 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
     random.seed(42)
 
     # randomly select the network connections using the Atari stats
-    network_type = np.zeros((K,H))
-
-    '''
-    We consider the following cases:
-
-    class-0        <= 4 Mbps      --> 30%
-    class-1        >4 and <= 10   --> 42%
-    class-2        >10 and <= 15  --> 12%
-    class-3        > 15 and <= 20 --> 28%
-    '''
-
-    class0 = []
-    class1 = []
-    class2 = []
-    class3 = []
-
-    total_connections = K*H
-
-    num_class0 = int((total_connections*30)/100)
-    num_class1 = int((total_connections*42)/100)
-    num_class2 = int((total_connections*12)/100)
-    num_class3 = int((total_connections*28)/100)
-
-    num_class2 += K*H - (num_class0+num_class1+num_class2+num_class3)
-
-    completed = []
-    for i in range(num_class0):
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(1,4)
-
-
-    for i in range(num_class1):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(5,10)
-    
-    for i in range(num_class2):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(11,15)
-    
-    for i in range(num_class3):
-        
-        while True:
-            net_line = int(random.randint(0,total_connections-1))
-
-            if not (net_line in completed):
-                break
-        
-        completed.append(net_line)
-        network_type[int(net_line/H),int(net_line%H)] = random.randint(16,20)    
+    network_type = network_classes(K, H)
 
     # helper device type 
     # we have:
@@ -2190,85 +1525,24 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
 
     max_slot_back = max_slot #v 2000#r 1500
     max_slot_maxx = max_slot#v 5000# r-4000
-    for j in range(K):
-        for i in range(H_prime):
-            if i < H:
-                release_date[0][j,i] = np.ceil(release_date[0][j,i]/max_slot).astype(int)
-                trans_back[0][j,i] = np.ceil(trans_back[0][j,i]/max_slot).astype(int)
-                
-                release_date_back[0][j,i] = np.ceil(release_date_back[0][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[0][j,i] = np.ceil(trans_back_gradients[0][j,i]/max_slot).astype(int)
-            
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
-            else:
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
-
-            if i == 0:
-                proc_local[0][j] = np.ceil(proc_local[0][j]/max_slot).astype(int)
-                proc_local_back[0][j] = np.ceil(proc_local_back[0][j]/max_slot_back).astype(int)
-
-                proc_local[1][j] = np.ceil(proc_local[1][j]/max_slot).astype(int)
-                proc_local_back[1][j] = np.ceil(proc_local_back[1][j]/max_slot_back).astype(int)
-
-            if i < H:
-                proc[0][j,i] =  np.ceil(proc[0][j,i]/max_slot).astype(int)
-            
-                if proc[0][j,i] == 0:
-                        proc[0][j,i] = 1
+    for k in range(2): # the original and the hybrid layout
+        release_date[k] = to_slots(release_date[k], max_slot)
+        trans_back[k] = to_slots(trans_back[k], max_slot)
 
-                proc_bck[0][j,i] =  np.ceil(proc_bck[0][j,i]/max_slot_back).astype(int)
-                if proc_bck[0][j,i] == 0:
-                        proc_bck[0][j,i] = 1
-
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-            
-                if proc[1][j,i] == 0:
-                        proc[1][j,i] = 1
-
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                        proc_bck[1][j,i] = 1
-            else:
-                
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-                
-                if proc[1][j,i] == 0:
-                   proc[1][j,i] = 1
+        release_date_back[k] = to_slots(release_date_back[k], max_slot_maxx)
+        trans_back_gradients[k] = to_slots(trans_back_gradients[k], max_slot)
 
+        proc_local[k] = to_slots(proc_local[k], max_slot)
+        proc_local_back[k] = to_slots(proc_local_back[k], max_slot_back)
 
-                
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                    proc_bck[1][j,i] = 1
+        proc[k] = to_slots(proc[k], max_slot, at_least_one=True)
+        proc_bck[k] = to_slots(proc_bck[k], max_slot_back, at_least_one=True)
     
     
-    print('release date')
-    print(release_date[1])
-    print('proc')
-    print(proc[1])
-    print('proc local')
-    print(proc_local[1])
-    print('trans back')
-    print(trans_back[1])
-    print('release data back')
-    print(release_date_back[1])
-    print('proc back')
-    print(proc_bck[1])
-    print('proc local back')
-    print(proc_local_back[1])
-    print('trans back')
-    print(trans_back_gradients[1])
-    print('------')
+    verbosity.scenario('create_scenario_hybrid_scenario2', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
 
     
     
@@ -2281,58 +1555,27 @@ def create_scenario_hybrid_scenario2(filename, point_a, point_b, K, H,
 def create_scenario_hybrid_typeA(filename, point_a, point_b, K, H, 
                                  max_slot, slow_client, slow_networks):
     
-    df_vm = pd.read_excel(io=filename, sheet_name='VM', header=None)
-    df_d1 = pd.read_excel(io=filename, sheet_name='d1', header=None)
-    df_memory = pd.read_excel(io=filename, sheet_name='memory', header=None)
+    profile = profiles.load_profile(filename)
 
     H_prime = H + K
     slow_factor = 2
-    d1_data = df_d1.values.tolist()
     # processing time on vms
-    vm_data = df_vm.values.tolist()
-    vm_proc_fwd = 0
-    vm_proc_back = 0
+    (vm_proc_fwd, vm_proc_back) = profiles.segment(profile, 'VM', point_a, point_b)
 
-    d1_p2_middle_fwd = 0
-    d1_p2_middle_back = 0
-    for i in range(point_a, point_b):
-        vm_proc_fwd += vm_data[i][0]
-        vm_proc_back += vm_data[i][1] + vm_data[i][2]
-
-        d1_p2_middle_fwd += d1_data[i][0]
-        d1_p2_middle_back += d1_data[i][1] + d1_data[i][2]
+    (d1_p2_middle_fwd, d1_p2_middle_back) = profiles.segment(profile, 'd1', point_a, point_b)
     
     # processing time on d1
-    d1_proc_fwd_first = 0
-    d1_proc_fwd_last = 0
-    d1_proc_back_first = 0
-    d1_proc_back_last = 0
-
-    for i in range(0, point_a):
-            d1_proc_fwd_first += d1_data[i][0]
-            d1_proc_back_first += d1_data[i][1] + d1_data[i][2]
-        
-    for i in range(point_b, len(d1_data)):
-        d1_proc_fwd_last += d1_data[i][0]
-        d1_proc_back_last += d1_data[i][1] + d1_data[i][2]
-
-    memory_data = df_memory.values.tolist()
+    (d1_proc_fwd_first, d1_proc_back_first) = profiles.segment(profile, 'd1', 0, point_a)
+    (d1_proc_fwd_last, d1_proc_back_last) = profiles.segment(profile, 'd1', point_b)
     
     # travel data
-    activations_to_cn = memory_data[point_a-1][0]
-    activations_to_do = memory_data[point_b-1][0]
+    activations_to_cn = profiles.activations(profile, point_a)
+    activations_to_do = profiles.activations(profile, point_b)
 
     # store data
-    store_data_owner = 0
-    for i in range(0, point_a):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
-        
-    for i in range(point_b, len(d1_data)):
-        store_data_owner += memory_data[i][0] + memory_data[i][1]
+    store_data_owner = profiles.store(profile, 0, point_a) + profiles.store(profile, point_b)
 
-    store_compute_node = 0
-    for i in range(point_a, point_b):
-        store_compute_node += memory_data[i][0] + memory_data[i][1]
+    store_compute_node = profiles.store(profile, point_a, point_b)
     store_compute_node = (store_compute_node/1024) # prefer MB
 
     #my_net = lambda data,bandwidth : ((data*0.0008)/bandwidth)*1000
@@ -2386,8 +1629,7 @@ def create_scenario_hybrid_typeA(filename, point_a, point_b, K, H,
         completed.append(net_line)
         network_type[int(net_line/H),int(net_line%H)] = 20 #random.randint(16,20)
 
-    print('Network types:')
-    print(network_type)
+    verbosity.logger.debug('network types:\n%s', network_type)
 
     do_devices = np.zeros((K))
     num_slow = int((K*slow_client)/100)
@@ -2414,8 +1656,7 @@ def create_scenario_hybrid_typeA(filename, point_a, point_b, K, H,
         completed.append(client_id)
         do_devices[client_id] = 1
     
-    print('slow devices:')
-    print(do_devices)
+    verbosity.logger.debug('slow devices:\n%s', do_devices)
 
     release_date = [np.zeros((K,H)), np.zeros((K,H_prime))]
     proc = [np.zeros((K,H)), np.zeros((K,H_prime))] 
@@ -2502,85 +1743,28 @@ def create_scenario_hybrid_typeA(filename, point_a, point_b, K, H,
     max_slot = 500
     max_slot_back = 1500
     max_slot_maxx = 4000
-    for j in range(K):
-        for i in range(H_prime):
-            if i < H:
-                release_date[0][j,i] = np.ceil(release_date[0][j,i]/max_slot).astype(int)
-                trans_back[0][j,i] = np.ceil(trans_back[0][j,i]/max_slot).astype(int)
-                
-                release_date_back[0][j,i] = np.ceil(release_date_back[0][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[0][j,i] = np.ceil(trans_back_gradients[0][j,i]/max_slot).astype(int)
-            
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
-            else:
-                release_date[1][j,i] = np.ceil(release_date[1][j,i]/max_slot).astype(int)
-                trans_back[1][j,i] = np.ceil(trans_back[1][j,i]/max_slot).astype(int)
-                
-                release_date_back[1][j,i] = np.ceil(release_date_back[1][j,i]/max_slot_maxx).astype(int)
-                trans_back_gradients[1][j,i] = np.ceil(trans_back_gradients[1][j,i]/max_slot).astype(int)
+    for k in range(2): # the original and the hybrid layout
+        release_date[k] = to_slots(release_date[k], max_slot)
+        trans_back[k] = to_slots(trans_back[k], max_slot)
 
-            if i == 0:
-                proc_local[0][j] = np.ceil(proc_local[0][j]/max_slot).astype(int)
-                proc_local_back[0][j] = np.ceil(proc_local_back[0][j]/max_slot_back).astype(int)
+        release_date_back[k] = to_slots(release_date_back[k], max_slot_maxx)
+        trans_back_gradients[k] = to_slots(trans_back_gradients[k], max_slot)
 
-                proc_local[1][j] = np.ceil(proc_local[1][j]/max_slot).astype(int)
-                proc_local_back[1][j] = np.ceil(proc_local_back[1][j]/max_slot_back).astype(int)
-
-            if i < H:
-                proc[0][j,i] =  np.ceil(proc[0][j,i]/max_slot).astype(int)
-            
-                if proc[0][j,i] == 0:
-                        proc[0][j,i] = 1
-
-                proc_bck[0][j,i] =  np.ceil(proc_bck[0][j,i]/max_slot_back).astype(int)
-                if proc_bck[0][j,i] == 0:
-                        proc_bck[0][j,i] = 1
-
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-            
-                if proc[1][j,i] == 0:
-                        proc[1][j,i] = 1
-
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                        proc_bck[1][j,i] = 1
-            else:
-                
-                proc[1][j,i] =  np.ceil(proc[1][j,i]/max_slot).astype(int)
-                
-                if proc[1][j,i] == 0:
-                   proc[1][j,i] = 1*(do_devices[j]/max_slot).astype(int)
+        proc_local[k] = to_slots(proc_local[k], max_slot)
+        proc_local_back[k] = to_slots(proc_local_back[k], max_slot_back)
 
+        proc_bck[k] = to_slots(proc_bck[k], max_slot_back, at_least_one=True)
 
-                
-                proc_bck[1][j,i] =  np.ceil(proc_bck[1][j,i]/max_slot_back).astype(int)
-
-                if proc_bck[1][j,i] == 0:
-                    proc_bck[1][j,i] = 1
-    
-    
-    print('release date')
-    print(release_date[1])
-    print('proc')
-    print(proc[1])
-    print('proc local')
-    print(proc_local[1])
-    print('trans back')
-    print(trans_back[1])
-    print('release data back')
-    print(release_date_back[1])
-    print('proc back')
-    print(proc_bck[1])
-    print('proc loack back')
-    print(proc_local_back[1])
-    print('trans back')
-    print(trans_back_gradients[1])
-    print('------')
+    proc[0] = to_slots(proc[0], max_slot, at_least_one=True)
+    proc[1] = to_slots(proc[1], max_slot)
+    proc[1][:,:H] = np.where(proc[1][:,:H] == 0, 1, proc[1][:,:H])
+    proc[1][:,H:] = np.where(proc[1][:,H:] == 0, (do_devices/max_slot).astype(int)[:,None], proc[1][:,H:])
+    
+    
+    verbosity.scenario('create_scenario_hybrid_typeA', (release_date, proc, proc_local, trans_back,
+                                 memory_capacity, memory_demand_,
+                                 release_date_back, proc_bck, proc_local_back, trans_back_gradients),
+                       point_a=point_a, point_b=point_b, K=K, H=H)
     return (release_date, proc, 
     proc_local, trans_back, 
     memory_capacity, memory_demand_, 
@@ -2797,9 +1981,8 @@ def fifo(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activation
 
     # Estimated Completition time
     for machine in range(H):
-        print(f'machine {machine}')
         my_jobs = list(np.transpose(np.argwhere(y[:,machine]==1))[0])
-        print(my_jobs)
+        verbosity.logger.debug('machine %s: %s', machine, my_jobs)
         machine_time = 0
         arival_jobs = []
         for j in my_jobs:
@@ -2840,5 +2023,5 @@ def fifo(K, H, release_date_fwd, proc_fwd, proc_local_fwd, trans_back_activation
                 
                 next_task.back = True
                 arival_jobs.append(next_task)
-    print(f_temp)
+    verbosity.logger.debug('completion times: %s', f_temp)
     return max(f_temp)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import logging
+import numpy as np
+import os
+import sys
+
+
+LEVELS = {'quiet': logging.ERROR, 'warning': logging.WARNING, 'info': logging.INFO, 'debug': logging.DEBUG}
+SCENARIO = ('release_date', 'proc', 'proc_local', 'trans_back',
+            'memory_capacity', 'memory_demand',
+            'release_date_back', 'proc_bck', 'proc_local_back', 'trans_back_gradients')
+
+# the messages of util_files, only the warnings by default: the tensors of the scenarios
+# and the jobs of the schedules are formatted only at the debug level
+logger = logging.getLogger('split_learning')
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(logging.Formatter('%(message)s'))
+logger.addHandler(_handler)
+logger.setLevel(logging.WARNING)
+logger.propagate = False
+
+dump_dir = None # the folder of the scenario dumps, None for no dump
+_dumps = 0 # the number of scenarios dumped by this process
+
+
+'''
+Sets the level of the messages: 'quiet' (only the errors), 'warning' (the default),
+'info' (the progress of the solvers) or 'debug' (also the tensors of every scenario and
+the jobs of every schedule), or a level of the logging module.
+'''
+def set_verbosity(level='warning'):
+    logger.setLevel(LEVELS[level] if isinstance(level, str) else level)
+
+
+'''
+Dumps the tensors of every scenario created from now on into the folder directory
+(None stops the dumps). See scenario().
+'''
+def set_dump(directory):
+    global dump_dir
+    dump_dir = directory
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+
+'''
+Reports the tensors of a scenario created by function (the names are the ones of SCENARIO,
+in the order of the tuple returned by the create_scenario functions): they are logged at
+the debug level and, if set_dump was called, written to <dump_dir>/<function>-<n>.npz
+with the keyword arguments (e.g., the splitting points, K and H) as metadata.
+The tensors of the hybrid scenarios are pairs [original layout, hybrid layout]: the hybrid
+layout is logged and both are dumped, the original one as <name>_original.
+Nothing is formatted when the debug level is off and there is no dump.
+'''
+def scenario(function, tensors, **meta):
+    global _dumps
+    if logger.isEnabledFor(logging.DEBUG):
+        for (name, tensor) in zip(SCENARIO, tensors):
+            logger.debug('%s\n%s', name, tensor[1] if isinstance(tensor, list) else tensor)
+        logger.debug('------')
+
+    if dump_dir is not None:
+        arrays = {key: np.asarray(value) for key, value in meta.items()}
+        for (name, tensor) in zip(SCENARIO, tensors):
+            if isinstance(tensor, list):
+                (arrays[name + '_original'], arrays[name]) = (np.asarray(tensor[0]), np.asarray(tensor[1]))
+            else:
+                arrays[name] = np.asarray(tensor)
+        np.savez(os.path.join(dump_dir, f'{function}-{_dumps}.npz'), **arrays)
+        _dumps += 1